@@ -8,13 +8,15 @@ interface CameraFeedProps {
   title?: string;
   className?: string;
   autoStart?: boolean;
+  status?: CameraStatus;
 }
 
 const CameraFeed: React.FC<CameraFeedProps> = ({ 
   cameraId, 
   title, 
   className = '',
-  autoStart = false 
+  autoStart = false,
+  status
 }) => {
   const [isStreaming, setIsStreaming] = useState(false);
   const [error, setError] = useState<string | null>(null);
@@ -22,11 +24,18 @@ const CameraFeed: React.FC<CameraFeedProps> = ({
   const [isLoading, setIsLoading] = useState(false);
   const imgRef = useRef<HTMLImageElement>(null);
 
+  useEffect(() => {
+    // Status polled for all cameras at once by the parent page
+    if (status) {
+      setCameraStatus(status);
+    }
+  }, [status]);
+
   const checkCameraStatus = async () => {
     try {
-      const status = await apiService.getCameraStatus(cameraId);
-      setCameraStatus(status);
-      if (!status.is_available) {
+      const current = await apiService.getCameraStatus(cameraId);
+      setCameraStatus(current);
+      if (!current.is_available) {
         setError('Camera is not available');
       }
     } catch (err: any) {
@@ -39,7 +48,9 @@ const CameraFeed: React.FC<CameraFeedProps> = ({
       setIsLoading(true);
       setError(null);
       
-      await checkCameraStatus();
+      if (!status) {
+        await checkCameraStatus();
+      }
       
       if (imgRef.current) {
         const streamUrl = apiService.getCameraStreamUrl(cameraId);
@@ -197,6 +208,18 @@ const CameraFeed: React.FC<CameraFeedProps> = ({
               <span>Active Streams:</span>
               <span>{cameraStatus.active_streams} / {cameraStatus.max_streams}</span>
             </div>
+            {cameraStatus.fps !== undefined && (
+              <div className="flex justify-between">
+                <span>Frame Rate:</span>
+                <span>{cameraStatus.fps} fps</span>
+              </div>
+            )}
+            {cameraStatus.detection_latency_ms !== undefined && (
+              <div className="flex justify-between">
+                <span>Detection Latency:</span>
+                <span>{cameraStatus.detection_latency_ms} ms (queue {cameraStatus.queue_depth ?? 0})</span>
+              </div>
+            )}
           </div>
         )}
       </div>
@@ -3,10 +3,12 @@ import { Camera, Grid, List, RefreshCw, AlertTriangle } from 'lucide-react';
 import CameraFeed from '../../components/common/CameraFeed';
 import apiService from '../../services/api';
 import LoadingSpinner from '../../components/common/LoadingSpinner';
+import { CameraStatus } from '../../types/common';
 
 const CamerasPage: React.FC = () => {
   const [viewMode, setViewMode] = useState<'grid' | 'list'>('grid');
   const [streamStatus, setStreamStatus] = useState<any>(null);
+  const [cameraStatuses, setCameraStatuses] = useState<Record<number, CameraStatus>>({});
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
@@ -17,8 +19,16 @@ const CamerasPage: React.FC = () => {
     try {
       setIsLoading(true);
       setError(null);
-      const status = await apiService.getStreamStatus();
+      const [status, overview] = await Promise.all([
+        apiService.getStreamStatus(),
+        apiService.getAllCameraStatus()
+      ]);
       setStreamStatus(status);
+      const byCamera: Record<number, CameraStatus> = {};
+      overview.cameras.forEach((camera) => {
+        byCamera[camera.camera_id] = camera;
+      });
+      setCameraStatuses(byCamera);
     } catch (err: any) {
       console.error('Stream status error:', err);
       setError('Stream status unavailable');
@@ -147,6 +157,7 @@ const CamerasPage: React.FC = () => {
           <CameraFeed
             key={cameraId}
             cameraId={cameraId}
+            status={cameraStatuses[cameraId]}
             title={`Camera ${cameraId + 1} - ${getCameraLocation(cameraId)}`}
             className={viewMode === 'list' ? 'max-w-md' : ''}
           />
@@ -10,16 +10,20 @@ import {
   RefreshCw
 } from 'lucide-react';
 import { useAuth } from '../../contexts/AuthContext';
-import { AttendanceRecord, Employee, AttendanceStats } from '../../types/common';
+import { AttendanceRecord, Employee, AttendanceStats, PresenceEntry, PresenceOverview } from '../../types/common';
 import apiService from '../../services/api';
 import LoadingSpinner from '../../components/common/LoadingSpinner';
 import { format, startOfDay, parseISO } from 'date-fns';
 
+// Attendance records kept on the dashboard
+const RECENT_RECORDS = 100;
+
 const AdminDashboard: React.FC = () => {
   const { user } = useAuth();
   const [employees, setEmployees] = useState<Employee[]>([]);
   const [attendance, setAttendance] = useState<AttendanceRecord[]>([]);
   const [streamStatus, setStreamStatus] = useState<any>(null);
+  const [presence, setPresence] = useState<PresenceOverview | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [lastRefresh, setLastRefresh] = useState(new Date());
@@ -29,15 +33,17 @@ const AdminDashboard: React.FC = () => {
       setIsLoading(true);
       setError(null);
       
-      const [employeesData, attendanceData, streamData] = await Promise.all([
+      const [employeesData, attendanceData, streamData, presenceData] = await Promise.all([
         apiService.getEmployees().catch(() => []),
-        apiService.getAttendanceRecords(100).catch(() => []),
-        apiService.getStreamStatus().catch(() => ({ total_active_streams: 0, max_concurrent_streams: 5, available_slots: 5 }))
+        apiService.getAttendanceRecords(RECENT_RECORDS).catch(() => []),
+        apiService.getStreamStatus().catch(() => ({ total_active_streams: 0, max_concurrent_streams: 5, available_slots: 5 })),
+        apiService.getPresence().catch(() => null)
       ]);
       
       setEmployees(employeesData);
       setAttendance(attendanceData);
       setStreamStatus(streamData);
+      setPresence(presenceData);
       setLastRefresh(new Date());
     } catch (err: any) {
       console.error('Dashboard fetch error:', err);
@@ -50,9 +56,38 @@ const AdminDashboard: React.FC = () => {
   useEffect(() => {
     fetchData();
     
-    // Auto-refresh every 30 seconds
-    const interval = setInterval(fetchData, 30000);
-    return () => clearInterval(interval);
+    // Apply live events to the loaded data; only a resync (events were
+    // missed) reloads everything
+    const events = apiService.createEventSource(['attendance', 'presence']);
+    const onAttendance = (message: MessageEvent) => {
+      const data = JSON.parse(message.data);
+      const record: AttendanceRecord = {
+        employee_id: data.employee_id,
+        camera_id: data.camera_id,
+        event_type: data.event_type,
+        confidence_score: data.confidence_score,
+        timestamp: new Date(data.event_time * 1000).toISOString()
+      };
+      setAttendance(previous => [record, ...previous].slice(0, RECENT_RECORDS));
+      setLastRefresh(new Date());
+    };
+    const onPresence = (message: MessageEvent) => {
+      const data = JSON.parse(message.data);
+      const toIso = (seconds?: number | null) => (seconds ? new Date(seconds * 1000).toISOString() : null);
+      const entry: PresenceEntry = { ...data, last_seen: toIso(data.last_seen), since: toIso(data.since) };
+      setPresence(previous => previous && applyPresence(previous, entry));
+      setLastRefresh(new Date());
+    };
+    events.addEventListener('attendance', onAttendance as EventListener);
+    events.addEventListener('presence', onPresence as EventListener);
+    events.addEventListener('resync', () => fetchData());
+    
+    // Slow fallback in case the event stream is unavailable
+    const interval = setInterval(fetchData, 300000);
+    return () => {
+      events.close();
+      clearInterval(interval);
+    };
   }, []);
 
   if (isLoading && !attendance.length) {
@@ -69,9 +104,10 @@ const AdminDashboard: React.FC = () => {
   });
 
   const uniqueEmployeesToday = new Set(todayAttendance.map(record => record.employee_id));
-  const presentToday = uniqueEmployeesToday.size;
+  // Prefer the live presence map; fall back to inferring from today's records
+  const presentNow = presence ? presence.present_count : uniqueEmployeesToday.size;
   const totalEmployees = employees.length;
-  const attendanceRate = totalEmployees > 0 ? Math.round((presentToday / totalEmployees) * 100) : 0;
+  const attendanceRate = totalEmployees > 0 ? Math.round((presentNow / totalEmployees) * 100) : 0;
 
   const stats = [
     {
@@ -83,8 +119,8 @@ const AdminDashboard: React.FC = () => {
       change: null
     },
     {
-      title: 'Present Today',
-      value: presentToday.toString(),
+      title: presence ? 'Present Now' : 'Present Today',
+      value: presentNow.toString(),
       icon: CheckCircle,
       color: 'text-green-600',
       bgColor: 'bg-green-100 dark:bg-green-900/20',
@@ -293,4 +329,22 @@ const AdminDashboard: React.FC = () => {
   );
 };
 
+// The overview lists present employees only; move one in or out and adjust the counts
+function applyPresence(overview: PresenceOverview, entry: PresenceEntry): PresenceOverview {
+  const wasPresent = overview.employees.some(e => e.employee_id === entry.employee_id);
+  const isPresent = entry.state === 'present';
+  const others = overview.employees.filter(e => e.employee_id !== entry.employee_id);
+  const delta = (isPresent ? 1 : 0) - (wasPresent ? 1 : 0);
+  const department = overview.departments[entry.department] || { present: 0, total: 1 };
+  return {
+    ...overview,
+    present_count: overview.present_count + delta,
+    departments: {
+      ...overview.departments,
+      [entry.department]: { ...department, present: department.present + delta }
+    },
+    employees: isPresent ? [entry, ...others] : others
+  };
+}
+
 export default AdminDashboard;
\ No newline at end of file
@@ -9,7 +9,7 @@ import {
   BarChart3
 } from 'lucide-react';
 import { useAuth } from '../../contexts/AuthContext';
-import { AttendanceRecord, Employee } from '../../types/common';
+import { AttendanceRecord, Employee, PresenceEntry } from '../../types/common';
 import apiService from '../../services/api';
 import LoadingSpinner from '../../components/common/LoadingSpinner';
 import { format, startOfMonth, endOfMonth, subDays, parseISO } from 'date-fns';
@@ -18,6 +18,7 @@ const EmployeeDashboard: React.FC = () => {
   const { user } = useAuth();
   const [attendance, setAttendance] = useState<AttendanceRecord[]>([]);
   const [employeeData, setEmployeeData] = useState<Employee | null>(null);
+  const [presence, setPresence] = useState<PresenceEntry | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
@@ -28,13 +29,15 @@ const EmployeeDashboard: React.FC = () => {
         // In a real implementation, you'd have the employee ID from the user data
         const employeeId = user?.username || 'employee1'; // Fallback for demo
         
-        const [attendanceData, empData] = await Promise.all([
+        const [attendanceData, empData, presenceData] = await Promise.all([
           apiService.getEmployeeAttendance(employeeId).catch(() => []),
-          apiService.getEmployee(employeeId).catch(() => null)
+          apiService.getEmployee(employeeId).catch(() => null),
+          apiService.getEmployeePresence(employeeId).catch(() => null)
         ]);
         
         setAttendance(attendanceData);
         setEmployeeData(empData);
+        setPresence(presenceData);
       } catch (err: any) {
         console.error('Employee dashboard error:', err);
         setError('Some data may be unavailable');
@@ -77,13 +80,16 @@ const EmployeeDashboard: React.FC = () => {
     return format(recordDate, 'yyyy-MM-dd') === format(today, 'yyyy-MM-dd');
   });
 
+  // The live presence map knows about exits; today's records are the fallback
+  const isPresent = presence ? presence.state === 'present' : todayAttendance.length > 0;
+
   const stats = [
     {
       title: 'Today\'s Status',
-      value: todayAttendance.length > 0 ? 'Present' : 'Absent',
-      icon: todayAttendance.length > 0 ? CheckCircle : XCircle,
-      color: todayAttendance.length > 0 ? 'text-green-600' : 'text-red-600',
-      bgColor: todayAttendance.length > 0 ? 'bg-green-100 dark:bg-green-900/20' : 'bg-red-100 dark:bg-red-900/20'
+      value: isPresent ? 'Present' : 'Absent',
+      icon: isPresent ? CheckCircle : XCircle,
+      color: isPresent ? 'text-green-600' : 'text-red-600',
+      bgColor: isPresent ? 'bg-green-100 dark:bg-green-900/20' : 'bg-red-100 dark:bg-red-900/20'
     },
     {
       title: 'This Week',
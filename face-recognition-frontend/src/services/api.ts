@@ -5,6 +5,9 @@ import {
   Employee, 
   AttendanceRecord, 
   CameraStatus,
+  CameraStatusOverview,
+  PresenceEntry,
+  PresenceOverview,
   ApiResponse 
 } from '../types/common';
 
@@ -100,12 +103,70 @@ class ApiService {
     return response.data;
   }
 
+  // Page through attendance with the cursor from the X-Next-Cursor header
+  async getAttendancePage(params: {
+    employeeId?: string;
+    limit?: number;
+    cursor?: string;
+    startDate?: string;
+    endDate?: string;
+  } = {}): Promise<{ records: AttendanceRecord[]; nextCursor: string | null }> {
+    const url = params.employeeId ? `/attendance/${params.employeeId}` : '/attendance/';
+    const response: AxiosResponse<AttendanceRecord[]> = await this.api.get(url, {
+      params: {
+        limit: params.limit,
+        cursor: params.cursor,
+        start_date: params.startDate,
+        end_date: params.endDate
+      }
+    });
+    return { records: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+  }
+
+  // Who is in now, answered from the camera monitor's presence map
+  async getPresence(state: 'present' | 'absent' | 'all' = 'present'): Promise<PresenceOverview> {
+    const response: AxiosResponse<PresenceOverview> = await this.api.get('/attendance/presence', {
+      params: { state }
+    });
+    return response.data;
+  }
+
+  async getEmployeePresence(employeeId: string): Promise<PresenceEntry> {
+    const response: AxiosResponse<PresenceEntry> = await this.api.get(`/attendance/presence/${employeeId}`);
+    return response.data;
+  }
+
+  async exportAttendance(params: {
+    format?: 'csv' | 'ndjson';
+    startDate?: string;
+    endDate?: string;
+    employeeId?: string;
+    department?: string;
+  } = {}): Promise<Blob> {
+    const response: AxiosResponse<Blob> = await this.api.get('/attendance/export', {
+      params: {
+        format: params.format || 'csv',
+        start_date: params.startDate,
+        end_date: params.endDate,
+        employee_id: params.employeeId,
+        department: params.department
+      },
+      responseType: 'blob'
+    });
+    return response.data;
+  }
+
   // Camera/Streaming
   async getCameraStatus(cameraId: number): Promise<CameraStatus> {
     const response: AxiosResponse<CameraStatus> = await this.api.get(`/stream/status/${cameraId}`);
     return response.data;
   }
 
+  async getAllCameraStatus(): Promise<CameraStatusOverview> {
+    const response: AxiosResponse<CameraStatusOverview> = await this.api.get('/stream/status');
+    return response.data;
+  }
+
   async getStreamStatus(): Promise<{ total_active_streams: number; max_concurrent_streams: number; available_slots: number }> {
     const response = await this.api.get('/stream/');
     return response.data;
@@ -117,6 +178,15 @@ class ApiService {
     return `${API_BASE_URL}/stream/${camera_id}`;
   }
 
+  // Get latest camera frame URL (served from the server's frame cache)
+  getCameraSnapshotUrl(cameraId: number, options: { width?: number; annotate?: boolean } = {}): string {
+    const token = localStorage.getItem('access_token');
+    const params = new URLSearchParams({ token: token || '' });
+    if (options.width) params.set('width', String(options.width));
+    if (options.annotate) params.set('annotate', 'true');
+    return `${API_BASE_URL}/stream/${cameraId}/snapshot.jpg?${params.toString()}`;
+  }
+
   // WebSocket connection for real-time updates
   createWebSocketConnection(endpoint: string): WebSocket {
     const token = localStorage.getItem('access_token');
@@ -125,6 +195,14 @@ class ApiService {
     return new WebSocket(wsUrl);
   }
 
+  // Server-Sent Events feed; EventSource resumes with Last-Event-ID on its own
+  createEventSource(types?: Array<'attendance' | 'presence' | 'unknown_face'>): EventSource {
+    const token = localStorage.getItem('access_token');
+    const params = new URLSearchParams({ token: token || '' });
+    if (types && types.length) params.set('types', types.join(','));
+    return new EventSource(`${API_BASE_URL}/events/stream?${params.toString()}`);
+  }
+
   // Health check
   async healthCheck(): Promise<{ message: string }> {
     const response = await this.api.get('/');
@@ -37,6 +37,36 @@ export interface CameraStatus {
   is_available: boolean;
   active_streams: number;
   max_streams: number;
+  state?: string;
+  fps?: number;
+  last_frame_age?: number | null;
+  detection_latency_ms?: number;
+  queue_depth?: number;
+}
+
+export interface CameraStatusOverview {
+  cameras: CameraStatus[];
+  total_active_streams: number;
+  max_concurrent_streams: number;
+  generated_at: number;
+}
+
+export interface PresenceEntry {
+  employee_id: string;
+  employee_name?: string | null;
+  department: string;
+  state: 'present' | 'absent';
+  camera_id?: number | null;
+  last_seen?: string | null;
+  since?: string | null;
+}
+
+export interface PresenceOverview {
+  present_count: number;
+  total_employees: number;
+  departments: Record<string, { present: number; total: number }>;
+  employees: PresenceEntry[];
+  generated_at: string;
 }
 
 export interface SystemNotification {
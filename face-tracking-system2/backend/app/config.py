@@ -1,9 +1,11 @@
 import os
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 class Settings(BaseSettings):
     # Database Configuration
+    DB_BACKEND: str = "postgresql"  # or "sqlite" for single-box edge deployments
+    SQLITE_PATH: str = "data/face_tracking.db"
     DB_HOST: str = "localhost"
     DB_PORT: str = "5432"
     DB_NAME: str = "face_tracking"
@@ -34,10 +36,69 @@ class Settings(BaseSettings):
     MAX_CONCURRENT_STREAMS: int = 5
     STREAM_QUALITY: str = "medium"
     FRAME_RATE: int = 30
+    CAMERA_MJPEG_PASSTHROUGH: bool = False
+    # Non-device sources as "camera_id=source" pairs, e.g.
+    # "1=rtsp://10.0.0.5/stream,2=/data/lobby.mp4"
+    CAMERA_SOURCES: str = ""
+    CAMERA_REPLAY_SPEED: str = "realtime"  # realtime or max, for file sources
+    CAMERA_REPLAY_LOOP: bool = True
+    CAMERA_RECONNECT_MAX_DELAY: float = 30.0
+    CAMERA_CONFIG_REFRESH_SECONDS: float = 30.0
+    CAMERA_WATCHDOG_TIMEOUT: float = 10.0
+    CAMERA_WATCHDOG_INTERVAL: float = 2.0
+    
+    # Inference Scheduling
+    INFERENCE_WORKERS: int = 4
+    DETECTION_MIN_FPS: float = 1.0  # kept for every camera under overload
+    DETECTION_MAX_FPS: float = 3.0
+    # Share of inference capacity per camera_type, e.g. "entry=4,exit=4,general=1"
+    CAMERA_TYPE_WEIGHTS: str = "entry=4,exit=4,general=1"
+    
+    # Attendance Recording
+    ATTENDANCE_COOLDOWN_SECONDS: float = 60.0  # minimum gap between entry/exit transitions
+    ATTENDANCE_PRESENCE_TIMEOUT_HOURS: int = 10  # unseen this long counts as gone
+    ATTENDANCE_BATCH_SIZE: int = 500
+    ATTENDANCE_FLUSH_INTERVAL: float = 1.0  # seconds an event may wait for its batch
+    ATTENDANCE_SPOOL_DIR: str = "spool/attendance"
+    ATTENDANCE_SPOOL_SEGMENT_BYTES: int = 4194304  # 4MB
+    ATTENDANCE_SPOOL_FSYNC: bool = False
+    
+    # Live Events (Server-Sent Events)
+    EVENT_HISTORY_SIZE: int = 1000  # events kept for Last-Event-ID resume
+    EVENT_CLIENT_BUFFER: int = 256  # events queued per client before it is dropped
+    EVENT_KEEPALIVE_SECONDS: float = 15.0
+    UNKNOWN_FACE_ALERT_SECONDS: float = 3.0  # unrecognised for this long before an alert
+    
+    # Trajectory Recording
+    TRAJECTORY_ENABLED: bool = True
+    TRAJECTORY_MIN_DISTANCE: float = 20.0  # pixels moved before a new sample
+    TRAJECTORY_MIN_INTERVAL: float = 0.5  # seconds
+    TRAJECTORY_MAX_INTERVAL: float = 5.0  # seconds
+    TRAJECTORY_MAX_POINTS: int = 120  # samples per track
+    TRAJECTORY_BATCH_SIZE: int = 1000
+    
+    # Partitioning & Retention (months; 0 keeps data forever)
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_MAINTENANCE_HOURS: float = 24.0
+    ATTENDANCE_RETENTION_MONTHS: int = 0
+    TRACKING_RETENTION_MONTHS: int = 3
+    
+    # Lookup Cache (employees and users; 0 disables)
+    CACHE_TTL_SECONDS: float = 60.0
+    CACHE_MAX_ENTRIES: int = 2048
+    CACHE_SYNC_SECONDS: float = 0.5  # how often invalidations by other workers are picked up
+    
+    # Shared State between workers ("memory" or "redis")
+    CACHE_BACKEND: str = "memory"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_KEY_PREFIX: str = "fts:"
+    GALLERY_CHECK_SECONDS: float = 2.0  # how often recognizers look for enrollment changes
+    MONITOR_LEASE_SECONDS: float = 15.0  # lease of the worker running camera monitoring
     
     # File Storage
     UPLOAD_DIR: str = "uploads"
     FACE_IMAGES_DIR: str = "face_images"
+    BATCH_VIDEO_DIR: str = "recordings"
     MAX_FILE_SIZE: int = 10485760  # 10MB
     
     # Logging Configuration
@@ -47,11 +108,31 @@ class Settings(BaseSettings):
     
     @property
     def DATABASE_URL(self) -> str:
+        if self.DB_BACKEND == "sqlite":
+            return f"sqlite:///{self.SQLITE_PATH}"
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
     
     @property
     def CORS_ORIGINS(self) -> List[str]:
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(',')]
+    
+    @property
+    def CAMERA_SOURCE_MAP(self) -> Dict[int, str]:
+        sources = {}
+        for entry in self.CAMERA_SOURCES.split(','):
+            if '=' in entry:
+                camera_id, source = entry.split('=', 1)
+                sources[int(camera_id.strip())] = source.strip()
+        return sources
+    
+    @property
+    def CAMERA_TYPE_WEIGHT_MAP(self) -> Dict[str, float]:
+        weights = {}
+        for entry in self.CAMERA_TYPE_WEIGHTS.split(','):
+            if '=' in entry:
+                camera_type, weight = entry.split('=', 1)
+                weights[camera_type.strip()] = float(weight)
+        return weights
 
     class Config:
         env_file = os.path.join(os.path.dirname(__file__), '..', '.env')
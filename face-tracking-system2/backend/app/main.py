@@ -1,20 +1,34 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.concurrency import run_in_threadpool
 from contextlib import asynccontextmanager
 import time
 
-from app.routers import streaming, embeddings, employees, attendance, auth
+from app.routers import streaming, embeddings, employees, attendance, auth, websocket, events
 from app.config import settings
 from utils.logging import setup_logging, get_logger, log_request
-from tasks.camera_tasks import start_background_monitoring, stop_background_monitoring
+from tasks.camera_tasks import camera_monitor, start_background_monitoring, stop_background_monitoring
 from db.db_config import create_tables
 from db.db_manager import DatabaseManager
+from db.async_repository import dispose_async_engine
+from utils.cache_backend import cache_backend
+from utils.event_bus import event_bus
+from tasks.partition_maintenance import PartitionMaintainer
 
 # Setup logging
 setup_logging()
 logger = get_logger(__name__)
 
+partition_maintainer = PartitionMaintainer(
+    months_ahead=settings.PARTITION_MONTHS_AHEAD,
+    retention_months={
+        'attendance_records': settings.ATTENDANCE_RETENTION_MONTHS,
+        'tracking_records': settings.TRACKING_RETENTION_MONTHS,
+    },
+    interval=settings.PARTITION_MAINTENANCE_HOURS * 3600
+)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup and shutdown events."""
@@ -25,6 +39,9 @@ async def lifespan(app: FastAPI):
         create_tables()
         logger.info("✅ Database tables initialized")
         
+        # Create upcoming partitions and apply retention, then keep doing so daily
+        partition_maintainer.start()
+        
         # Initialize master admin account
         db_manager = DatabaseManager()
         master_email, master_password = db_manager.create_master_admin()
@@ -69,6 +86,8 @@ async def lifespan(app: FastAPI):
     try:
         stop_background_monitoring()
         logger.info("✅ Background monitoring stopped")
+        partition_maintainer.stop()
+        await dispose_async_engine()
     except Exception as e:
         logger.error(f"❌ Error during shutdown: {e}")
 
@@ -112,6 +131,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -120,6 +140,8 @@ app.include_router(streaming.router)
 app.include_router(embeddings.router)
 app.include_router(employees.router)
 app.include_router(attendance.router)
+app.include_router(websocket.router)
+app.include_router(events.router)
 
 @app.get("/")
 async def root():
@@ -130,6 +152,7 @@ async def root():
             "Role-based User Management",
             "Face Recognition & Attendance Tracking",
             "Real-time Camera Streaming",
+            "Live Detection Overlays over WebSocket",
             "Employee Management",
             "Master Admin System"
         ]
@@ -138,8 +161,17 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring."""
+    # A blocking call; an unreachable Redis must not stall the event loop
+    backend_reachable = await run_in_threadpool(cache_backend.ping)
     return {
         "status": "healthy",
         "timestamp": time.time(),
-        "environment": settings.ENVIRONMENT
+        "environment": settings.ENVIRONMENT,
+        "monitoring_leader": camera_monitor.is_leader,
+        "attendance_writer": camera_monitor.attendance_writer.stats(),
+        "trajectory_writer": camera_monitor.trajectory_writer.stats(),
+        "partitions": partition_maintainer.stats(),
+        "caches": DatabaseManager.cache_stats(),
+        "cache_backend": {"backend": cache_backend.name, "reachable": backend_reachable},
+        "events": event_bus.stats()
     }
\ No newline at end of file
@@ -1,9 +1,22 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from db.db_manager import DatabaseManager
+from db.async_repository import AsyncRepository, get_async_repository
 from app.routers.auth import verify_token
+from app.config import settings
+from utils.security import require_admin
+from tasks.batch_processing import submit_batch_job, get_batch_job, default_recording_start
+from tasks.camera_tasks import camera_monitor
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import date, datetime
+import base64
+import csv
+import io
+import json
 import logging
+import os
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -29,55 +42,380 @@ class AttendanceResponse(BaseModel):
     work_status: Optional[str] = None
     notes: Optional[str] = None
 
+class DailySummaryResponse(BaseModel):
+    employee_id: str
+    work_date: date
+    first_in: Optional[datetime] = None
+    last_out: Optional[datetime] = None
+    presence_seconds: float = 0.0
+    is_present: bool = False  # still inside at the end of the recorded events
+    event_count: int = 0
+
+class PresenceEntry(BaseModel):
+    employee_id: str
+    employee_name: Optional[str] = None
+    department: str
+    state: str  # 'present' or 'absent'
+    camera_id: Optional[int] = None
+    last_seen: Optional[datetime] = None
+    since: Optional[datetime] = None  # time of the last entry/exit
+
+class DepartmentPresence(BaseModel):
+    present: int
+    total: int
+
+class PresenceResponse(BaseModel):
+    present_count: int
+    total_employees: int
+    departments: Dict[str, DepartmentPresence]
+    employees: List[PresenceEntry]
+    generated_at: datetime
+
+class BackfillRequest(BaseModel):
+    video_path: str  # relative to BATCH_VIDEO_DIR
+    camera_id: int
+    recording_start: Optional[datetime] = None
+    chunk_seconds: float = 60.0
+    workers: Optional[int] = None
+    frame_stride: int = 5
+    dedupe_seconds: float = 300.0
+    dry_run: bool = False
+
+class BackfillJobResponse(BaseModel):
+    job_id: str
+    video_path: str
+    camera_id: int
+    status: str
+    chunks_total: int
+    chunks_done: int
+    events_found: int
+    records_written: int
+    error: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+# --- Keyset Pagination ---
+def encode_cursor(record) -> str:
+    """Opaque cursor pointing just past a record in (timestamp, id) order."""
+    raw = json.dumps([record.timestamp.isoformat(), record.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, record_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(record_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def get_page(repo: AsyncRepository, response: Response, limit: int, cursor: Optional[str],
+                   employee_id: Optional[str] = None, start_date: Optional[datetime] = None,
+                   end_date: Optional[datetime] = None) -> List[AttendanceResponse]:
+    """
+    Fetch one page and set the X-Next-Cursor header when more records follow.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    after = decode_cursor(cursor) if cursor else None
+    # One extra row tells whether there is a next page
+    records = await repo.get_attendance_page(
+        employee_id=employee_id,
+        start_date=start_date,
+        end_date=end_date,
+        after=after,
+        limit=limit + 1
+    )
+    if records is None:
+        raise HTTPException(status_code=500, detail="Internal server error")
+    if len(records) > limit:
+        records = records[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(records[-1])
+    return [
+        AttendanceResponse(
+            id=r.id,
+            employee_id=r.employee_id,
+            timestamp=str(r.timestamp),
+            confidence_score=r.confidence_score,
+            camera_id=r.camera_id,
+            event_type=r.event_type,
+            work_status=r.work_status,
+            notes=r.notes
+        )
+        for r in records
+    ]
+
+# --- Daily Summaries ---
+MAX_SUMMARY_DAYS = 366
+
+async def get_summaries(repo: AsyncRepository, start_date: date, end_date: date,
+                        employee_id: Optional[str] = None) -> List[DailySummaryResponse]:
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    if (end_date - start_date).days >= MAX_SUMMARY_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_SUMMARY_DAYS} days")
+    summaries = await repo.get_daily_summaries(start_date, end_date, employee_id=employee_id)
+    if summaries is None:
+        raise HTTPException(status_code=500, detail="Internal server error")
+    return [
+        DailySummaryResponse(
+            employee_id=s.employee_id,
+            work_date=s.work_date,
+            first_in=s.first_in,
+            last_out=s.last_out,
+            presence_seconds=s.presence_seconds or 0.0,
+            is_present=s.open_since is not None,
+            event_count=s.event_count or 0
+        )
+        for s in summaries
+    ]
+
+# --- Streaming Export ---
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+def export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def stream_csv(rows: Iterable[Tuple]) -> Iterator[str]:
+    """Encode rows as CSV, one chunk per export batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(DatabaseManager.EXPORT_COLUMNS)
+    for count, row in enumerate(rows, 1):
+        writer.writerow([export_value(v) for v in row])
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def stream_ndjson(rows: Iterable[Tuple]) -> Iterator[str]:
+    """Encode rows as newline-delimited JSON, one chunk per export batch."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({k: export_value(v) for k, v in zip(DatabaseManager.EXPORT_COLUMNS, row)}))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+# --- Live Presence ---
+def presence_entry(entry: Dict) -> PresenceEntry:
+    return PresenceEntry(
+        **{k: v for k, v in entry.items() if k not in ('last_seen', 'since')},
+        last_seen=datetime.fromtimestamp(entry['last_seen']) if entry['last_seen'] else None,
+        since=datetime.fromtimestamp(entry['since']) if entry['since'] else None
+    )
+
 # --- Routes ---
 
 @router.get("/", response_model=List[AttendanceResponse])
-def get_latest_attendance(
-    limit: int = 50,
-    db: DatabaseManager = Depends(get_db_manager),
+async def get_latest_attendance(
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    repo: AsyncRepository = Depends(get_async_repository),
     _=Depends(verify_token)
 ):
+    """
+    Attendance records, newest first.
+    
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` to get the
+    next page; the header is absent on the last page.
+    """
     try:
-        records = db.get_attendance_records(limit=limit)
-        return [
-            AttendanceResponse(
-                id=r.id,
-                employee_id=r.employee_id,
-                timestamp=str(r.timestamp),
-                confidence_score=r.confidence_score,
-                camera_id=r.camera_id,
-                event_type=r.event_type,
-                work_status=r.work_status,
-                notes=r.notes
-            )
-            for r in records
-        ]
+        return await get_page(repo, response, limit, cursor, start_date=start_date, end_date=end_date)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("Error fetching attendance records")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/{employee_id}", response_model=List[AttendanceResponse])
-def get_attendance_by_employee(
+@router.get("/summary", response_model=List[DailySummaryResponse])
+async def get_daily_summaries(
+    start_date: date,
+    end_date: date,
+    employee_id: Optional[str] = None,
+    repo: AsyncRepository = Depends(get_async_repository),
+    _=Depends(verify_token)
+):
+    """
+    Per-employee daily rollups (first in, last out, time present) for a date range.
+    
+    Served from the daily summary table, so a month view for all employees
+    is a single range scan instead of an aggregation over raw events.
+    """
+    try:
+        return await get_summaries(repo, start_date, end_date, employee_id=employee_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error fetching daily summaries")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/presence", response_model=PresenceResponse)
+async def get_presence(
+    state: Optional[str] = Query("present", pattern="^(present|absent|all)$"),
+    department: Optional[str] = None,
+    _=Depends(verify_token)
+):
+    """
+    Who is in now, with per-department counts.
+    
+    Answered from the camera monitor's in-memory presence map, which follows
+    every recognition and is rebuilt from the database on startup.
+    """
+    try:
+        now = time.time()
+        snapshot = camera_monitor.presence.snapshot(now)
+        entries = snapshot['employees']
+        if department:
+            entries = [e for e in entries if e['department'] == department]
+        departments = snapshot['departments']
+        return PresenceResponse(
+            present_count=sum(d['present'] for d in departments.values()),
+            total_employees=sum(d['total'] for d in departments.values()),
+            departments=departments,
+            employees=[presence_entry(e) for e in entries if state == "all" or e['state'] == state],
+            generated_at=datetime.fromtimestamp(now)
+        )
+    except Exception as e:
+        logger.exception("Error reading presence")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/presence/{employee_id}", response_model=PresenceEntry)
+async def get_employee_presence(
     employee_id: str,
+    _=Depends(verify_token)
+):
+    """Current presence of one employee, from memory."""
+    entry = camera_monitor.presence.lookup(employee_id, time.time())
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return presence_entry(entry)
+
+
+@router.get("/export")
+def export_attendance(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    employee_id: Optional[str] = None,
+    department: Optional[str] = None,
     db: DatabaseManager = Depends(get_db_manager),
+    _=Depends(require_admin)
+):
+    """
+    Export attendance records, oldest first, as CSV or NDJSON (admin only).
+    
+    Rows are streamed from a server-side cursor as they are read, so the
+    export size is not limited by memory.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    rows = db.iter_attendance_export(
+        start_date=start_date,
+        end_date=end_date,
+        employee_id=employee_id,
+        department=department,
+        batch_size=EXPORT_BATCH_SIZE
+    )
+    body = stream_csv(rows) if format == "csv" else stream_ndjson(rows)
+    filename = f"attendance-{datetime.now():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/summary/{employee_id}", response_model=List[DailySummaryResponse])
+async def get_employee_daily_summaries(
+    employee_id: str,
+    start_date: date,
+    end_date: date,
+    repo: AsyncRepository = Depends(get_async_repository),
+    _=Depends(verify_token)
+):
+    """Daily rollups of one employee, like ``GET /attendance/summary``."""
+    try:
+        return await get_summaries(repo, start_date, end_date, employee_id=employee_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Error fetching daily summaries for {employee_id}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{employee_id}", response_model=List[AttendanceResponse])
+async def get_attendance_by_employee(
+    employee_id: str,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    repo: AsyncRepository = Depends(get_async_repository),
     _=Depends(verify_token)
 ):
+    """Attendance records of one employee, newest first, paged like ``GET /attendance/``."""
     try:
-        records = db.get_attendance_records(employee_id=employee_id)
-        return [
-            AttendanceResponse(
-                id=r.id,
-                employee_id=r.employee_id,
-                timestamp=str(r.timestamp),
-                confidence_score=r.confidence_score,
-                camera_id=r.camera_id,
-                event_type=r.event_type,
-                work_status=r.work_status,
-                notes=r.notes
-            )
-            for r in records
-        ]
+        return await get_page(repo, response, limit, cursor, employee_id=employee_id,
+                              start_date=start_date, end_date=end_date)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(f"Error fetching attendance for {employee_id}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/backfill", response_model=BackfillJobResponse)
+def start_backfill(
+    request: BackfillRequest,
+    _=Depends(require_admin)
+):
+    """Backfill attendance from a recorded video file (admin only)."""
+    base_dir = os.path.realpath(settings.BATCH_VIDEO_DIR)
+    video_path = os.path.realpath(os.path.join(base_dir, request.video_path))
+    if os.path.commonpath([base_dir, video_path]) != base_dir:
+        raise HTTPException(status_code=400, detail="Video path must be inside the batch video directory")
+    if not os.path.isfile(video_path):
+        raise HTTPException(status_code=404, detail="Video file not found")
+    if request.chunk_seconds <= 0 or request.frame_stride < 1:
+        raise HTTPException(status_code=400, detail="chunk_seconds and frame_stride must be positive")
+
+    try:
+        recording_start = (request.recording_start.timestamp() if request.recording_start
+                           else default_recording_start(video_path))
+        job = submit_batch_job(
+            video_path,
+            request.camera_id,
+            recording_start,
+            chunk_seconds=request.chunk_seconds,
+            workers=request.workers,
+            frame_stride=request.frame_stride,
+            dedupe_seconds=request.dedupe_seconds,
+            dry_run=request.dry_run
+        )
+        return BackfillJobResponse(**job.to_dict())
+    except Exception as e:
+        logger.exception(f"Error starting backfill for {request.video_path}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/backfill/{job_id}", response_model=BackfillJobResponse)
+def get_backfill_status(
+    job_id: str,
+    _=Depends(require_admin)
+):
+    """Get progress of a backfill job (admin only)."""
+    job = get_batch_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Backfill job not found")
+    return BackfillJobResponse(**job.to_dict())
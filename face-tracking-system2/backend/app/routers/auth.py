@@ -13,6 +13,7 @@ from utils.security import (
     hash_password
 )
 from utils.logging import get_logger, log_authentication
+from db.async_repository import AsyncRepository, get_async_repository
 
 logger = get_logger(__name__)
 
@@ -225,14 +226,14 @@ def create_employee_user(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/users/", response_model=list[UserResponse])
-def list_users(
+async def list_users(
     include_inactive: bool = False,
     admin_user=Depends(require_admin), 
-    db=Depends(get_db_manager)
+    repo: AsyncRepository = Depends(get_async_repository)
 ):
     """List all users (admin only)."""
     try:
-        users = db.get_all_users(include_inactive=include_inactive)
+        users = await repo.get_all_users(include_inactive=include_inactive)
         return [
             UserResponse(
                 id=user.id,
@@ -307,10 +308,11 @@ def delete_user(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/me/", response_model=UserResponse)
-def get_current_user(current_user: dict = Depends(verify_token), db=Depends(get_db_manager)):
+async def get_current_user(current_user: dict = Depends(verify_token),
+                           repo: AsyncRepository = Depends(get_async_repository)):
     """Get current user information."""
     try:
-        user = db.get_user_by_id(current_user.get("user_id"))
+        user = await repo.get_user_by_id(current_user.get("user_id"))
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
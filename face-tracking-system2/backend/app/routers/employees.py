@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends
 from db.db_manager import DatabaseManager
+from db.async_repository import AsyncRepository, get_async_repository
 from app.routers.auth import verify_token
 from utils.security import require_admin
+from tasks.camera_tasks import camera_monitor
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional
 import logging
@@ -52,13 +54,13 @@ class DeleteResponse(BaseModel):
 # --- CRUD Routes ---
 
 @router.get("/", response_model=List[EmployeeResponse])
-def list_employees(
-    db: DatabaseManager = Depends(get_db_manager),
+async def list_employees(
+    repo: AsyncRepository = Depends(get_async_repository),
     _=Depends(verify_token)
 ):
     """List all employees."""
     try:
-        employees = db.get_all_employees()
+        employees = await repo.get_all_employees()
         return [EmployeeResponse(
             employee_id=emp.id,
             name=emp.employee_name,
@@ -74,14 +76,14 @@ def list_employees(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/{employee_id}", response_model=EmployeeResponse)
-def get_employee(
+async def get_employee(
     employee_id: str,
-    db: DatabaseManager = Depends(get_db_manager),
+    repo: AsyncRepository = Depends(get_async_repository),
     _=Depends(verify_token)
 ):
     """Get employee by ID."""
     try:
-        emp = db.get_employee(employee_id)
+        emp = await repo.get_employee(employee_id)
         if not emp:
             raise HTTPException(status_code=404, detail="Employee not found")
         return EmployeeResponse(
@@ -129,6 +131,7 @@ def create_employee(
             raise HTTPException(status_code=400, detail="Employee already exists or creation failed")
         
         emp = db.get_employee(request.employee_id)
+        camera_monitor.presence.set_employee(emp.id, emp.employee_name, emp.department)
         return EmployeeResponse(
             employee_id=emp.id,
             name=emp.employee_name,
@@ -176,6 +179,7 @@ def update_employee(
             raise HTTPException(status_code=400, detail="Update failed")
 
         emp = db.get_employee(employee_id)
+        camera_monitor.presence.set_employee(emp.id, emp.employee_name, emp.department)
         return EmployeeResponse(
             employee_id=emp.id,
             name=emp.employee_name,
@@ -201,6 +205,8 @@ def delete_employee(
     """Delete employee (admin only)."""
     try:
         success = db.delete_employee(employee_id)
+        if success:
+            camera_monitor.presence.remove_employee(employee_id)
         return DeleteResponse(
             deleted=success,
             message="Employee deleted successfully" if success else "Employee not found"
@@ -210,14 +216,14 @@ def delete_employee(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/by-email/{email}", response_model=EmployeeResponse)
-def get_employee_by_email(
+async def get_employee_by_email(
     email: str,
-    db: DatabaseManager = Depends(get_db_manager),
+    repo: AsyncRepository = Depends(get_async_repository),
     _=Depends(verify_token)
 ):
     """Get employee by email address."""
     try:
-        emp = db.get_employee_by_email(email)
+        emp = await repo.get_employee_by_email(email)
         if not emp:
             raise HTTPException(status_code=404, detail="Employee not found")
         return EmployeeResponse(
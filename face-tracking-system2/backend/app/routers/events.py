@@ -0,0 +1,91 @@
+import asyncio
+import json
+from typing import AsyncIterator, Optional, Set
+
+from fastapi import APIRouter, Header, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from utils.event_bus import Event, event_bus
+from utils.logging import get_logger
+from utils.security import decode_access_token
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+EVENT_TYPES = {"attendance", "presence", "unknown_face"}
+RETRY_MS = 3000
+
+
+def format_event(event: Event) -> str:
+    """Encode an event in the text/event-stream format."""
+    data = json.dumps(dict(event.data, timestamp=event.timestamp), separators=(",", ":"), default=str)
+    return f"id: {event.id}\nevent: {event.type}\ndata: {data}\n\n"
+
+
+def authenticate(request: Request, token: Optional[str]) -> dict:
+    """Accept a bearer header or, since EventSource cannot send headers, a ``token`` parameter."""
+    authorization = request.headers.get("Authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    return decode_access_token(token)
+
+
+async def stream_events(request: Request, last_event_id: Optional[str], types: Set[str]) -> AsyncIterator[str]:
+    subscription = event_bus.subscribe(last_event_id)
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        if subscription.resync:
+            # Events were missed; the client should reload its state
+            yield "event: resync\ndata: {}\n\n"
+        for event in subscription.backlog:
+            if event.type in types:
+                yield format_event(event)
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=settings.EVENT_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if subscription.overflowed:
+                # Too slow: disconnect and let the client resume from Last-Event-ID
+                logger.warning("Event stream client fell behind and was disconnected")
+                break
+            if event.type in types:
+                yield format_event(event)
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def event_stream(
+    request: Request,
+    token: Optional[str] = None,
+    types: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Server-Sent Events feed of attendance, presence and unknown-face events.
+
+    Query parameters:
+        token: JWT access token, for clients that cannot send headers
+        types: Comma separated event types to receive (default: all)
+
+    Reconnecting clients send ``Last-Event-ID`` and receive the events they
+    missed while they are still in the server's history; otherwise a
+    ``resync`` event tells them to reload.
+    """
+    authenticate(request, token)
+    wanted = {t.strip() for t in types.split(",")} if types else set(EVENT_TYPES)
+    unknown = wanted - EVENT_TYPES
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown event types: {', '.join(sorted(unknown))}")
+    return StreamingResponse(
+        stream_events(request, last_event_id, wanted),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
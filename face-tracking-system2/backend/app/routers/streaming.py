@@ -1,7 +1,11 @@
-from fastapi import APIRouter, HTTPException, Request, Depends
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Request, Depends, Query
+from fastapi.responses import StreamingResponse, Response
+from fastapi.concurrency import run_in_threadpool
+import time
+from typing import Optional
 from core.fts_system import FaceTrackingPipeline, generate_mjpeg
-from utils.security import verify_token
+from core.stream_encoder import StreamProfile, AdaptiveStreamController
+from utils.security import decode_access_token, verify_token
 from utils.logging import get_logger
 from tasks.camera_tasks import stream_manager
 from app.config import settings
@@ -23,18 +27,18 @@ class PipelineSingleton:
         return cls.instance
 
 
-@router.get("/{camera_id}")
-async def stream_camera(camera_id: int, request: Request, token: str = None):
-    """
-    Stream video from a specific camera with face detection overlay.
-    Includes stream management to prevent resource conflicts.
+async def authorize_stream_request(request: Request, token: Optional[str]):
     """
+    Authenticate a media request.
     
+    Browsers cannot attach headers to ``<img>`` sources, so media endpoints
+    accept the JWT as a ``token`` query parameter and fall back to the
+    Authorization header otherwise.
+    """
     # Verify token from query parameter for streaming
     if token:
         try:
             import jwt
-            from app.config import settings
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
             if payload.get("status") != "active":
                 raise HTTPException(status_code=403, detail="Account inactive")
@@ -46,9 +50,134 @@ async def stream_camera(camera_id: int, request: Request, token: str = None):
             from fastapi.security import HTTPBearer
             security = HTTPBearer()
             credentials = await security(request)
-            user = verify_token(credentials)
+            user = decode_access_token(credentials.credentials)
         except:
             raise HTTPException(status_code=401, detail="Authentication required")
+
+
+# Declared before the /{camera_id} routes, which would otherwise match "status"
+@router.get("/status")
+async def get_all_camera_status(user=Depends(verify_token)):
+    """
+    Get status information for all cameras in one call.
+    
+    Includes every camera that is monitored or being streamed, with its
+    measured frame rate, active viewers, detection latency and inference
+    queue depth. Everything is read from in-memory monitor state.
+    """
+    try:
+        health = {
+            entry["camera_id"]: entry
+            for entry in stream_manager.monitor.health.snapshot_all(settings.CAMERA_WATCHDOG_TIMEOUT)
+        }
+        camera_ids = sorted(set(health) | set(stream_manager.active_streams))
+        
+        cameras = []
+        for camera_id in camera_ids:
+            status = {
+                "camera_id": camera_id,
+                "is_available": False,
+                "state": "not_monitored",
+                "active_streams": stream_manager.get_active_stream_count(camera_id),
+                "max_streams": stream_manager.max_streams_per_camera
+            }
+            status.update(health.get(camera_id, {}))
+            cameras.append(status)
+        
+        return {
+            "cameras": cameras,
+            "total_active_streams": stream_manager.get_total_streams(),
+            "max_concurrent_streams": settings.MAX_CONCURRENT_STREAMS,
+            "generated_at": time.time()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error getting camera status: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{camera_id}/snapshot.jpg")
+async def camera_snapshot(
+    camera_id: int,
+    request: Request,
+    token: str = None,
+    width: Optional[int] = Query(None, ge=160, le=3840),
+    quality: Optional[int] = Query(None, ge=1, le=100),
+    annotate: bool = False
+):
+    """
+    Latest frame of a camera as a JPEG, served from memory.
+    
+    The frame comes from the background monitor's capture, so the camera
+    device is never opened here, and the encoded variant is shared with
+    stream viewers through the encoder cache. Responses carry an ETag so
+    polling dashboards get ``304 Not Modified`` until a new frame arrives.
+    """
+    await authorize_stream_request(request, token)
+    
+    frame_store = stream_manager.monitor.frame_store
+    frame = frame_store.get_frame(camera_id)
+    if frame is None:
+        raise HTTPException(status_code=503, detail=f"No frame available for camera {camera_id}")
+    
+    profile = StreamProfile.create(
+        width=width,
+        quality=quality,
+        annotate=annotate,
+        default_quality=settings.STREAM_QUALITY)
+    detections = frame_store.get_detections(camera_id) if annotate else None
+    detection_seq = detections.seq if detections else 0
+    etag = (f'"{camera_id}-{int(frame.timestamp * 1000)}-{detection_seq}-'
+            f'{profile.width or 0}-{profile.quality}-{int(profile.annotate)}"')
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "X-Frame-Timestamp": f"{frame.timestamp:.3f}"
+    }
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    jpeg = await run_in_threadpool(stream_manager.encoder_cache.get_jpeg, frame, detections, profile)
+    if jpeg is None:
+        raise HTTPException(status_code=500, detail="Failed to encode snapshot")
+    
+    return Response(content=jpeg, media_type="image/jpeg", headers=headers)
+
+
+@router.get("/{camera_id}")
+async def stream_camera(
+    camera_id: int,
+    request: Request,
+    token: str = None,
+    width: Optional[int] = Query(None, ge=160, le=3840),
+    quality: Optional[int] = Query(None, ge=1, le=100),
+    max_fps: Optional[float] = Query(None, gt=0, le=60),
+    annotate: bool = True,
+    adaptive: bool = True,
+    raw: bool = False
+):
+    """
+    Stream video from a specific camera with face detection overlay.
+    Includes stream management to prevent resource conflicts.
+    
+    Output width, JPEG quality (defaults to the STREAM_QUALITY preset) and
+    frame rate can be chosen per client; with ``adaptive`` enabled the server
+    lowers them while the client's connection is backed up.
+    
+    ``raw`` requests passthrough mode: for cameras delivering MJPEG natively
+    (CAMERA_MJPEG_PASSTHROUGH) the compressed frames are forwarded without
+    overlay, decoding or re-encoding.
+    """
+    
+    await authorize_stream_request(request, token)
+    
+    # Only cameras that are configured or already monitored can be streamed
+    if not stream_manager.monitor.is_known_camera(camera_id):
+        raise HTTPException(status_code=404, detail="Camera not found")
+    if not stream_manager.monitor.is_leader:
+        raise HTTPException(status_code=503, detail="Camera monitoring runs in another worker")
     
     # Check if too many streams are active
     if stream_manager.get_total_streams() >= settings.MAX_CONCURRENT_STREAMS:
@@ -64,13 +193,22 @@ async def stream_camera(camera_id: int, request: Request, token: str = None):
             detail=f"Too many active streams for camera {camera_id}"
         )
     
-    pipeline = PipelineSingleton.get_pipeline()
+    profile = StreamProfile.create(
+        width=width,
+        quality=quality,
+        annotate=annotate,
+        default_quality=settings.STREAM_QUALITY,
+        passthrough=raw)
+    controller = AdaptiveStreamController(
+        profile,
+        max_fps=min(max_fps or settings.FRAME_RATE, settings.FRAME_RATE),
+        adaptive=adaptive)
     
     async def safe_stream():
         """Safe streaming generator with proper resource management."""
         try:
-            with stream_manager.get_stream(camera_id) as cap:
-                for frame in generate_mjpeg(camera_id, cap):
+            with stream_manager.get_stream(camera_id) as frame_store:
+                async for frame in generate_mjpeg(camera_id, frame_store, stream_manager.encoder_cache, controller):
                     # Check if client disconnected
                     if await request.is_disconnected():
                         logger.info(f"Client disconnected from camera {camera_id}")
@@ -99,25 +237,26 @@ async def stream_camera(camera_id: int, request: Request, token: str = None):
 
 @router.get("/status/{camera_id}")
 async def get_camera_status(camera_id: int, user=Depends(verify_token)):
-    """Get status information for a specific camera."""
+    """
+    Get status information for a specific camera.
+    
+    Served from the heartbeat state published by the capture workers, so
+    the camera device is never opened here.
+    """
     try:
         active_streams = stream_manager.get_active_stream_count(camera_id)
+        health = stream_manager.monitor.health.snapshot(camera_id, settings.CAMERA_WATCHDOG_TIMEOUT)
         
-        # Test camera availability
-        try:
-            import cv2
-            cap = cv2.VideoCapture(camera_id)
-            is_available = cap.isOpened()
-            cap.release()
-        except Exception:
-            is_available = False
-        
-        return {
+        status = {
             "camera_id": camera_id,
-            "is_available": is_available,
+            "is_available": False,
+            "state": "not_monitored",
             "active_streams": active_streams,
-            "max_streams": 3
+            "max_streams": stream_manager.max_streams_per_camera
         }
+        if health:
+            status.update(health)
+        return status
         
     except Exception as e:
         logger.error(f"Error getting camera {camera_id} status: {e}")
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import struct
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+
+from core.frame_store import DetectionSnapshot
+from tasks.camera_tasks import camera_monitor
+from utils.logging import get_logger
+from utils.security import decode_access_token
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/ws", tags=["WebSocket"])
+
+# Binary message layout (little endian):
+#   header: version (B), camera_id (I), seq (I), frame timestamp (d),
+#           frame width (H), frame height (H), face count (H)
+#   face:   track_id (I), x1, y1, x2, y2 (h), confidence (f),
+#           employee_id length (B) followed by the UTF-8 employee_id
+BINARY_VERSION = 1
+_HEADER = struct.Struct("<BIIdHHH")
+_FACE = struct.Struct("<IhhhhfB")
+
+
+def _authenticate(token: Optional[str]) -> Optional[dict]:
+    """Verify a JWT passed as a query parameter, returning None if it is rejected."""
+    if not token:
+        return None
+    try:
+        return decode_access_token(token)
+    except HTTPException:
+        return None
+
+
+def encode_binary(snapshot: DetectionSnapshot) -> bytes:
+    """Pack a detection snapshot into the compact binary format."""
+    parts = [_HEADER.pack(
+        BINARY_VERSION,
+        snapshot.camera_id,
+        snapshot.seq,
+        snapshot.frame_timestamp,
+        snapshot.frame_width,
+        snapshot.frame_height,
+        len(snapshot.faces))]
+    for face in snapshot.faces:
+        employee_id = (face["employee_id"] or "").encode("utf-8")[:255]
+        x1, y1, x2, y2 = face["bbox"]
+        parts.append(_FACE.pack(
+            face["track_id"] or 0, x1, y1, x2, y2,
+            face["confidence"], len(employee_id)))
+        parts.append(employee_id)
+    return b"".join(parts)
+
+
+async def _send_detections(websocket: WebSocket, camera_id: int, format: str, interval: float):
+    """Send each new detection snapshot of a camera, at most once per ``interval``."""
+    last_seq = 0
+    while True:
+        snapshot = camera_monitor.frame_store.get_detections(camera_id)
+        if snapshot is not None and snapshot.seq != last_seq:
+            last_seq = snapshot.seq
+            if format == "binary":
+                await websocket.send_bytes(encode_binary(snapshot))
+            else:
+                await websocket.send_text(json.dumps(snapshot.to_dict(), separators=(",", ":")))
+        await asyncio.sleep(interval)
+
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    """Return once the client disconnects; messages from the client are ignored."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+@router.websocket("/detections/{camera_id}")
+async def detections_feed(
+    websocket: WebSocket,
+    camera_id: int,
+    token: Optional[str] = None,
+    format: str = "json",
+    max_fps: float = 15.0
+):
+    """
+    Push per-frame detection results (track id, bbox, employee id, confidence
+    and frame timestamp) for a camera, without any video payload.
+
+    Query parameters:
+        token: JWT access token
+        format: "json" (text frames) or "binary" (see ``encode_binary``)
+        max_fps: Upper bound on messages per second for this client
+    """
+    if _authenticate(token) is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    if format not in ("json", "binary"):
+        await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+        return
+    # Same checks as the MJPEG stream: only known cameras, only where they are monitored
+    if not camera_monitor.is_known_camera(camera_id):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    if not camera_monitor.is_leader:
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+
+    await websocket.accept()
+    interval = 1.0 / max(0.5, min(max_fps, 60.0))
+    logger.info(f"Detection feed opened for camera {camera_id} ({format})")
+
+    # The sender only notices a disconnect when a send fails, which never
+    # happens while the camera produces no detections; watch for it separately
+    sender = asyncio.create_task(_send_detections(websocket, camera_id, format, interval))
+    watcher = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        done, pending = await asyncio.wait({sender, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            task.result()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Detection feed error for camera {camera_id}: {e}")
+    finally:
+        for task in (sender, watcher):
+            task.cancel()
+        logger.info(f"Detection feed closed for camera {camera_id}")
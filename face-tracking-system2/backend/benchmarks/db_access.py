@@ -0,0 +1,168 @@
+"""
+Read throughput of the async repository against the threadpool path.
+
+Serves the same reads two ways from one in-process app:
+
+    /sync/...   ``def`` endpoints calling ``DatabaseManager``; Starlette runs
+                them in its threadpool (40 threads by default)
+    /async/...  ``async def`` endpoints awaiting ``AsyncRepository``
+
+and drives each path with many concurrent clients through httpx's ASGI
+transport, so no server or network is involved and only the way the
+request reaches the database differs. Run it against a database with
+realistic data; the numbers are only comparable on the same machine.
+
+Usage:
+    python -m benchmarks.db_access --clients 500 --requests 20000
+    python -m benchmarks.db_access --endpoints attendance --paths async
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db.async_repository import AsyncRepository, dispose_async_engine, get_async_repository
+from db.db_manager import DatabaseManager
+
+ENDPOINTS = ('employees', 'employee', 'attendance')
+PATHS = ('sync', 'async')
+
+
+def build_app(db_manager: DatabaseManager) -> FastAPI:
+    """Build an app exposing each read through both paths."""
+    app = FastAPI()
+
+    @app.get("/sync/employees")
+    def sync_employees():
+        return len(db_manager.get_all_employees())
+
+    @app.get("/sync/employee/{employee_id}")
+    def sync_employee(employee_id: str):
+        employee = db_manager.get_employee(employee_id)
+        if not employee:
+            raise HTTPException(status_code=404)
+        return employee.id
+
+    @app.get("/sync/attendance")
+    def sync_attendance():
+        records = db_manager.get_attendance_page(limit=50)
+        if records is None:
+            raise HTTPException(status_code=500)
+        return len(records)
+
+    @app.get("/async/employees")
+    async def async_employees(repo: AsyncRepository = Depends(get_async_repository)):
+        return len(await repo.get_all_employees())
+
+    @app.get("/async/employee/{employee_id}")
+    async def async_employee(employee_id: str, repo: AsyncRepository = Depends(get_async_repository)):
+        employee = await repo.get_employee(employee_id)
+        if not employee:
+            raise HTTPException(status_code=404)
+        return employee.id
+
+    @app.get("/async/attendance")
+    async def async_attendance(repo: AsyncRepository = Depends(get_async_repository)):
+        records = await repo.get_attendance_page(limit=50)
+        if records is None:
+            raise HTTPException(status_code=500)
+        return len(records)
+
+    return app
+
+
+async def run_load(app: FastAPI, url: str, clients: int, requests: int) -> Dict:
+    """
+    Issue ``requests`` GETs of ``url`` from ``clients`` concurrent clients.
+
+    Returns:
+        Throughput, latency percentiles in milliseconds and error count
+    """
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def client(http: httpx.AsyncClient):
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                response = await http.get(url)
+                if response.status_code != 200:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'throughput': len(latencies) / elapsed if elapsed else 0.0,
+        'p50': cuts[49] * 1000,
+        'p95': cuts[94] * 1000,
+        'p99': cuts[98] * 1000,
+        'errors': errors,
+    }
+
+
+async def run(args) -> int:
+    # Measure the database access paths, not the lookup caches in front of them
+    for cache in (DatabaseManager.employee_cache, DatabaseManager.employee_list_cache, DatabaseManager.user_cache):
+        cache.ttl = 0
+    db_manager = DatabaseManager()
+    employees = db_manager.get_all_employees()
+    if 'employee' in args.endpoints and not employees:
+        print("No active employees; add some or leave out the 'employee' endpoint")
+        return 1
+    app = build_app(db_manager)
+
+    print(f"{args.clients} clients, {args.requests} requests per run")
+    print(f"{'endpoint':<12} {'path':<6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    try:
+        for endpoint in args.endpoints:
+            suffix = f"/{employees[0].id}" if endpoint == 'employee' else ""
+            for path in args.paths:
+                url = f"/{path}/{endpoint}{suffix}"
+                # Warm up the connection pools before measuring
+                await run_load(app, url, min(args.clients, 50), min(args.requests, 200))
+                result = await run_load(app, url, args.clients, args.requests)
+                print(f"{endpoint:<12} {path:<6} {result['throughput']:>9.1f} {result['p50']:>9.1f} "
+                      f"{result['p95']:>9.1f} {result['p99']:>9.1f} {result['errors']:>7}")
+    finally:
+        await dispose_async_engine()
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the async and threadpool database read paths")
+    parser.add_argument("--clients", type=int, default=500, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=10000, help="Requests per endpoint and path")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=list(PATHS))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    sys.exit(asyncio.run(run(parse_args(argv))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Camera Health Registry
+======================
+In-memory heartbeat state published by the capture workers. Status endpoints
+read it instead of probing the camera device, and the monitor's watchdog uses
+it to find workers that stopped delivering frames.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Worker states
+STARTING = 'starting'
+RUNNING = 'running'
+RECONNECTING = 'reconnecting'
+STALLED = 'stalled'
+FINISHED = 'finished'
+STOPPED = 'stopped'
+
+
+class CameraHealth:
+    """
+    Heartbeat state of one camera worker.
+    """
+
+    __slots__ = ('camera_id', 'source', 'state', 'started_at', 'last_frame_time',
+                 'last_heartbeat', 'fps', 'frames_total', 'error_count',
+                 'reconnects', 'restarts', 'queue_depth', 'detection_latency',
+                 'processing_time', 'detections_total')
+
+    def __init__(self, camera_id: int, source: str):
+        now = time.time()
+        self.camera_id = camera_id
+        self.source = source
+        self.state = STARTING
+        self.started_at = now
+        self.last_frame_time: Optional[float] = None
+        self.last_heartbeat = now
+        self.fps = 0.0
+        self.frames_total = 0
+        self.error_count = 0
+        self.reconnects = 0
+        self.restarts = 0
+        self.queue_depth = 0
+        self.detection_latency = 0.0
+        self.processing_time = 0.0
+        self.detections_total = 0
+
+    def to_dict(self, stale_after: float) -> Dict:
+        now = time.time()
+        frame_age = now - self.last_frame_time if self.last_frame_time else None
+        return {
+            'camera_id': self.camera_id,
+            'source': self.source,
+            'state': self.state,
+            'is_available': self.state == RUNNING and frame_age is not None and frame_age < stale_after,
+            'fps': round(self.fps, 2),
+            'last_frame_age': round(frame_age, 3) if frame_age is not None else None,
+            'frames_total': self.frames_total,
+            'error_count': self.error_count,
+            'reconnects': self.reconnects,
+            'restarts': self.restarts,
+            'queue_depth': self.queue_depth,
+            'detection_latency_ms': round(self.detection_latency * 1000, 1),
+            'processing_time_ms': round(self.processing_time * 1000, 1),
+            'detections_total': self.detections_total,
+            'uptime': round(now - self.started_at, 1),
+        }
+
+
+class CameraHealthRegistry:
+    """
+    Thread-safe registry of camera worker heartbeats.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._health: Dict[int, CameraHealth] = {}
+
+    def register(self, camera_id: int, source: str):
+        """Reset a camera's health when its worker (re)starts, keeping the restart count."""
+        with self._lock:
+            previous = self._health.get(camera_id)
+            health = CameraHealth(camera_id, source)
+            if previous:
+                health.restarts = previous.restarts
+            self._health[camera_id] = health
+
+    def frame(self, camera_id: int, timestamp: float):
+        """Record a successfully captured frame."""
+        with self._lock:
+            health = self._health.get(camera_id)
+            if health is None:
+                return
+            if health.last_frame_time is not None:
+                interval = timestamp - health.last_frame_time
+                if interval > 0:
+                    instant_fps = 1.0 / interval
+                    health.fps = instant_fps if health.fps == 0 else 0.9 * health.fps + 0.1 * instant_fps
+            health.last_frame_time = timestamp
+            health.last_heartbeat = timestamp
+            health.frames_total += 1
+            health.state = RUNNING
+
+    def failure(self, camera_id: int, error_count: int, reconnects: int, reconnecting: bool):
+        """Record a failed read, mirroring the source's counters."""
+        with self._lock:
+            health = self._health.get(camera_id)
+            if health is None:
+                return
+            health.last_heartbeat = time.time()
+            health.error_count = error_count
+            health.reconnects = reconnects
+            if reconnecting:
+                health.state = RECONNECTING
+
+    def set_queue_depth(self, camera_id: int, depth: int):
+        """Record how many frames of a camera are waiting for or in inference."""
+        with self._lock:
+            health = self._health.get(camera_id)
+            if health is not None:
+                health.queue_depth = depth
+
+    def inference_done(self, camera_id: int, latency: float, processing_time: float):
+        """
+        Record a finished inference.
+
+        Args:
+            camera_id: Camera identifier
+            latency: Seconds from frame capture to detection results
+            processing_time: Seconds spent in the detector
+        """
+        with self._lock:
+            health = self._health.get(camera_id)
+            if health is None:
+                return
+            health.detections_total += 1
+            if health.detections_total == 1:
+                health.detection_latency = latency
+                health.processing_time = processing_time
+            else:
+                health.detection_latency = 0.8 * health.detection_latency + 0.2 * latency
+                health.processing_time = 0.8 * health.processing_time + 0.2 * processing_time
+
+    def set_state(self, camera_id: int, state: str):
+        with self._lock:
+            health = self._health.get(camera_id)
+            if health is not None:
+                health.state = state
+
+    def record_restart(self, camera_id: int):
+        with self._lock:
+            health = self._health.get(camera_id)
+            if health is not None:
+                health.restarts += 1
+                health.state = STALLED
+
+    def get(self, camera_id: int) -> Optional[CameraHealth]:
+        with self._lock:
+            return self._health.get(camera_id)
+
+    def snapshot(self, camera_id: int, stale_after: float) -> Optional[Dict]:
+        """Health of one camera as a dict, or None if it was never monitored."""
+        with self._lock:
+            health = self._health.get(camera_id)
+            return health.to_dict(stale_after) if health else None
+
+    def snapshot_all(self, stale_after: float) -> List[Dict]:
+        with self._lock:
+            return [health.to_dict(stale_after) for health in self._health.values()]
+
+    def stale_cameras(self, timeout: float) -> List[int]:
+        """
+        Cameras whose worker is supposed to be reading but has not produced
+        a frame within ``timeout`` seconds. Reconnecting cameras are
+        included; the caller tells a backoff wait from a hung reconnect.
+        """
+        now = time.time()
+        with self._lock:
+            return [
+                health.camera_id for health in self._health.values()
+                if health.state in (STARTING, RUNNING, RECONNECTING)
+                and now - (health.last_frame_time or health.started_at) > timeout
+            ]
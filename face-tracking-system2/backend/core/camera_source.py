@@ -0,0 +1,259 @@
+"""
+Camera Sources
+==============
+Uniform access to the video inputs the monitor can consume: local device
+indices, network streams (RTSP/HTTP) and video files. Sources reconnect with
+exponential backoff after failures, and files can be replayed in real time or
+as fast as possible to load-test the pipeline without any cameras attached.
+"""
+
+import os
+import threading
+import time
+import logging
+from typing import Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from core.frame_store import as_jpeg_buffer
+
+logger = logging.getLogger(__name__)
+
+REPLAY_REALTIME = 'realtime'
+REPLAY_MAX = 'max'
+
+_STREAM_PREFIXES = ('rtsp://', 'rtsps://', 'rtmp://', 'http://', 'https://', 'udp://', 'tcp://')
+
+
+def parse_source(spec: Union[int, str]) -> Union[int, str]:
+    """
+    Normalize a source specification.
+
+    Args:
+        spec: Device index, stream URL or file path
+
+    Returns:
+        An int for device indices, otherwise the string unchanged
+    """
+    if isinstance(spec, int):
+        return spec
+    spec = spec.strip()
+    if spec.isdigit():
+        return int(spec)
+    return spec
+
+
+def source_kind(source: Union[int, str]) -> str:
+    """Classify a parsed source as 'device', 'stream' or 'file'."""
+    if isinstance(source, int):
+        return 'device'
+    if source.lower().startswith(_STREAM_PREFIXES):
+        return 'stream'
+    return 'file'
+
+
+class CameraSource:
+    """
+    Reconnecting frame source backed by ``cv2.VideoCapture``.
+    """
+
+    def __init__(self, source: Union[int, str], width: Optional[int] = None,
+                 height: Optional[int] = None, fps: Optional[int] = None,
+                 mjpeg_passthrough: bool = False, replay_speed: str = REPLAY_REALTIME,
+                 loop: bool = True, max_consecutive_failures: int = 5,
+                 backoff_initial: float = 0.5, backoff_max: float = 30.0,
+                 stop_event: Optional[threading.Event] = None):
+        """
+        Args:
+            source: Device index, stream URL or file path
+            width: Requested frame width (devices only)
+            height: Requested frame height (devices only)
+            fps: Requested frame rate (devices only)
+            mjpeg_passthrough: Keep MJPEG frames compressed (devices only)
+            replay_speed: 'realtime' or 'max' pacing for file sources
+            loop: Restart file sources from the beginning at end of file
+            max_consecutive_failures: Failed reads before the source is reopened
+            backoff_initial: First reconnect delay in seconds
+            backoff_max: Upper bound for the reconnect delay
+            stop_event: Event that interrupts reconnect waits
+        """
+        self.source = parse_source(source)
+        self.kind = source_kind(self.source)
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.mjpeg_passthrough = mjpeg_passthrough and self.kind == 'device'
+        self.replay_speed = replay_speed
+        self.loop = loop
+        self.max_consecutive_failures = max_consecutive_failures
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.stop_event = stop_event or threading.Event()
+
+        self.cap: Optional[cv2.VideoCapture] = None
+        self.reconnects = 0
+        self.errors = 0
+        self.finished = False
+        self.connecting = False
+        self._passthrough_active = False
+        self._failures = 0
+        self._backoff = backoff_initial
+        self._replay_start = 0.0
+        self._replay_frames = 0
+        self._replay_fps = 0.0
+
+    @property
+    def is_file(self) -> bool:
+        return self.kind == 'file'
+
+    def open(self) -> bool:
+        """
+        Open the underlying capture.
+
+        Returns:
+            True if the capture is open
+        """
+        self.release()
+        if self.is_file and not os.path.exists(self.source):
+            logger.error(f"Video file not found: {self.source}")
+            return False
+
+        cap = cv2.VideoCapture(self.source)
+        if not cap.isOpened():
+            cap.release()
+            return False
+
+        if self.kind == 'device':
+            if self.mjpeg_passthrough:
+                # Ask for the camera's native MJPEG and keep it compressed
+                cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+                cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+            if self.width and self.height:
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+            if self.fps:
+                cap.set(cv2.CAP_PROP_FPS, self.fps)
+        elif self.kind == 'stream':
+            # Keep latency low: only the newest frame matters
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self.cap = cap
+        self._passthrough_active = self.mjpeg_passthrough
+        self._failures = 0
+        self._start_replay_clock()
+        return True
+
+    def open_with_retry(self) -> bool:
+        """
+        Open the capture, retrying with exponential backoff until it succeeds
+        or the stop event is set.
+
+        Returns:
+            True if the capture is open
+        """
+        self.connecting = True
+        try:
+            while not self.stop_event.is_set():
+                if self.open():
+                    if self.reconnects:
+                        logger.info(f"Reconnected to source {self.describe()}")
+                    return True
+                self.errors += 1
+                self.reconnects += 1
+                logger.warning(f"Could not open source {self.describe()}, retrying in {self._backoff:.1f}s")
+                self.stop_event.wait(self._backoff)
+                self._backoff = min(self.backoff_max, self._backoff * 2)
+            return False
+        finally:
+            self.connecting = False
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray], Optional[bytes]]:
+        """
+        Read the next frame, reconnecting if the source failed.
+
+        Returns:
+            Tuple of (success, decoded image, JPEG buffer); exactly one of the
+            image and the buffer is set on success
+        """
+        if self.finished or self.stop_event.is_set():
+            return False, None, None
+        if self.cap is None and not self.open_with_retry():
+            return False, None, None
+
+        ret, frame = self.cap.read()
+        if not ret or frame is None:
+            return self._handle_failure()
+        self._failures = 0
+        self._backoff = self.backoff_initial
+
+        if self.is_file:
+            self._pace_replay()
+
+        if self._passthrough_active:
+            jpeg = as_jpeg_buffer(frame)
+            if jpeg is not None:
+                return True, None, jpeg
+            # Backend or device ignored the request; fall back to decoded frames
+            logger.info(f"Source {self.describe()} does not deliver MJPEG, passthrough disabled")
+            self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+            self._passthrough_active = False
+            return False, None, None
+
+        return True, frame, None
+
+    def release(self):
+        """Release the underlying capture."""
+        if self.cap is not None:
+            try:
+                self.cap.release()
+            except Exception as e:
+                logger.debug(f"Error releasing source {self.describe()}: {e}")
+            self.cap = None
+
+    def describe(self) -> str:
+        return f"{self.kind}:{self.source}"
+
+    def _handle_failure(self) -> Tuple[bool, None, None]:
+        if self.is_file:
+            # End of file (or unreadable frame) for replays
+            if self.loop:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                self._start_replay_clock()
+            else:
+                logger.info(f"Replay of {self.source} finished")
+                self.finished = True
+                self.release()
+            return False, None, None
+
+        self.errors += 1
+        self._failures += 1
+        if self._failures >= self.max_consecutive_failures:
+            logger.warning(f"Source {self.describe()} failed {self._failures} reads, reconnecting")
+            self.release()
+            self.reconnects += 1
+            self.connecting = True
+            try:
+                self.stop_event.wait(self._backoff)
+            finally:
+                self.connecting = False
+            self._backoff = min(self.backoff_max, self._backoff * 2)
+        else:
+            self.stop_event.wait(0.1)
+        return False, None, None
+
+    def _start_replay_clock(self):
+        self._replay_start = time.monotonic()
+        self._replay_frames = 0
+        if self.is_file and self.cap is not None:
+            self._replay_fps = self.cap.get(cv2.CAP_PROP_FPS) or 0.0
+
+    def _pace_replay(self):
+        """Sleep so that file frames are delivered at their recorded rate."""
+        self._replay_frames += 1
+        if self.replay_speed != REPLAY_REALTIME or self._replay_fps <= 0:
+            return
+        due = self._replay_start + self._replay_frames / self._replay_fps
+        delay = due - time.monotonic()
+        if delay > 0:
+            self.stop_event.wait(delay)
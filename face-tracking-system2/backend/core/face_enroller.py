@@ -9,7 +9,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from db.db_manager import DatabaseManager
 from db.db_models import FaceEmbedding
-from core.fts_system import FaceTrackingPipeline
+from core.fts_system import FaceTrackingPipeline, bump_gallery_version
 class FaceEnrollmentError(Exception):
     pass
 class EmployeeNotFoundError(FaceEnrollmentError):
@@ -36,6 +36,11 @@ class FaceEnroller:
         return isinstance(score, (int, float)) and 0.0 <= score <= 1.0
     def set_batch_mode(self, enabled: bool):
         self._batch_mode = enabled
+    def _gallery_changed(self):
+        # Other workers notice the new version and reload their gallery too
+        bump_gallery_version()
+        if self.tracking_system:
+            self.tracking_system.reload_embeddings_and_rebuild_index()
     def enroll_from_images(self, employee_id: str,
                            employee_name: str,
                            image_paths: Union[List[str], str],
@@ -106,8 +111,8 @@ class FaceEnroller:
         if valid_count >= min_faces:
             action = "Updated" if update_existing else "Enrolled"
             self.logger.info(f"{action} {employee_name} ({employee_id}) with {valid_count} images")
-            if rebuild_index and not self._batch_mode and self.tracking_system:
-                self.tracking_system.reload_embeddings_and_rebuild_index()
+            if rebuild_index and not self._batch_mode:
+                self._gallery_changed()
             return True
         else:
             self.logger.error(f"Only {valid_count} valid faces found (minimum {min_faces} required)")
@@ -144,8 +149,8 @@ class FaceEnroller:
             )
             if stored:
                 self.logger.info(f"Added new embedding for {employee_id} from {image_path}")
-                if rebuild_index and not self._batch_mode and self.tracking_system:
-                    self.tracking_system.reload_embeddings_and_rebuild_index()
+                if rebuild_index and not self._batch_mode:
+                    self._gallery_changed()
                 return True
             else:
                 self.logger.error(f"Error storing embedding for {employee_id} from {image_path}")
@@ -167,8 +172,8 @@ class FaceEnroller:
                 update_existing=True,
                 rebuild_index=False
             )
-            if success and rebuild_index and self.tracking_system:
-                self.tracking_system.reload_embeddings_and_rebuild_index()
+            if success and rebuild_index:
+                self._gallery_changed()
             return success
         finally:
             self.set_batch_mode(False)
@@ -177,8 +182,8 @@ class FaceEnroller:
             success = self.db_manager.remove_embedding(embedding_id)
             if success:
                 self.logger.info(f"Deleted embedding ID {embedding_id}")
-                if rebuild_index and not self._batch_mode and self.tracking_system:
-                    self.tracking_system.reload_embeddings_and_rebuild_index()
+                if rebuild_index and not self._batch_mode:
+                    self._gallery_changed()
             else:
                 self.logger.error(f"Error deleting embedding ID {embedding_id}")
                 raise DatabaseOperationError(f"Failed to delete embedding ID {embedding_id}")
@@ -193,8 +198,8 @@ class FaceEnroller:
             success = self.db_manager.delete_embeddings(employee_id)
             if success:
                 self.logger.info(f"Deleted all embeddings for {employee_id}")
-                if rebuild_index and not self._batch_mode and self.tracking_system:
-                    self.tracking_system.reload_embeddings_and_rebuild_index()
+                if rebuild_index and not self._batch_mode:
+                    self._gallery_changed()
                 return True
             else:
                 self.logger.error(f"Error deleting embeddings for {employee_id}")
@@ -209,8 +214,8 @@ class FaceEnroller:
             success = self.db_manager.archive_embeddings(employee_id)
             if success:
                 self.logger.info(f"Archived all embeddings for {employee_id}")
-                if rebuild_index and not self._batch_mode and self.tracking_system:
-                    self.tracking_system.reload_embeddings_and_rebuild_index()
+                if rebuild_index and not self._batch_mode:
+                    self._gallery_changed()
                 return True
             else:
                 self.logger.error(f"Error archiving embeddings for {employee_id}")
@@ -225,8 +230,8 @@ class FaceEnroller:
             success = self.db_manager.delete_employee(employee_id)
             if success:
                 self.logger.info(f"Deleted employee {employee_id} from database")
-                if rebuild_index and not self._batch_mode and self.tracking_system:
-                    self.tracking_system.reload_embeddings_and_rebuild_index()
+                if rebuild_index and not self._batch_mode:
+                    self._gallery_changed()
             else:
                 self.logger.error(f"Error deleting employee {employee_id} from database")
                 raise DatabaseOperationError(f"Failed to delete employee {employee_id}")
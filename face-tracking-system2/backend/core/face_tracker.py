@@ -0,0 +1,140 @@
+"""
+Lightweight Face Tracker
+========================
+Associates per-frame face detections into tracks using greedy IoU matching so
+that downstream consumers (live overlays, attendance, trajectories) can refer
+to a stable track id instead of an anonymous bounding box.
+"""
+
+import threading
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+
+def bbox_iou(a: List[int], b: List[int]) -> float:
+    """
+    Compute intersection-over-union of two [x1, y1, x2, y2] boxes.
+
+    Args:
+        a: First bounding box
+        b: Second bounding box
+
+    Returns:
+        IoU value in the range [0, 1]
+    """
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    if inter == 0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return inter / float(area_a + area_b - inter)
+
+
+class Track:
+    """
+    State of a single tracked face.
+    """
+
+    __slots__ = ('track_id', 'bbox', 'employee_id', 'confidence',
+                 'first_seen', 'last_seen', 'hits')
+
+    def __init__(self, track_id: int, bbox: List[int], timestamp: float):
+        self.track_id = track_id
+        self.bbox = bbox
+        self.employee_id: Optional[str] = None
+        self.confidence = 0.0
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.hits = 0
+
+    def update(self, face_data: Dict, timestamp: float):
+        """Apply a matched detection to the track."""
+        self.bbox = face_data['bbox']
+        self.last_seen = timestamp
+        self.hits += 1
+        employee_id = face_data.get('employee_id')
+        confidence = float(face_data.get('confidence', 0.0))
+        # Keep the strongest identity seen so far; an unrecognised frame
+        # does not erase a previous match.
+        if employee_id and (self.employee_id is None or confidence >= self.confidence):
+            self.employee_id = employee_id
+            self.confidence = confidence
+        elif self.employee_id is None:
+            self.confidence = max(self.confidence, confidence)
+
+
+class FaceTracker:
+    """
+    Greedy IoU tracker for a single camera.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, iou_threshold: float = 0.3, max_age: float = 2.0):
+        """
+        Args:
+            iou_threshold: Minimum IoU for a detection to continue a track
+            max_age: Seconds without a match after which a track ends
+        """
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.tracks: Dict[int, Track] = {}
+        self._lock = threading.Lock()
+
+    def update(self, faces: List[Dict], timestamp: float) -> Tuple[List[Track], List[Track]]:
+        """
+        Match detections to tracks and expire stale tracks.
+
+        Each face dict is annotated in place with its ``track_id``.
+
+        Args:
+            faces: Face detection results from ``FaceTrackingSystem.detect_faces``
+            timestamp: Frame timestamp
+
+        Returns:
+            Tuple of (tracks matched in this frame, tracks that ended)
+        """
+        with self._lock:
+            candidates = []
+            for face_idx, face in enumerate(faces):
+                for track in self.tracks.values():
+                    iou = bbox_iou(face['bbox'], track.bbox)
+                    if iou >= self.iou_threshold:
+                        candidates.append((iou, face_idx, track.track_id))
+            candidates.sort(reverse=True)
+
+            matched_faces = set()
+            matched_tracks = set()
+            for _, face_idx, track_id in candidates:
+                if face_idx in matched_faces or track_id in matched_tracks:
+                    continue
+                matched_faces.add(face_idx)
+                matched_tracks.add(track_id)
+                self.tracks[track_id].update(faces[face_idx], timestamp)
+                faces[face_idx]['track_id'] = track_id
+
+            for face_idx, face in enumerate(faces):
+                if face_idx in matched_faces:
+                    continue
+                track = Track(next(self._ids), face['bbox'], timestamp)
+                track.update(face, timestamp)
+                self.tracks[track.track_id] = track
+                matched_tracks.add(track.track_id)
+                face['track_id'] = track.track_id
+
+            ended = self._expire(timestamp)
+            active = [self.tracks[track_id] for track_id in matched_tracks]
+            return active, ended
+
+    def expire(self, timestamp: float) -> List[Track]:
+        """End tracks not seen for ``max_age`` seconds before ``timestamp``."""
+        with self._lock:
+            return self._expire(timestamp)
+
+    def _expire(self, timestamp: float) -> List[Track]:
+        ended = [t for t in self.tracks.values() if timestamp - t.last_seen > self.max_age]
+        for track in ended:
+            del self.tracks[track.track_id]
+        return ended
@@ -0,0 +1,237 @@
+"""
+Shared Frame Store
+==================
+In-memory store of the most recent per-camera results produced by the
+background monitor, so API consumers can read them without touching the
+camera device or re-running detection.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Start-of-frame markers that carry the image dimensions
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def as_jpeg_buffer(raw: np.ndarray) -> Optional[bytes]:
+    """
+    Return the bytes of a still-compressed capture buffer.
+
+    With ``CAP_PROP_CONVERT_RGB`` disabled on an MJPG capture, OpenCV hands
+    back the camera's JPEG as a flat uint8 array instead of a BGR image.
+
+    Args:
+        raw: Array returned by ``VideoCapture.read``
+
+    Returns:
+        JPEG bytes, or None if the array is a decoded image
+    """
+    if raw is None or raw.dtype != np.uint8 or (raw.ndim > 1 and raw.shape[0] != 1):
+        return None
+    data = raw.tobytes()
+    if data[:2] != b'\xff\xd8':
+        return None
+    return data
+
+
+def jpeg_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) from a JPEG header without decoding it.
+
+    Args:
+        data: JPEG bytes
+
+    Returns:
+        Tuple of (width, height), or None if no frame header is found
+    """
+    pos = 2
+    size = len(data)
+    while pos + 9 < size:
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+            continue
+        if marker in _SOF_MARKERS:
+            height = (data[pos + 5] << 8) | data[pos + 6]
+            width = (data[pos + 7] << 8) | data[pos + 8]
+            return width, height
+        if marker == 0xD8 or 0xD0 <= marker <= 0xD7:
+            pos += 2
+            continue
+        pos += 2 + ((data[pos + 2] << 8) | data[pos + 3])
+    return None
+
+
+class CapturedFrame:
+    """
+    Most recent frame captured from a camera.
+
+    A frame holds either a decoded BGR image or, for cameras delivering MJPEG
+    natively, the camera's compressed buffer. Compressed frames are decoded
+    lazily the first time ``image`` is accessed, so frames that are only
+    forwarded to passthrough viewers are never decoded.
+    """
+
+    __slots__ = ('camera_id', 'seq', 'timestamp', 'jpeg', '_image', '_size', '_lock')
+
+    def __init__(self, camera_id: int, seq: int, timestamp: float,
+                 image: Optional[np.ndarray] = None, jpeg: Optional[bytes] = None):
+        if image is None and jpeg is None:
+            raise ValueError("A frame needs an image or a JPEG buffer")
+        self.camera_id = camera_id
+        self.seq = seq
+        self.timestamp = timestamp
+        self.jpeg = jpeg
+        self._image = image
+        self._size = (image.shape[1], image.shape[0]) if image is not None else None
+        self._lock = threading.Lock()
+
+    @property
+    def image(self) -> Optional[np.ndarray]:
+        """Decoded BGR image, decoding the JPEG buffer on first access."""
+        if self._image is None:
+            with self._lock:
+                if self._image is None:
+                    self._image = cv2.imdecode(np.frombuffer(self.jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+        return self._image
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Frame (width, height), read from the JPEG header when possible."""
+        if self._size is None:
+            self._size = jpeg_dimensions(self.jpeg) if self.jpeg else None
+            if self._size is None and self.image is not None:
+                self._size = (self.image.shape[1], self.image.shape[0])
+        return self._size or (0, 0)
+
+    @property
+    def width(self) -> int:
+        return self.size[0]
+
+
+class DetectionSnapshot:
+    """
+    Compact detection results for a single processed frame.
+    """
+
+    __slots__ = ('camera_id', 'seq', 'frame_timestamp', 'frame_width',
+                 'frame_height', 'faces')
+
+    def __init__(self, camera_id: int, seq: int, frame_timestamp: float,
+                 frame_width: int, frame_height: int, faces: List[Dict]):
+        self.camera_id = camera_id
+        self.seq = seq
+        self.frame_timestamp = frame_timestamp
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.faces = faces
+
+    def to_dict(self) -> Dict:
+        return {
+            'camera_id': self.camera_id,
+            'seq': self.seq,
+            'ts': self.frame_timestamp,
+            'w': self.frame_width,
+            'h': self.frame_height,
+            'faces': self.faces,
+        }
+
+
+class FrameStore:
+    """
+    Thread-safe holder for the latest results of every monitored camera.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frames: Dict[int, CapturedFrame] = {}
+        self._detections: Dict[int, DetectionSnapshot] = {}
+
+    def publish_frame(self, camera_id: int, timestamp: float, image: Optional[np.ndarray] = None,
+                      jpeg: Optional[bytes] = None) -> CapturedFrame:
+        """
+        Publish a newly captured frame.
+
+        The frame array is shared with readers and must not be modified
+        after publishing.
+
+        Args:
+            camera_id: Camera identifier
+            timestamp: Capture timestamp
+            image: Captured BGR frame
+            jpeg: Compressed frame from an MJPEG passthrough capture
+
+        Returns:
+            The published frame
+        """
+        with self._lock:
+            previous = self._frames.get(camera_id)
+            frame = CapturedFrame(
+                camera_id=camera_id,
+                seq=previous.seq + 1 if previous else 1,
+                timestamp=timestamp,
+                image=image,
+                jpeg=jpeg)
+            self._frames[camera_id] = frame
+            return frame
+
+    def get_frame(self, camera_id: int) -> Optional[CapturedFrame]:
+        """Get the latest captured frame for a camera."""
+        with self._lock:
+            return self._frames.get(camera_id)
+
+    def publish_detections(self, camera_id: int, frame_timestamp: float,
+                           frame_shape: tuple, faces: List[Dict]) -> Optional[DetectionSnapshot]:
+        """
+        Publish detection results for a processed frame.
+
+        Results for a frame older than the one already published are dropped,
+        since inference workers can finish out of order.
+
+        Args:
+            camera_id: Camera identifier
+            frame_timestamp: Capture timestamp of the processed frame
+            frame_shape: Shape of the processed frame (height, width, ...)
+            faces: Face detection results annotated with ``track_id``
+
+        Returns:
+            The published snapshot, or None if it was stale
+        """
+        compact = [
+            {
+                'track_id': face.get('track_id'),
+                'bbox': [int(v) for v in face['bbox']],
+                'employee_id': face.get('employee_id'),
+                'confidence': round(float(face.get('confidence', 0.0)), 3),
+            }
+            for face in faces
+        ]
+        with self._lock:
+            previous = self._detections.get(camera_id)
+            if previous and previous.frame_timestamp > frame_timestamp:
+                return None
+            snapshot = DetectionSnapshot(
+                camera_id=camera_id,
+                seq=previous.seq + 1 if previous else 1,
+                frame_timestamp=frame_timestamp,
+                frame_width=int(frame_shape[1]),
+                frame_height=int(frame_shape[0]),
+                faces=compact)
+            self._detections[camera_id] = snapshot
+            return snapshot
+
+    def get_detections(self, camera_id: int) -> Optional[DetectionSnapshot]:
+        """Get the latest detection snapshot for a camera."""
+        with self._lock:
+            return self._detections.get(camera_id)
+
+    def clear(self, camera_id: int):
+        """Forget all cached results for a camera."""
+        with self._lock:
+            self._frames.pop(camera_id, None)
+            self._detections.pop(camera_id, None)
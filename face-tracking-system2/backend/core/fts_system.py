@@ -5,19 +5,39 @@ This module provides the core face tracking functionality including face detecti
 recognition, and video streaming capabilities using InsightFace and OpenCV.
 """
 
-import cv2
+import asyncio
 import numpy as np
 import logging
 import time
-from typing import List, Dict, Optional, Tuple, Generator
+from typing import List, Dict, Optional, Tuple, AsyncGenerator
 from insightface.app import FaceAnalysis
 from db.db_manager import DatabaseManager
+from core.frame_store import FrameStore
+from core.stream_encoder import EncodedFrameCache, AdaptiveStreamController
 from app.config import settings
+from utils.cache_backend import cache_backend
 import threading
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Bumped whenever enrolled embeddings change, so every worker reloads them
+GALLERY_VERSION_KEY = 'gallery:version'
+
+def bump_gallery_version():
+    """Announce a change of the enrolled embeddings to all workers."""
+    try:
+        cache_backend.incr(GALLERY_VERSION_KEY)
+    except Exception as e:
+        logger.error(f"Error publishing gallery version: {e}")
+
+def get_gallery_version() -> Optional[str]:
+    try:
+        return cache_backend.get(GALLERY_VERSION_KEY)
+    except Exception as e:
+        logger.error(f"Error reading gallery version: {e}")
+        return None
+
 class FaceTrackingSystem:
     """
     Core face tracking system for detection and recognition.
@@ -31,6 +51,8 @@ class FaceTrackingSystem:
         self.embedding_lock = threading.RLock()
         self.last_reload_time = 0
         self.reload_interval = 300  # 5 minutes
+        self.gallery_version = None
+        self.last_gallery_check = 0.0
         
         # Load initial embeddings
         self.reload_embeddings_and_rebuild_index()
@@ -46,6 +68,10 @@ class FaceTrackingSystem:
             List of face detection results
         """
         try:
+            if time.time() - self.last_gallery_check >= settings.GALLERY_CHECK_SECONDS:
+                self.last_gallery_check = time.time()
+                self.reload_embeddings_and_rebuild_index()
+            
             faces = self.face_app.get(frame)
             results = []
             
@@ -115,10 +141,13 @@ class FaceTrackingSystem:
     def reload_embeddings_and_rebuild_index(self):
         """
         Reload embeddings from database and rebuild the recognition index.
+        Skipped within ``reload_interval`` of the last reload unless the
+        shared gallery version changed since.
         """
         try:
             current_time = time.time()
-            if current_time - self.last_reload_time < self.reload_interval:
+            version = get_gallery_version()
+            if version == self.gallery_version and current_time - self.last_reload_time < self.reload_interval:
                 return
             
             with self.embedding_lock:
@@ -126,6 +155,7 @@ class FaceTrackingSystem:
                 self.known_embeddings = embeddings
                 self.known_labels = labels
                 self.last_reload_time = current_time
+                self.gallery_version = version
                 
                 logger.info(f"Reloaded {len(embeddings)} embeddings for {len(set(labels))} employees")
                 
@@ -138,14 +168,15 @@ class FaceTrackingPipeline:
     Main pipeline for face tracking operations.
     """
     
-    def __init__(self):
+    def __init__(self, gpu_id: int = 0):
         try:
             # Initialize InsightFace
+            self.gpu_id = gpu_id
             self.face_app = FaceAnalysis(
                 name='antelopev2',
                 providers=['CUDAExecutionProvider', 'CPUExecutionProvider']
             )
-            self.face_app.prepare(ctx_id=0, det_size=(416, 416))
+            self.face_app.prepare(ctx_id=gpu_id, det_size=(416, 416))
             
             # Initialize tracking system
             self.system = FaceTrackingSystem(self.face_app)
@@ -157,65 +188,55 @@ class FaceTrackingPipeline:
             raise
 
 
-def generate_mjpeg(camera_id: int, cap: cv2.VideoCapture) -> Generator[bytes, None, None]:
+async def generate_mjpeg(camera_id: int, frame_store: FrameStore, encoder_cache: EncodedFrameCache,
+                        controller: AdaptiveStreamController,
+                        stale_timeout: float = 10.0) -> AsyncGenerator[bytes, None]:
     """
-    Generate MJPEG stream with face detection overlay.
+    Generate an MJPEG stream from the frames captured by the background monitor.
+    
+    Frames are encoded through the shared cache using the client's current
+    profile, and the time spent handing each part to the client drives the
+    controller's quality and frame-rate adaptation.
     
     Args:
         camera_id: Camera identifier
-        cap: OpenCV VideoCapture object
+        frame_store: Store holding the latest captured frames and detections
+        encoder_cache: Shared per-(camera, profile) JPEG cache
+        controller: Adaptive controller for this client
+        stale_timeout: Seconds without a new frame before the stream ends
         
     Yields:
         MJPEG frame bytes
     """
-    pipeline = FaceTrackingPipeline()
-    frame_count = 0
+    last_seq = 0
+    last_frame_time = time.monotonic()
     
     try:
         while True:
-            ret, frame = cap.read()
-            if not ret:
-                logger.warning(f"Failed to read frame from camera {camera_id}")
-                break
-            
-            frame_count += 1
+            started = time.monotonic()
+            frame = frame_store.get_frame(camera_id)
             
-            # Process every 5th frame for face detection to reduce CPU load
-            if frame_count % 5 == 0:
-                try:
-                    faces = pipeline.system.detect_faces(frame)
-                    
-                    # Draw face detection results
-                    for face in faces:
-                        bbox = face['bbox']
-                        employee_id = face['employee_id']
-                        confidence = face['confidence']
-                        
-                        # Draw bounding box
-                        cv2.rectangle(frame, (bbox[0], bbox[1]), (bbox[2], bbox[3]), (0, 255, 0), 2)
-                        
-                        # Draw label
-                        if employee_id:
-                            label = f"{employee_id} ({confidence:.2f})"
-                            cv2.putText(frame, label, (bbox[0], bbox[1] - 10), 
-                                      cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
-                        else:
-                            cv2.putText(frame, "Unknown", (bbox[0], bbox[1] - 10), 
-                                      cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
+            if frame is not None and frame.seq != last_seq:
+                last_seq = frame.seq
+                last_frame_time = started
+                detections = frame_store.get_detections(camera_id)
                 
-                except Exception as e:
-                    logger.error(f"Error processing frame: {e}")
-            
-            # Encode frame as JPEG
-            ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-            if not ret:
-                continue
+                # Encode off the event loop; cached when another client already did it
+                jpeg = await asyncio.to_thread(encoder_cache.get_jpeg, frame, detections, controller.profile)
+                if jpeg:
+                    send_start = time.monotonic()
+                    yield (b'--frame\r\n'
+                           b'Content-Type: image/jpeg\r\n'
+                           b'Content-Length: ' + str(len(jpeg)).encode() + b'\r\n\r\n' + jpeg + b'\r\n')
+                    controller.record_send(time.monotonic() - send_start, frame.width)
+            elif started - last_frame_time > stale_timeout:
+                logger.warning(f"No frames from camera {camera_id} for {stale_timeout:.0f}s")
+                break
             
-            # Yield MJPEG frame
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.005, controller.frame_interval - elapsed))
             
     except Exception as e:
         logger.error(f"Error in MJPEG generation: {e}")
     finally:
-        logger.info(f"MJPEG stream ended for camera {camera_id}")
\ No newline at end of file
+        logger.info(f"MJPEG stream ended for camera {camera_id}")
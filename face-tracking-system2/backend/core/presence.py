@@ -0,0 +1,212 @@
+"""
+Employee Presence
+=================
+In-memory entry/exit state machine for recognized employees. Every
+recognition is fed in, but only real transitions come out: an employee seen
+while absent enters, an employee seen by an exit camera while present
+leaves, and everything in between merely refreshes the last sighting. A
+cooldown between transitions keeps someone lingering between an entry and
+an exit camera from flapping.
+
+The tracker also keeps the name and department of every active employee,
+so "who is in now" can be answered from memory without a database query.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PRESENT = 'present'
+ABSENT = 'absent'
+
+ENTRY = 'entry'
+EXIT = 'exit'
+
+
+class PresenceState:
+    """
+    Presence of one employee.
+    """
+
+    __slots__ = ('employee_id', 'state', 'last_seen', 'last_transition', 'camera_id')
+
+    def __init__(self, employee_id: str, state: str = ABSENT, last_seen: float = 0.0,
+                 last_transition: float = 0.0, camera_id: Optional[int] = None):
+        self.employee_id = employee_id
+        self.state = state
+        self.last_seen = last_seen
+        self.last_transition = last_transition
+        self.camera_id = camera_id
+
+
+class PresenceTracker:
+    """
+    Thread-safe per-employee presence with debounced transitions.
+    """
+
+    def __init__(self, cooldown: float = 60.0, presence_timeout: float = 36000.0):
+        """
+        Args:
+            cooldown: Minimum seconds between two transitions of one employee
+            presence_timeout: Seconds without a sighting after which a present
+                employee is considered gone; no exit is recorded for it, the
+                next sighting simply counts as a new entry
+        """
+        self.cooldown = cooldown
+        self.presence_timeout = presence_timeout
+        self._lock = threading.Lock()
+        self._states: Dict[str, PresenceState] = {}
+        self._directory: Dict[str, Tuple[str, str]] = {}  # employee_id -> (name, department)
+
+    def seed(self, records: Iterable):
+        """
+        Initialise state from the latest attendance record of each employee.
+
+        Args:
+            records: Objects with employee_id, event_type, camera_id and a
+                datetime ``timestamp``, e.g. ``AttendanceRecord`` rows
+        """
+        with self._lock:
+            for record in records:
+                timestamp = record.timestamp.timestamp()
+                self._states[record.employee_id] = PresenceState(
+                    employee_id=record.employee_id,
+                    state=ABSENT if record.event_type == EXIT else PRESENT,
+                    last_seen=timestamp,
+                    last_transition=timestamp,
+                    camera_id=record.camera_id)
+
+    def set_directory(self, employees: Iterable):
+        """
+        Replace the known employees.
+
+        Args:
+            employees: Objects with id, employee_name and department, e.g. ``Employee`` rows
+        """
+        directory = {e.id: (e.employee_name, e.department) for e in employees}
+        with self._lock:
+            self._directory = directory
+
+    def set_employee(self, employee_id: str, employee_name: str, department: str):
+        """Add an employee or update their name and department."""
+        with self._lock:
+            self._directory[employee_id] = (employee_name, department)
+
+    def remove_employee(self, employee_id: str):
+        """Forget an employee and their presence."""
+        with self._lock:
+            self._directory.pop(employee_id, None)
+            self._states.pop(employee_id, None)
+
+    def observe(self, employee_id: str, camera_id: int, camera_type: str,
+                timestamp: float) -> Optional[str]:
+        """
+        Feed one recognition of an employee.
+
+        Args:
+            employee_id: Recognized employee
+            camera_id: Camera that saw the employee
+            camera_type: ``camera_configs.camera_type`` of that camera
+            timestamp: Frame timestamp
+
+        Returns:
+            'entry' or 'exit' if the sighting is a transition, otherwise None
+        """
+        with self._lock:
+            presence = self._states.get(employee_id)
+            if presence is None:
+                presence = self._states[employee_id] = PresenceState(employee_id)
+            elif presence.state == PRESENT and timestamp - presence.last_seen > self.presence_timeout:
+                presence.state = ABSENT
+
+            if timestamp < presence.last_seen:
+                # Out-of-order result from a slower inference worker
+                return None
+            presence.last_seen = timestamp
+            presence.camera_id = camera_id
+
+            wanted = ABSENT if camera_type == EXIT else PRESENT
+            if presence.state == wanted:
+                return None
+            if timestamp - presence.last_transition < self.cooldown:
+                return None
+
+            presence.state = wanted
+            presence.last_transition = timestamp
+            return EXIT if wanted == ABSENT else ENTRY
+
+    def expire(self, now: float) -> List[str]:
+        """
+        Mark employees unseen for longer than the presence timeout as absent.
+
+        Returns:
+            Employees that were marked absent
+        """
+        expired = []
+        with self._lock:
+            for presence in self._states.values():
+                if presence.state == PRESENT and now - presence.last_seen > self.presence_timeout:
+                    presence.state = ABSENT
+                    expired.append(presence.employee_id)
+        return expired
+
+    def get(self, employee_id: str) -> Optional[PresenceState]:
+        with self._lock:
+            return self._states.get(employee_id)
+
+    def present_employees(self) -> List[str]:
+        with self._lock:
+            return [p.employee_id for p in self._states.values() if p.state == PRESENT]
+
+    def lookup(self, employee_id: str, now: float) -> Optional[Dict]:
+        """
+        Get the presence of one employee.
+
+        Args:
+            employee_id: Employee to look up
+            now: Current time; employees unseen past the presence timeout count as absent
+
+        Returns:
+            Presence entry, or None if the employee is neither known nor seen
+        """
+        with self._lock:
+            if employee_id not in self._directory and employee_id not in self._states:
+                return None
+            return self._entry(employee_id, now)
+
+    def snapshot(self, now: float) -> Dict:
+        """
+        Get the presence of every known employee with per-department counts.
+
+        Args:
+            now: Current time; employees unseen past the presence timeout count as absent
+
+        Returns:
+            Dict with ``employees`` (presence entries) and ``departments``
+            (department -> {'present': n, 'total': n})
+        """
+        with self._lock:
+            entries = [self._entry(employee_id, now)
+                       for employee_id in self._directory.keys() | self._states.keys()]
+        departments: Dict[str, Dict[str, int]] = {}
+        for entry in entries:
+            counts = departments.setdefault(entry['department'], {'present': 0, 'total': 0})
+            counts['total'] += 1
+            if entry['state'] == PRESENT:
+                counts['present'] += 1
+        return {'employees': entries, 'departments': departments}
+
+    def _entry(self, employee_id: str, now: float) -> Dict:
+        name, department = self._directory.get(employee_id, (None, 'Unknown'))
+        presence = self._states.get(employee_id)
+        state = ABSENT
+        if presence and presence.state == PRESENT and now - presence.last_seen <= self.presence_timeout:
+            state = PRESENT
+        return {
+            'employee_id': employee_id,
+            'employee_name': name,
+            'department': department,
+            'state': state,
+            'camera_id': presence.camera_id if presence else None,
+            'last_seen': presence.last_seen if presence and presence.last_seen else None,
+            'since': presence.last_transition if presence and presence.last_transition else None,
+        }
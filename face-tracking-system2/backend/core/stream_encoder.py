@@ -0,0 +1,248 @@
+"""
+Stream Encoding
+===============
+JPEG encoding for MJPEG viewers. Encoded frames are cached per
+(camera, profile) so any number of clients asking for the same variant
+share a single ``cv2.imencode`` call per captured frame, and each client is
+adapted to its own connection speed by stepping its profile up or down.
+"""
+
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.frame_store import CapturedFrame, DetectionSnapshot
+
+# JPEG quality for the STREAM_QUALITY presets
+QUALITY_PRESETS = {
+    'low': 50,
+    'medium': 70,
+    'high': 85,
+}
+
+# Output widths offered to clients; requests are snapped to the nearest
+# step so that adaptive clients share cached variants.
+WIDTH_STEPS = (320, 480, 640, 800, 960, 1280, 1920)
+QUALITY_STEP = 10
+MIN_QUALITY = 30
+MAX_QUALITY = 90
+MIN_FPS = 1.0
+
+
+class StreamProfile(NamedTuple):
+    """Parameters that determine the bytes of an encoded frame."""
+    width: Optional[int]  # None keeps the native resolution
+    quality: int
+    annotate: bool
+    passthrough: bool = False  # forward the camera's own JPEG when available
+
+    @classmethod
+    def create(cls, width: Optional[int] = None, quality: Optional[int] = None,
+               annotate: bool = True, default_quality: str = 'medium',
+               passthrough: bool = False) -> 'StreamProfile':
+        """
+        Build a profile from client parameters, snapping them to cacheable steps.
+
+        Args:
+            width: Requested output width in pixels
+            quality: Requested JPEG quality (1-100)
+            annotate: Whether to draw detection overlays
+            default_quality: STREAM_QUALITY preset used when quality is omitted
+            passthrough: Forward compressed camera frames untouched; implies no
+                overlay and native resolution
+        """
+        if passthrough:
+            width, annotate = None, False
+        if quality is None:
+            quality = QUALITY_PRESETS.get(default_quality, QUALITY_PRESETS['medium'])
+        quality = int(round(quality / QUALITY_STEP) * QUALITY_STEP)
+        quality = max(MIN_QUALITY, min(MAX_QUALITY, quality))
+        if width is not None:
+            width = min(WIDTH_STEPS, key=lambda step: abs(step - width))
+        return cls(width=width, quality=quality, annotate=annotate, passthrough=passthrough)
+
+    def degrade(self, native_width: int) -> Optional['StreamProfile']:
+        """Next cheaper profile, or None if already at the floor."""
+        if self.passthrough:
+            return None
+        if self.quality > MIN_QUALITY:
+            return self._replace(quality=self.quality - QUALITY_STEP)
+        current = self.width or native_width
+        smaller = [step for step in WIDTH_STEPS if step < current]
+        if smaller:
+            return self._replace(width=smaller[-1])
+        return None
+
+    def upgrade(self, ceiling: 'StreamProfile') -> Optional['StreamProfile']:
+        """Next richer profile towards what the client asked for."""
+        if self.passthrough:
+            return None
+        if self.width != ceiling.width:
+            larger = [step for step in WIDTH_STEPS
+                      if step > (self.width or 0) and (ceiling.width is None or step <= ceiling.width)]
+            return self._replace(width=larger[0] if larger else ceiling.width)
+        if self.quality < ceiling.quality:
+            return self._replace(quality=self.quality + QUALITY_STEP)
+        return None
+
+
+def draw_detections(image: np.ndarray, faces: List[Dict]) -> np.ndarray:
+    """
+    Draw detection overlays on a copy of the frame.
+
+    Args:
+        image: BGR frame
+        faces: Compact face results from a ``DetectionSnapshot``
+
+    Returns:
+        Annotated copy of the frame
+    """
+    annotated = image.copy()
+    for face in faces:
+        x1, y1, x2, y2 = face['bbox']
+        employee_id = face['employee_id']
+        color = (0, 255, 0) if employee_id else (0, 0, 255)
+        cv2.rectangle(annotated, (x1, y1), (x2, y2), color, 2)
+        label = f"{employee_id} ({face['confidence']:.2f})" if employee_id else "Unknown"
+        cv2.putText(annotated, label, (x1, y1 - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+    return annotated
+
+
+class EncodedFrameCache:
+    """
+    Cache of the latest encoded JPEG per (camera, profile).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[int, StreamProfile], threading.Lock] = {}
+        # (camera_id, profile) -> (frame seq, detection seq, jpeg bytes)
+        self._entries: Dict[Tuple[int, StreamProfile], Tuple[int, int, bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_jpeg(self, frame: CapturedFrame, detections: Optional[DetectionSnapshot],
+                 profile: StreamProfile) -> Optional[bytes]:
+        """
+        Get the encoded JPEG for a frame, encoding it at most once per profile.
+
+        Args:
+            frame: Captured frame to encode
+            detections: Latest detections, drawn when ``profile.annotate`` is set
+            profile: Output profile
+
+        Returns:
+            JPEG bytes, or None if encoding failed
+        """
+        if profile.passthrough and frame.jpeg is not None:
+            # Zero-copy path: the camera already produced the JPEG
+            return frame.jpeg
+
+        key = (frame.camera_id, profile)
+        detection_seq = detections.seq if (profile.annotate and detections) else 0
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            cached = self._entries.get(key)
+            if cached and cached[0] == frame.seq and cached[1] == detection_seq:
+                self.hits += 1
+                return cached[2]
+            self.misses += 1
+
+            image = frame.image
+            if image is None:
+                return None
+            if profile.annotate and detections and detections.faces:
+                image = draw_detections(image, detections.faces)
+            if profile.width and profile.width < image.shape[1]:
+                height = int(image.shape[0] * profile.width / image.shape[1])
+                image = cv2.resize(image, (profile.width, height), interpolation=cv2.INTER_AREA)
+
+            ret, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, profile.quality])
+            if not ret:
+                return None
+            jpeg = buffer.tobytes()
+            self._entries[key] = (frame.seq, detection_seq, jpeg)
+            return jpeg
+
+    def evict_camera(self, camera_id: int):
+        """Drop all cached variants of a camera."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == camera_id]:
+                self._entries.pop(key, None)
+                self._key_locks.pop(key, None)
+
+
+class AdaptiveStreamController:
+    """
+    Per-client quality and frame-rate controller.
+
+    The time a client takes to accept a frame is used as a measure of its send
+    queue: when writes start taking longer than the frame budget the client is
+    falling behind, so quality, resolution and finally frame rate are reduced;
+    sustained headroom steps them back up to what the client requested.
+    """
+
+    def __init__(self, profile: StreamProfile, max_fps: float, adaptive: bool = True,
+                 backlog_ratio: float = 0.8, recover_after: int = 30):
+        """
+        Args:
+            profile: Profile requested by the client (the upper bound)
+            max_fps: Frame rate requested by the client (the upper bound)
+            adaptive: Whether to adapt at all
+            backlog_ratio: Fraction of the frame budget above which a send counts as backed up
+            recover_after: Consecutive fast sends before stepping back up
+        """
+        self.requested_profile = profile
+        self.requested_fps = max_fps
+        self.profile = profile
+        self.fps = max_fps
+        self.adaptive = adaptive
+        self.backlog_ratio = backlog_ratio
+        self.recover_after = recover_after
+        self._avg_send = 0.0
+        self._fast_sends = 0
+
+    @property
+    def frame_interval(self) -> float:
+        return 1.0 / self.fps
+
+    def record_send(self, duration: float, native_width: int):
+        """
+        Feed the time it took to hand one frame to the client.
+
+        Args:
+            duration: Seconds the write took
+            native_width: Width of the camera frames
+        """
+        if not self.adaptive:
+            return
+        self._avg_send = 0.8 * self._avg_send + 0.2 * duration
+        budget = self.frame_interval * self.backlog_ratio
+
+        if self._avg_send > budget:
+            self._fast_sends = 0
+            degraded = self.profile.degrade(native_width)
+            if degraded is not None:
+                self.profile = degraded
+            else:
+                self.fps = max(MIN_FPS, self.fps / 2)
+            # Start measuring afresh at the new level
+            self._avg_send = budget / 2
+        elif self._avg_send < budget / 4:
+            self._fast_sends += 1
+            if self._fast_sends >= self.recover_after:
+                self._fast_sends = 0
+                if self.fps < self.requested_fps:
+                    self.fps = min(self.requested_fps, self.fps * 2)
+                else:
+                    upgraded = self.profile.upgrade(self.requested_profile)
+                    if upgraded is not None:
+                        self.profile = upgraded
+        else:
+            self._fast_sends = 0
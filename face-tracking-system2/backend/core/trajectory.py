@@ -0,0 +1,123 @@
+"""
+Trajectory Buffer
+=================
+Collects the positions of each face track while it is alive and hands the
+track over as a compact list of samples once it ends, so trajectories can
+be written with one bulk insert per track instead of one row per detection.
+
+A position is kept only when the face moved at least ``min_distance``
+pixels since the last kept sample, or when ``max_interval`` seconds passed
+(so a face standing still still leaves a heartbeat). Samples are never
+closer than ``min_interval`` seconds, and a track never holds more than
+``max_points`` samples plus its final position: when it fills up every
+other sample is dropped and the spacing doubles. Write volume is therefore
+bounded per track regardless of frame rate or how long the face stays in
+view.
+"""
+
+import math
+import threading
+from typing import Dict, List, Optional
+
+
+class Trajectory:
+    """
+    Downsampled positions of a single track.
+    """
+
+    __slots__ = ('track_id', 'points', 'stride', 'last_seen')
+
+    def __init__(self, track_id: int):
+        self.track_id = track_id
+        # (timestamp, x, y, confidence, bbox width, bbox height)
+        self.points: List[tuple] = []
+        self.stride = 1  # doubles every time the track is decimated
+        self.last_seen: Optional[tuple] = None
+
+
+class TrajectoryBuffer:
+    """
+    Per-camera buffer of the trajectories of live tracks.
+    """
+
+    def __init__(self, min_distance: float = 20.0, min_interval: float = 0.5,
+                 max_interval: float = 5.0, max_points: int = 120):
+        """
+        Args:
+            min_distance: Pixels the face center must move for a new sample
+            min_interval: Minimum seconds between two samples
+            max_interval: Seconds after which a sample is kept even without movement
+            max_points: Samples kept per track at most
+        """
+        self.min_distance = min_distance
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_points = max(2, max_points)
+        self.trajectories: Dict[int, Trajectory] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, faces: List[Dict], timestamp: float):
+        """
+        Sample the positions of tracked faces in a frame.
+
+        Args:
+            faces: Face detections annotated with ``track_id`` by ``FaceTracker``
+            timestamp: Frame timestamp
+        """
+        with self._lock:
+            for face in faces:
+                track_id = face.get('track_id')
+                if track_id is None:
+                    continue
+                trajectory = self.trajectories.get(track_id)
+                if trajectory is None:
+                    trajectory = self.trajectories[track_id] = Trajectory(track_id)
+                x1, y1, x2, y2 = face['bbox'][:4]
+                sample = (timestamp, (x1 + x2) / 2.0, (y1 + y2) / 2.0,
+                          float(face.get('confidence', 0.0)), float(x2 - x1), float(y2 - y1))
+                trajectory.last_seen = sample
+                if self._keep(trajectory, sample):
+                    self._append(trajectory, sample)
+
+    def finish(self, track) -> Optional[Trajectory]:
+        """
+        Take the trajectory of an ended track out of the buffer.
+
+        The last observed position is always included, so a trajectory ends
+        where the face was last seen.
+
+        Args:
+            track: Ended ``Track`` from ``FaceTracker``
+
+        Returns:
+            The trajectory, or None if the track was never sampled
+        """
+        with self._lock:
+            trajectory = self.trajectories.pop(track.track_id, None)
+        if trajectory is None:
+            return None
+        if trajectory.last_seen is not None and trajectory.points[-1] is not trajectory.last_seen:
+            trajectory.points.append(trajectory.last_seen)
+        return trajectory
+
+    def clear(self):
+        with self._lock:
+            self.trajectories.clear()
+
+    def _keep(self, trajectory: Trajectory, sample: tuple) -> bool:
+        if not trajectory.points:
+            return True
+        last = trajectory.points[-1]
+        elapsed = sample[0] - last[0]
+        if elapsed < self.min_interval * trajectory.stride:
+            return False
+        if elapsed >= self.max_interval * trajectory.stride:
+            return True
+        return math.hypot(sample[1] - last[1], sample[2] - last[2]) >= self.min_distance
+
+    def _append(self, trajectory: Trajectory, sample: tuple):
+        trajectory.points.append(sample)
+        if len(trajectory.points) > self.max_points:
+            # Halve the resolution of the whole track, keeping its first sample
+            trajectory.points = trajectory.points[::2]
+            trajectory.stride *= 2
@@ -0,0 +1,200 @@
+"""
+Async read repository for the API routers.
+
+The read-heavy endpoints query through an asyncpg-backed SQLAlchemy engine
+(aiosqlite with ``DB_BACKEND=sqlite``) and await the database on the event
+loop, instead of running blocking ``DatabaseManager`` calls in the
+threadpool, where each request holds one of a few dozen worker threads for
+the whole round trip. Writes and the camera pipeline keep using
+``DatabaseManager``.
+
+Methods mirror their ``DatabaseManager`` counterparts, including returning
+None or an empty list on database errors, and employee lookups share its
+caches, which ``DatabaseManager`` writes invalidate.
+"""
+
+import logging
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import desc, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from db.db_config import DATABASE_URL, DB_BACKEND, configure_sqlite
+from db.db_manager import DatabaseManager
+from db.db_models import AttendanceRecord, DailyAttendanceSummary, Employee, User
+from utils.cache import MISSING
+
+if DB_BACKEND == 'sqlite':
+    ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+else:
+    ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+_engine = None
+_session_factory = None
+
+
+def get_async_engine():
+    """Create the async engine on first use, so importing this module needs no driver."""
+    global _engine, _session_factory
+    if _engine is None:
+        if DB_BACKEND == 'sqlite':
+            _engine = create_async_engine(ASYNC_DATABASE_URL, pool_size=20, max_overflow=20)
+            configure_sqlite(_engine.sync_engine)
+        else:
+            _engine = create_async_engine(
+                ASYNC_DATABASE_URL,
+                pool_size=20,
+                max_overflow=20,
+                pool_pre_ping=True,
+                pool_recycle=3600,
+            )
+        _session_factory = async_sessionmaker(_engine, class_=AsyncSession, expire_on_commit=False)
+    return _engine
+
+
+async def dispose_async_engine():
+    """Close the pooled connections; called on application shutdown."""
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        _session_factory = None
+
+
+class AsyncRepository:
+    """
+    Read queries for the API, executed on the asyncio event loop.
+    """
+
+    def __init__(self):
+        get_async_engine()
+        self.logger = logging.getLogger(__name__)
+
+    def session(self) -> AsyncSession:
+        get_async_engine()
+        return _session_factory()
+
+    # ==================== USERS ====================
+
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
+        try:
+            async with self.session() as session:
+                return await session.scalar(select(User).where(User.id == user_id))
+        except Exception as e:
+            self.logger.error(f"Error fetching user {user_id}: {e}")
+            return None
+
+    async def get_all_users(self, include_inactive: bool = False) -> List[User]:
+        try:
+            async with self.session() as session:
+                statement = select(User)
+                if not include_inactive:
+                    statement = statement.where(User.status == 'active')
+                return list(await session.scalars(statement.order_by(User.created_at.desc())))
+        except Exception as e:
+            self.logger.error(f"Error fetching all users: {e}")
+            return []
+
+    # ==================== EMPLOYEES ====================
+
+    async def get_employee(self, employee_id: str) -> Optional[Employee]:
+        cache = DatabaseManager.employee_cache
+        cached = cache.get(employee_id)
+        if cached is not MISSING:
+            return cached
+        version = cache.version()
+        try:
+            async with self.session() as session:
+                employee = await session.scalar(select(Employee).where(Employee.id == employee_id))
+                cache.set(employee_id, employee, version)
+                return employee
+        except Exception as e:
+            self.logger.error(f"Error getting employee {employee_id}: {e}")
+            return None
+
+    async def get_employee_by_email(self, email: str) -> Optional[Employee]:
+        try:
+            async with self.session() as session:
+                return await session.scalar(select(Employee).where(Employee.email == email))
+        except Exception as e:
+            self.logger.error(f"Error getting employee by email {email}: {e}")
+            return None
+
+    async def get_all_employees(self) -> List[Employee]:
+        cache = DatabaseManager.employee_list_cache
+        cached = cache.get('active')
+        if cached is not MISSING:
+            return list(cached)
+        version = cache.version()
+        try:
+            async with self.session() as session:
+                employees = list(await session.scalars(select(Employee).where(Employee.is_active == True)))
+                cache.set('active', employees, version)
+                return list(employees)
+        except Exception as e:
+            self.logger.error(f"Error getting all employees: {e}")
+            return []
+
+    # ==================== ATTENDANCE ====================
+
+    async def get_attendance_page(self, employee_id: str = None, start_date: datetime = None,
+                                  end_date: datetime = None, after: Tuple[datetime, int] = None,
+                                  limit: int = 50) -> Optional[List[AttendanceRecord]]:
+        """
+        Get one page of attendance records, newest first; see
+        ``DatabaseManager.get_attendance_page``.
+
+        Returns:
+            Up to ``limit`` records, or None on database error
+        """
+        try:
+            async with self.session() as session:
+                statement = select(AttendanceRecord).where(AttendanceRecord.is_valid == True)
+                if employee_id:
+                    statement = statement.where(AttendanceRecord.employee_id == employee_id)
+                if start_date:
+                    statement = statement.where(AttendanceRecord.timestamp >= start_date)
+                if end_date:
+                    statement = statement.where(AttendanceRecord.timestamp <= end_date)
+                if after:
+                    statement = statement.where(
+                        tuple_(AttendanceRecord.timestamp, AttendanceRecord.id) < tuple_(*after))
+                statement = statement.order_by(
+                    desc(AttendanceRecord.timestamp), desc(AttendanceRecord.id)
+                ).limit(limit)
+                return list(await session.scalars(statement))
+        except Exception as e:
+            self.logger.error(f"Error getting attendance page: {e}")
+            return None
+
+    async def get_daily_summaries(self, start_date: date, end_date: date,
+                                  employee_id: str = None) -> Optional[List[DailyAttendanceSummary]]:
+        """
+        Get daily summaries in a date range; see ``DatabaseManager.get_daily_summaries``.
+
+        Returns:
+            Summaries ordered by day, or None on database error
+        """
+        try:
+            async with self.session() as session:
+                statement = select(DailyAttendanceSummary).where(
+                    DailyAttendanceSummary.work_date.between(start_date, end_date))
+                if employee_id:
+                    statement = statement.where(DailyAttendanceSummary.employee_id == employee_id)
+                statement = statement.order_by(DailyAttendanceSummary.work_date, DailyAttendanceSummary.employee_id)
+                return list(await session.scalars(statement))
+        except Exception as e:
+            self.logger.error(f"Error getting daily summaries: {e}")
+            return None
+
+
+_repository: Optional[AsyncRepository] = None
+
+
+async def get_async_repository() -> AsyncRepository:
+    """FastAPI dependency returning the shared repository."""
+    global _repository
+    if _repository is None:
+        _repository = AsyncRepository()
+    return _repository
@@ -1,11 +1,15 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 import logging
 
-# Database configuration - PostgreSQL only
+# Database backend: 'postgresql' (default) or 'sqlite' for single-box edge deployments
+DB_BACKEND = os.getenv('DB_BACKEND', 'postgresql').lower()
+SQLITE_PATH = os.getenv('SQLITE_PATH', 'data/face_tracking.db')
+
+# Database configuration
 DATABASE_CONFIG = {
     'host': os.getenv('DB_HOST', 'localhost'),
     'port': os.getenv('DB_PORT', '5432'),
@@ -14,19 +18,72 @@ DATABASE_CONFIG = {
     'password': os.getenv('DB_PASSWORD', 'password')
 }
 
-# PostgreSQL connection URL
-DATABASE_URL = f"postgresql://{DATABASE_CONFIG['username']}:{DATABASE_CONFIG['password']}@{DATABASE_CONFIG['host']}:{DATABASE_CONFIG['port']}/{DATABASE_CONFIG['database']}"
+# Per-connection SQLite settings: WAL lets the API read while the camera
+# pipeline writes, and synchronous=NORMAL only syncs at checkpoints
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'foreign_keys': 'ON',
+    'busy_timeout': '30000',  # ms to wait for the write lock
+    'cache_size': '-32000',  # 32MB page cache
+    'temp_store': 'MEMORY',
+}
+
+# pg_advisory_lock key held while migrating, so that only one API worker
+# upgrades the schema and the others wait for it to finish
+MIGRATION_LOCK_ID = 0x66747301
+
+if DB_BACKEND == 'sqlite':
+    DATABASE_URL = f"sqlite:///{SQLITE_PATH}"
+else:
+    DATABASE_URL = f"postgresql://{DATABASE_CONFIG['username']}:{DATABASE_CONFIG['password']}@{DATABASE_CONFIG['host']}:{DATABASE_CONFIG['port']}/{DATABASE_CONFIG['database']}"
+
+def configure_sqlite(sqlite_engine):
+    """
+    Apply ``SQLITE_PRAGMAS`` to every new connection of an SQLite engine.
+    Args:
+        sqlite_engine: Engine (for async engines, its ``sync_engine``)
+    """
+    @event.listens_for(sqlite_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+def create_sqlite_engine(database_url: str, **kwargs):
+    """
+    Create an engine for an SQLite database file, creating its directory.
+    Args:
+        database_url: sqlite:/// URL
+    Returns:
+        Engine with ``SQLITE_PRAGMAS`` applied
+    """
+    path = database_url.split(':///', 1)[-1]
+    if path and path != ':memory:' and os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    sqlite_engine = create_engine(
+        database_url,
+        # Connections move between the API threadpool and background threads
+        connect_args={'check_same_thread': False, 'timeout': 30},
+        **kwargs
+    )
+    configure_sqlite(sqlite_engine)
+    return sqlite_engine
 
-# Create PostgreSQL engine with connection pooling
-engine = create_engine(
-    DATABASE_URL,
-    poolclass=QueuePool,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    echo=False  # Set to True for SQL query logging
-)
+if DB_BACKEND == 'sqlite':
+    engine = create_sqlite_engine(DATABASE_URL, pool_size=10, max_overflow=20, echo=False)
+else:
+    # Create PostgreSQL engine with connection pooling
+    engine = create_engine(
+        DATABASE_URL,
+        poolclass=QueuePool,
+        pool_size=10,
+        max_overflow=20,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        echo=False  # Set to True for SQL query logging
+    )
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -68,24 +125,94 @@ def close_db_session(db):
 
 def create_tables():
     """
-    Create all database tables.
-    This function creates all tables defined in the models.
+    Create or upgrade all database tables.
+    Applies the Alembic migrations in ``migrations/`` up to the latest
+    revision; databases created before migrations existed are adopted by
+    the baseline revision. The migrations are PostgreSQL specific, so an
+    SQLite database is created from the models and stamped with the latest
+    revision instead.
+    Concurrent callers (one per uvicorn worker) are serialised with a
+    PostgreSQL advisory lock; the later ones find the schema up to date.
+    Revisions marked ``offline`` rewrite large tables and are not applied
+    to an existing database here: the upgrade stops before them and raises,
+    and they must be applied with ``alembic upgrade head`` while the API is
+    stopped. A new database gets them right away.
     """
     try:
-        # Import models to ensure they're registered with Base
-        from db.db_models import (
-            User, Employee, FaceEmbedding, AttendanceRecord, 
-            TrackingRecord, CameraConfig, SystemLog
-        )
+        from alembic import command
+        
+        config = alembic_config()
         
-        # Create all tables
-        Base.metadata.create_all(bind=engine, checkfirst=True)
-        logging.info("✅ PostgreSQL database tables created successfully")
+        if DB_BACKEND == 'sqlite':
+            create_sqlite_schema(engine)
+            command.stamp(config, 'head')
+            logging.info(f"✅ SQLite database schema is up to date ({SQLITE_PATH})")
+            return
+        
+        with engine.connect() as lock_connection:
+            lock_connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            try:
+                target = _startup_target(config, lock_connection)
+                command.upgrade(config, target.down_revision if target else 'head')
+                if target:
+                    raise RuntimeError(
+                        f"Migration {target.revision} ({target.doc}) must be applied offline: "
+                        f"stop the API and run 'alembic upgrade head'")
+            finally:
+                lock_connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+        logging.info("✅ PostgreSQL database schema is up to date")
         
     except Exception as e:
         logging.error(f"❌ Error creating database tables: {e}")
         raise e
 
+def alembic_config(connection=None):
+    """
+    Alembic configuration of the application's migrations.
+    Args:
+        connection: Connection to migrate instead of the application engine's database
+    Returns:
+        ``alembic.config.Config``
+    """
+    from alembic.config import Config
+    
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config = Config(os.path.join(backend_dir, 'alembic.ini'))
+    config.set_main_option('script_location', os.path.join(backend_dir, 'migrations'))
+    config.attributes['configure_logger'] = False
+    if connection is not None:
+        config.attributes['connection'] = connection
+    return config
+
+def _startup_target(config, connection):
+    """
+    Find the first pending migration that must not run at startup.
+    Args:
+        config: Alembic configuration
+        connection: Connection to the database being upgraded
+    Returns:
+        The pending offline revision, or None if all pending revisions may run
+    """
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+    from sqlalchemy import inspect
+
+    current = MigrationContext.configure(connection).get_current_revision()
+    if current is None and 'attendance_records' not in inspect(connection).get_table_names():
+        return None  # new database: nothing to rewrite
+    script = ScriptDirectory.from_config(config)
+    pending = reversed(list(script.iterate_revisions('heads', current)))
+    return next((revision for revision in pending if getattr(revision.module, 'offline', False)), None)
+
+def create_sqlite_schema(sqlite_engine):
+    """
+    Create the missing tables and indexes of an SQLite database from the models.
+    Args:
+        sqlite_engine: Engine of the SQLite database
+    """
+    import db.db_models  # noqa: F401  registers the models with Base.metadata
+    Base.metadata.create_all(sqlite_engine)
+
 def test_connection():
     """
     Test database connection.
@@ -106,6 +233,15 @@ def get_database_info():
     Returns:
         dict: Database connection information
     """
+    if DB_BACKEND == 'sqlite':
+        return {
+            "database_type": "SQLite",
+            "path": os.path.abspath(SQLITE_PATH),
+            "connection_url": DATABASE_URL,
+            "pragmas": SQLITE_PRAGMAS,
+            "pool_size": engine.pool.size(),
+            "checked_out_connections": engine.pool.checkedout()
+        }
     return {
         "database_type": "PostgreSQL",
         "host": DATABASE_CONFIG['host'],
@@ -1,24 +1,58 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
-from db_config import SessionLocal
-from db_models import Employee, FaceEmbedding, AttendanceRecord, TrackingRecord, SystemLog, User
+from sqlalchemy import and_, or_, desc, func, select, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from db.db_config import SessionLocal
+from db.db_models import (Employee, FaceEmbedding, AttendanceRecord, TrackingRecord, SystemLog, User, CameraConfig,
+                          DailyAttendanceSummary)
 import numpy as np
 import pickle
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
-import psycopg2
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, Dict, Optional, Tuple
 from io import BytesIO
 import threading
 import bcrypt
 import secrets
 import string
+from app.config import settings
+from utils.cache import MISSING, TTLCache
+from utils.cache_backend import cache_backend
 
 class DatabaseManager:
-    def __init__(self):
+    # Lookup caches are shared by every DatabaseManager in the process, so a
+    # write through one instance invalidates what the others have cached;
+    # other processes see the invalidation through the cache backend
+    employee_cache = TTLCache('employees', settings.CACHE_TTL_SECONDS, settings.CACHE_MAX_ENTRIES,
+                              shared=cache_backend, sync_interval=settings.CACHE_SYNC_SECONDS)
+    employee_list_cache = TTLCache('employee_list', settings.CACHE_TTL_SECONDS, 1,
+                                   shared=cache_backend, sync_interval=settings.CACHE_SYNC_SECONDS)
+    user_cache = TTLCache('users', settings.CACHE_TTL_SECONDS, settings.CACHE_MAX_ENTRIES,
+                          shared=cache_backend, sync_interval=settings.CACHE_SYNC_SECONDS)
+
+    def __init__(self, session_factory=None):
         self.session_lock = threading.RLock()
         self.logger = logging.getLogger(__name__)
-        self.Session = SessionLocal
+        # Another database's sessionmaker may be passed in, e.g. by benchmarks
+        self.Session = session_factory or SessionLocal
+
+    @staticmethod
+    def _insert(session, model):
+        """INSERT with ON CONFLICT support for the session's dialect (PostgreSQL or SQLite)."""
+        dialect = session.get_bind().dialect.name
+        return (sqlite.insert if dialect == 'sqlite' else postgresql.insert)(model)
+
+    def is_available(self) -> bool:
+        """Whether the database answers at all, to tell an outage from a rejected write."""
+        session = None
+        try:
+            session = self.Session()
+            session.execute(text("SELECT 1"))
+            return True
+        except Exception:
+            return False
+        finally:
+            if session:
+                session.close()
 
     # ==================== USER MANAGEMENT ====================
     
@@ -58,6 +92,7 @@ class DatabaseManager:
             
             session.add(master_admin)
             session.commit()
+            self.user_cache.invalidate(master_admin_email)
             
             self.logger.info(f"Master admin created successfully with email: {master_admin_email}")
             return master_admin_email, plain_password
@@ -114,6 +149,7 @@ class DatabaseManager:
             
             session.add(new_user)
             session.commit()
+            self.user_cache.invalidate(email)
             
             self.logger.info(f"User created successfully: {email} ({designation})")
             return True
@@ -128,11 +164,17 @@ class DatabaseManager:
                 session.close()
 
     def get_user_by_email(self, email: str) -> Optional[User]:
-        """Get user by email address."""
+        """Get user by email address (cached)."""
+        cached = self.user_cache.get(email)
+        if cached is not MISSING:
+            return cached
+        version = self.user_cache.version()
         session = None
         try:
             session = self.Session()
-            return session.query(User).filter(User.email == email).first()
+            user = session.query(User).filter(User.email == email).first()
+            self.user_cache.set(email, user, version)
+            return user
         except Exception as e:
             self.logger.error(f"Error fetching user {email}: {e}")
             return None
@@ -181,6 +223,7 @@ class DatabaseManager:
             user.status = new_status
             user.updated_at = func.now()
             session.commit()
+            self.user_cache.invalidate(user.email)
             return True
         except Exception as e:
             if session:
@@ -202,6 +245,7 @@ class DatabaseManager:
             
             user.last_login_time = func.now()
             session.commit()
+            self.user_cache.invalidate(user.email)
             return True
         except Exception as e:
             if session:
@@ -229,6 +273,7 @@ class DatabaseManager:
             user.status = 'inactive'
             user.updated_at = func.now()
             session.commit()
+            self.user_cache.invalidate(user.email)
             return True
         except Exception as e:
             if session:
@@ -272,6 +317,7 @@ class DatabaseManager:
             
             session.add(employee)
             session.commit()
+            self._invalidate_employee(employee_id)
             return True
         except Exception as e:
             if session:
@@ -283,11 +329,17 @@ class DatabaseManager:
                 session.close()
 
     def get_employee(self, employee_id: str) -> Optional[Employee]:
-        """Get employee by ID."""
+        """Get employee by ID (cached)."""
+        cached = self.employee_cache.get(employee_id)
+        if cached is not MISSING:
+            return cached
+        version = self.employee_cache.version()
         session = None
         try:
             session = self.Session()
-            return session.query(Employee).filter(Employee.id == employee_id).first()
+            employee = session.query(Employee).filter(Employee.id == employee_id).first()
+            self.employee_cache.set(employee_id, employee, version)
+            return employee
         except Exception as e:
             self.logger.error(f"Error getting employee {employee_id}: {e}")
             return None
@@ -309,11 +361,17 @@ class DatabaseManager:
                 session.close()
 
     def get_all_employees(self) -> List[Employee]:
-        """Get all active employees."""
+        """Get all active employees (cached)."""
+        cached = self.employee_list_cache.get('active')
+        if cached is not MISSING:
+            return list(cached)
+        version = self.employee_list_cache.version()
         session = None
         try:
             session = self.Session()
-            return session.query(Employee).filter(Employee.is_active == True).all()
+            employees = session.query(Employee).filter(Employee.is_active == True).all()
+            self.employee_list_cache.set('active', employees, version)
+            return list(employees)
         except Exception as e:
             self.logger.error(f"Error getting all employees: {e}")
             return []
@@ -344,6 +402,7 @@ class DatabaseManager:
             
             employee.updated_at = func.now()
             session.commit()
+            self._invalidate_employee(employee_id)
             return True
         except Exception as e:
             if session:
@@ -367,10 +426,12 @@ class DatabaseManager:
             session.query(FaceEmbedding).filter(FaceEmbedding.employee_id == employee_id).delete()
             session.query(AttendanceRecord).filter(AttendanceRecord.employee_id == employee_id).delete()
             session.query(TrackingRecord).filter(TrackingRecord.employee_id == employee_id).delete()
+            session.query(DailyAttendanceSummary).filter(DailyAttendanceSummary.employee_id == employee_id).delete()
             
             # Delete employee
             session.delete(employee)
             session.commit()
+            self._invalidate_employee(employee_id)
             return True
         except Exception as e:
             if session:
@@ -381,6 +442,15 @@ class DatabaseManager:
             if session:
                 session.close()
 
+    def _invalidate_employee(self, employee_id: str):
+        self.employee_cache.invalidate(employee_id)
+        self.employee_list_cache.invalidate()
+
+    @classmethod
+    def cache_stats(cls) -> List[Dict]:
+        """Hit/miss counters of the lookup caches."""
+        return [cls.employee_cache.stats(), cls.employee_list_cache.stats(), cls.user_cache.stats()]
+
     # ==================== FACE EMBEDDING MANAGEMENT ====================
 
     def store_face_embedding(self, employee_id, embedding, embedding_type, quality_score, source_image_path):
@@ -555,10 +625,7 @@ class DatabaseManager:
             session = self.Session()
             
             # Convert timestamp if provided
-            record_time = None
-            if timestamp:
-                from datetime import datetime
-                record_time = datetime.fromtimestamp(timestamp)
+            record_time = datetime.fromtimestamp(timestamp) if timestamp else datetime.now()
             
             attendance_record = AttendanceRecord(
                 employee_id=employee_id,
@@ -570,6 +637,8 @@ class DatabaseManager:
                 timestamp=record_time
             )
             session.add(attendance_record)
+            session.flush()
+            self._update_daily_summaries(session, [(employee_id, event_type, record_time)])
             session.commit()
             
             self.logger.info(f"Recorded attendance for {employee_id} with confidence {confidence_score:.3f}")
@@ -583,6 +652,80 @@ class DatabaseManager:
             if session:
                 session.close()
 
+    def record_attendance_bulk(self, records: List[Dict]) -> Optional[int]:
+        """
+        Record many attendance events with a single multi-row insert.
+        Events whose (event_key, timestamp) is already stored are skipped, so
+        replaying the same events is safe.
+        Args:
+            records: Dicts with employee_id, camera_id and optionally confidence_score,
+                     event_type, work_status, notes, timestamp (epoch seconds) and event_key
+        Returns:
+            Number of records inserted, or None if the insert failed
+        """
+        if not records:
+            return 0
+        session = None
+        try:
+            session = self.Session()
+            rows = [
+                {
+                    'employee_id': record['employee_id'],
+                    'camera_id': record['camera_id'],
+                    'event_type': record.get('event_type', 'entry'),
+                    'confidence_score': record.get('confidence_score', 0.0),
+                    'work_status': record.get('work_status', 'working'),
+                    'notes': record.get('notes'),
+                    'timestamp': datetime.fromtimestamp(record['timestamp']) if record.get('timestamp') else datetime.now(),
+                    'is_valid': True,
+                    'event_key': record.get('event_key')
+                }
+                for record in records
+            ]
+            stmt = self._insert(session, AttendanceRecord).on_conflict_do_nothing(
+                index_elements=[AttendanceRecord.event_key, AttendanceRecord.timestamp]
+            ).returning(AttendanceRecord.employee_id, AttendanceRecord.event_type, AttendanceRecord.timestamp)
+            written = session.execute(stmt, rows).all()
+            inserted = len(written)
+            # Roll the new rows into the daily summaries in the same transaction
+            self._update_daily_summaries(session, [tuple(row) for row in written])
+            session.commit()
+            self.logger.info(f"Recorded {inserted} attendance records in bulk ({len(rows) - inserted} duplicates skipped)")
+            return inserted
+        except Exception as e:
+            if session:
+                session.rollback()
+            self.logger.error(f"Error recording {len(records)} attendance records: {e}")
+            return None
+        finally:
+            if session:
+                session.close()
+
+    def record_tracking_bulk(self, records: List[Dict]) -> Optional[int]:
+        """
+        Record many trajectory samples with a single multi-row insert.
+        Args:
+            records: Dicts with the ``TrackingRecord`` columns
+        Returns:
+            Number of records inserted, or None if the insert failed
+        """
+        if not records:
+            return 0
+        session = None
+        try:
+            session = self.Session()
+            session.execute(self._insert(session, TrackingRecord), records)
+            session.commit()
+            return len(records)
+        except Exception as e:
+            if session:
+                session.rollback()
+            self.logger.error(f"Error recording {len(records)} tracking records: {e}")
+            return None
+        finally:
+            if session:
+                session.close()
+
     def get_attendance_records(self, employee_id: str = None, start_date: datetime = None, 
                              end_date: datetime = None, limit: int = 100) -> List[AttendanceRecord]:
         """Get attendance records."""
@@ -607,6 +750,93 @@ class DatabaseManager:
             if session:
                 session.close()
 
+    def get_attendance_page(self, employee_id: str = None, start_date: datetime = None,
+                            end_date: datetime = None, after: Tuple[datetime, int] = None,
+                            limit: int = 50) -> Optional[List[AttendanceRecord]]:
+        """
+        Get one page of attendance records, newest first, by keyset pagination.
+        Pages continue strictly after the (timestamp, id) of the last row of the
+        previous page, so every page is an index range scan however deep it is.
+        Args:
+            employee_id: Only records of this employee
+            start_date: Only records at or after this time
+            end_date: Only records at or before this time
+            after: (timestamp, id) of the last record of the previous page
+            limit: Page size
+        Returns:
+            Up to ``limit`` records, or None on database error
+        """
+        session = None
+        try:
+            session = self.Session()
+            query = session.query(AttendanceRecord).filter(AttendanceRecord.is_valid == True)
+            if employee_id:
+                query = query.filter(AttendanceRecord.employee_id == employee_id)
+            if start_date:
+                query = query.filter(AttendanceRecord.timestamp >= start_date)
+            if end_date:
+                query = query.filter(AttendanceRecord.timestamp <= end_date)
+            if after:
+                query = query.filter(tuple_(AttendanceRecord.timestamp, AttendanceRecord.id) < tuple_(*after))
+            return query.order_by(
+                desc(AttendanceRecord.timestamp), desc(AttendanceRecord.id)
+            ).limit(limit).all()
+        except Exception as e:
+            self.logger.error(f"Error getting attendance page: {e}")
+            return None
+        finally:
+            if session:
+                session.close()
+
+    EXPORT_COLUMNS = (
+        'id', 'employee_id', 'employee_name', 'department', 'camera_id',
+        'event_type', 'timestamp', 'confidence_score', 'work_status', 'notes'
+    )
+
+    def iter_attendance_export(self, start_date: datetime = None, end_date: datetime = None,
+                               employee_id: str = None, department: str = None,
+                               batch_size: int = 1000) -> Iterator[Tuple]:
+        """
+        Stream attendance rows for export, oldest first.
+        Rows are plain tuples in ``EXPORT_COLUMNS`` order, read from a server-side
+        cursor ``batch_size`` at a time, so memory use does not grow with the range.
+        The session stays open until the iterator is exhausted or closed.
+        Args:
+            start_date: Only records at or after this time
+            end_date: Only records at or before this time
+            employee_id: Only records of this employee
+            department: Only records of employees in this department
+            batch_size: Rows fetched per round trip
+        Yields:
+            One tuple per attendance record
+        """
+        statement = select(
+            AttendanceRecord.id, AttendanceRecord.employee_id, Employee.employee_name, Employee.department,
+            AttendanceRecord.camera_id, AttendanceRecord.event_type, AttendanceRecord.timestamp,
+            AttendanceRecord.confidence_score, AttendanceRecord.work_status, AttendanceRecord.notes
+        ).join(Employee, Employee.id == AttendanceRecord.employee_id).where(AttendanceRecord.is_valid == True)
+        if start_date:
+            statement = statement.where(AttendanceRecord.timestamp >= start_date)
+        if end_date:
+            statement = statement.where(AttendanceRecord.timestamp <= end_date)
+        if employee_id:
+            statement = statement.where(AttendanceRecord.employee_id == employee_id)
+        if department:
+            statement = statement.where(Employee.department == department)
+        statement = statement.order_by(AttendanceRecord.timestamp, AttendanceRecord.id)
+
+        session = self.Session()
+        try:
+            result = session.execute(statement.execution_options(yield_per=batch_size))
+            for partition in result.partitions():
+                for row in partition:
+                    yield tuple(row)
+        except Exception as e:
+            self.logger.error(f"Error streaming attendance export: {e}")
+            raise
+        finally:
+            session.close()
+
     def get_latest_attendance_by_employee(self, employee_id: str, hours_back: int = 10) -> Optional[AttendanceRecord]:
         """Get latest attendance record for an employee."""
         session = None
@@ -625,4 +855,277 @@ class DatabaseManager:
             return None
         finally:
             if session:
-                session.close()
\ No newline at end of file
+                session.close()
+
+    def get_latest_attendance_for_all_employees(self, hours_back: int = 10) -> Optional[List[AttendanceRecord]]:
+        """
+        Get the latest attendance record of every employee in a single query.
+        Args:
+            hours_back: Only consider records from the last N hours
+        Returns:
+            One record per employee seen in the window, or None on database error
+        """
+        session = None
+        try:
+            session = self.Session()
+            time_threshold = datetime.now() - timedelta(hours=hours_back)
+            ranked = session.query(
+                AttendanceRecord.id,
+                AttendanceRecord.timestamp,
+                func.row_number().over(
+                    partition_by=AttendanceRecord.employee_id,
+                    order_by=desc(AttendanceRecord.timestamp)
+                ).label('rank')
+            ).filter(
+                and_(
+                    AttendanceRecord.timestamp >= time_threshold,
+                    AttendanceRecord.is_valid == True
+                )
+            ).subquery()
+            # Joining on the full key, with the time bound repeated, keeps both sides pruned to recent partitions
+            return session.query(AttendanceRecord).join(
+                ranked, and_(AttendanceRecord.id == ranked.c.id, AttendanceRecord.timestamp == ranked.c.timestamp)
+            ).filter(
+                and_(ranked.c.rank == 1, AttendanceRecord.timestamp >= time_threshold)
+            ).all()
+        except Exception as e:
+            self.logger.error(f"Error getting latest attendance for all employees: {e}")
+            return None
+        finally:
+            if session:
+                session.close()
+
+    # ==================== DAILY SUMMARIES ====================
+
+    @staticmethod
+    def _apply_summary_event(summary: DailyAttendanceSummary, event_type: str, timestamp: datetime):
+        """Fold one event, no older than the summary's last event, into a daily summary."""
+        summary.event_count = (summary.event_count or 0) + 1
+        if event_type == 'exit':
+            if summary.open_since is not None:
+                stay = (timestamp - summary.open_since).total_seconds()
+                summary.presence_seconds = (summary.presence_seconds or 0.0) + stay
+                summary.open_since = None
+            summary.last_out = timestamp
+        else:
+            if summary.first_in is None:
+                summary.first_in = timestamp
+            if summary.open_since is None:
+                summary.open_since = timestamp
+        summary.last_event = timestamp
+
+    @staticmethod
+    def _close_at_midnight(summary: DailyAttendanceSummary) -> Optional[datetime]:
+        """
+        End the open stay of a finished day at the following midnight.
+        Returns:
+            The midnight the stay was closed at, or None if it was not open
+        """
+        if summary.open_since is None:
+            return None
+        midnight = datetime.combine(summary.work_date + timedelta(days=1), datetime.min.time())
+        summary.presence_seconds = (summary.presence_seconds or 0.0) + (midnight - summary.open_since).total_seconds()
+        summary.open_since = None
+        return midnight
+
+    def _recompute_daily_summary(self, session, summary: DailyAttendanceSummary):
+        """Rebuild one daily summary from the attendance rows of its day."""
+        day_start = datetime.combine(summary.work_date, datetime.min.time())
+        rows = session.query(AttendanceRecord.event_type, AttendanceRecord.timestamp).filter(
+            and_(
+                AttendanceRecord.employee_id == summary.employee_id,
+                AttendanceRecord.is_valid == True,
+                AttendanceRecord.timestamp >= day_start,
+                AttendanceRecord.timestamp < day_start + timedelta(days=1)
+            )
+        ).order_by(AttendanceRecord.timestamp).all()
+        summary.first_in = summary.last_out = summary.open_since = summary.last_event = None
+        summary.presence_seconds = 0.0
+        summary.event_count = 0
+        # A stay still open at the end of the previous day continues from midnight
+        previous = session.query(AttendanceRecord.event_type).filter(
+            and_(
+                AttendanceRecord.employee_id == summary.employee_id,
+                AttendanceRecord.is_valid == True,
+                AttendanceRecord.timestamp >= day_start - timedelta(days=1),
+                AttendanceRecord.timestamp < day_start
+            )
+        ).order_by(desc(AttendanceRecord.timestamp)).first()
+        if previous is not None and previous.event_type != 'exit':
+            summary.open_since = day_start
+        for event_type, timestamp in rows:
+            self._apply_summary_event(summary, event_type, timestamp)
+        later = session.query(DailyAttendanceSummary.work_date).filter(
+            DailyAttendanceSummary.employee_id == summary.employee_id,
+            DailyAttendanceSummary.work_date > summary.work_date
+        ).first()
+        if later is not None:
+            self._close_at_midnight(summary)
+
+    def _update_daily_summaries(self, session, events: List[Tuple[str, str, datetime]]):
+        """
+        Fold newly written attendance events into their daily summaries.
+        Runs in the caller's transaction, so summaries commit together with the rows.
+        A stay spanning midnight is split: the first events of a day close the
+        stays still open on earlier days at their midnight, and a stay open at
+        the end of the previous day continues from midnight.
+        Args:
+            session: Session the events were written in
+            events: (employee_id, event_type, timestamp) of each new row
+        """
+        by_day: Dict[Tuple[str, date], List[Tuple[datetime, str]]] = {}
+        for employee_id, event_type, timestamp in events:
+            if timestamp is None:
+                continue
+            by_day.setdefault((employee_id, timestamp.date()), []).append((timestamp, event_type))
+        if not by_day:
+            return
+        # Create missing summaries up front: the row locks below cannot cover
+        # rows that do not exist yet, so concurrent writers would both insert
+        session.execute(
+            self._insert(session, DailyAttendanceSummary).values([
+                {'employee_id': employee_id, 'work_date': work_date, 'presence_seconds': 0.0, 'event_count': 0}
+                for employee_id, work_date in by_day
+            ]).on_conflict_do_nothing(index_elements=['employee_id', 'work_date'])
+        )
+        summaries = {
+            (summary.employee_id, summary.work_date): summary
+            for summary in session.query(DailyAttendanceSummary).filter(
+                tuple_(DailyAttendanceSummary.employee_id, DailyAttendanceSummary.work_date).in_(list(by_day))
+            ).with_for_update()
+        }
+        # Earlier days of the employees starting a new day, whose stays may still be open
+        earlier: Dict[str, List[DailyAttendanceSummary]] = {}
+        new_days = [key for key, summary in summaries.items() if summary.last_event is None]
+        if new_days:
+            open_summaries = session.query(DailyAttendanceSummary).filter(
+                DailyAttendanceSummary.employee_id.in_(sorted({employee_id for employee_id, _ in new_days})),
+                DailyAttendanceSummary.open_since.isnot(None),
+                DailyAttendanceSummary.work_date < max(work_date for _, work_date in new_days)
+            ).with_for_update().all()
+            for summary in set(open_summaries) | set(summaries.values()):
+                earlier.setdefault(summary.employee_id, []).append(summary)
+        for (employee_id, work_date), day_events in sorted(by_day.items()):
+            day_events.sort()
+            summary = summaries[(employee_id, work_date)]
+            if summary.last_event is None:
+                for previous in earlier.get(employee_id, []):
+                    if previous.work_date < work_date:
+                        midnight = self._close_at_midnight(previous)
+                        if midnight is not None and previous.work_date == work_date - timedelta(days=1):
+                            summary.open_since = midnight
+            elif day_events[0][0] < summary.last_event:
+                # Late events (e.g. from a backfill) change the order; rebuild the day
+                self._recompute_daily_summary(session, summary)
+                continue
+            for timestamp, event_type in day_events:
+                self._apply_summary_event(summary, event_type, timestamp)
+
+    def rebuild_daily_summaries(self, start_date: date, end_date: date) -> Optional[int]:
+        """
+        Recompute the daily summaries of a date range from attendance_records.
+        Used to fill the summary table for history written before it existed.
+        Args:
+            start_date: First day to rebuild
+            end_date: Last day to rebuild (inclusive)
+        Returns:
+            Number of summaries written, or None on database error
+        """
+        session = None
+        try:
+            session = self.Session()
+            session.query(DailyAttendanceSummary).filter(
+                DailyAttendanceSummary.work_date.between(start_date, end_date)
+            ).delete(synchronize_session=False)
+            range_start = datetime.combine(start_date, datetime.min.time())
+            range_end = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+            rows = session.query(
+                AttendanceRecord.employee_id, AttendanceRecord.event_type, AttendanceRecord.timestamp
+            ).filter(
+                and_(
+                    AttendanceRecord.is_valid == True,
+                    AttendanceRecord.timestamp >= range_start,
+                    AttendanceRecord.timestamp < range_end
+                )
+            ).order_by(AttendanceRecord.employee_id, AttendanceRecord.timestamp).yield_per(5000)
+            
+            written = 0
+            summary = None
+            for employee_id, event_type, timestamp in rows:
+                if summary is None or summary.employee_id != employee_id or summary.work_date != timestamp.date():
+                    carried = None
+                    if summary is not None and summary.employee_id == employee_id:
+                        # The previous day of this employee is finished; split a stay over midnight
+                        midnight = self._close_at_midnight(summary)
+                        if summary.work_date == timestamp.date() - timedelta(days=1):
+                            carried = midnight
+                    summary = DailyAttendanceSummary(
+                        employee_id=employee_id, work_date=timestamp.date(), presence_seconds=0.0, event_count=0,
+                        open_since=carried)
+                    session.add(summary)
+                    written += 1
+                    if written % 1000 == 0:
+                        session.flush()
+                self._apply_summary_event(summary, event_type, timestamp)
+            session.commit()
+            self.logger.info(f"Rebuilt {written} daily attendance summaries from {start_date} to {end_date}")
+            return written
+        except Exception as e:
+            if session:
+                session.rollback()
+            self.logger.error(f"Error rebuilding daily summaries: {e}")
+            return None
+        finally:
+            if session:
+                session.close()
+
+    def get_daily_summaries(self, start_date: date, end_date: date,
+                            employee_id: str = None) -> Optional[List[DailyAttendanceSummary]]:
+        """
+        Get daily summaries in a date range.
+        Args:
+            start_date: First day
+            end_date: Last day (inclusive)
+            employee_id: Only summaries of this employee
+        Returns:
+            Summaries ordered by day, or None on database error
+        """
+        session = None
+        try:
+            session = self.Session()
+            query = session.query(DailyAttendanceSummary).filter(
+                DailyAttendanceSummary.work_date.between(start_date, end_date)
+            )
+            if employee_id:
+                query = query.filter(DailyAttendanceSummary.employee_id == employee_id)
+            return query.order_by(DailyAttendanceSummary.work_date, DailyAttendanceSummary.employee_id).all()
+        except Exception as e:
+            self.logger.error(f"Error getting daily summaries: {e}")
+            return None
+        finally:
+            if session:
+                session.close()
+
+    # ==================== CAMERA CONFIGURATION ====================
+
+    def get_camera_configs(self, active_only: bool = True) -> Optional[List[CameraConfig]]:
+        """
+        Get camera configurations.
+        Args:
+            active_only: Only return cameras marked active
+        Returns:
+            List of camera configs, or None if the database could not be queried
+        """
+        session = None
+        try:
+            session = self.Session()
+            query = session.query(CameraConfig)
+            if active_only:
+                query = query.filter(CameraConfig.is_active == True)
+            return query.order_by(CameraConfig.camera_id).all()
+        except Exception as e:
+            self.logger.error(f"Error getting camera configs: {e}")
+            return None
+        finally:
+            if session:
+                session.close()
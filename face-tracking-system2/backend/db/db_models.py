@@ -1,9 +1,23 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Text, ForeignKey, LargeBinary, JSON
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, Boolean, Text, ForeignKey, LargeBinary, JSON, Index
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship
+from sqlalchemy.schema import PrimaryKeyConstraint
 from sqlalchemy.sql import func
 from db.db_config import Base
 import datetime
 
+@compiles(PrimaryKeyConstraint, 'sqlite')
+def _sqlite_primary_key(constraint, compiler, **kw):
+    """
+    SQLite only generates ids for a single INTEGER PRIMARY KEY column, so the
+    (id, timestamp) keys that PostgreSQL partitioning needs are declared as
+    PRIMARY KEY (id) there; id is unique on its own either way.
+    """
+    generated = [column for column in constraint.columns if column.autoincrement is True]
+    if len(constraint.columns) > 1 and len(generated) == 1:
+        return f"PRIMARY KEY ({compiler.preparer.format_column(generated[0])})"
+    return compiler.visit_primary_key_constraint(constraint, **kw)
+
 class Employee(Base):
     __tablename__ = 'employees'
     
@@ -49,36 +63,76 @@ class FaceEmbedding(Base):
     created_at = Column(DateTime, default=func.now())
     is_active = Column(Boolean, default=True)
     
+    __table_args__ = (
+        Index('ix_face_embeddings_active_type_employee', is_active, embedding_type, employee_id),
+        Index('ix_face_embeddings_employee_id', employee_id),
+    )
+    
     employee = relationship("Employee", back_populates="embeddings")
 
 class AttendanceRecord(Base):
     __tablename__ = 'attendance_records'
     
-    id = Column(Integer, primary_key=True, index=True)
+    # Partitioned by month on timestamp (migration 0006), which therefore is part of the key
+    id = Column(Integer, primary_key=True, autoincrement=True)
     employee_id = Column(String, ForeignKey('employees.id'), nullable=False)
     camera_id = Column(Integer, nullable=False)
     event_type = Column(String, nullable=False)
-    timestamp = Column(DateTime, default=func.now())
+    timestamp = Column(DateTime, primary_key=True, default=func.now())
     confidence_score = Column(Float)
     work_status = Column(String, default='working')
     is_valid = Column(Boolean, default=True)
     notes = Column(Text)
+    event_key = Column(String)  # idempotency key for replayed events
+    
+    # Partial indexes over valid rows in page order (see migration 0004)
+    __table_args__ = (
+        Index('ix_attendance_records_event_key', event_key, timestamp, unique=True),
+        Index('ix_attendance_records_employee_timestamp_id', employee_id, timestamp.desc(), id.desc(),
+              postgresql_where=(is_valid == True), sqlite_where=(is_valid == True)),
+        Index('ix_attendance_records_timestamp_id', timestamp.desc(), id.desc(),
+              postgresql_where=(is_valid == True), sqlite_where=(is_valid == True)),
+    )
     
     employee = relationship("Employee", back_populates="attendance_records")
 
+class DailyAttendanceSummary(Base):
+    """Per-employee, per-day rollup of attendance_records, kept up to date as events are written."""
+    __tablename__ = 'daily_attendance_summary'
+    
+    employee_id = Column(String, ForeignKey('employees.id'), primary_key=True)
+    work_date = Column(Date, primary_key=True)
+    first_in = Column(DateTime)
+    last_out = Column(DateTime)
+    presence_seconds = Column(Float, default=0.0)
+    open_since = Column(DateTime)  # start of the current stay while the employee is inside
+    last_event = Column(DateTime)
+    event_count = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    # Month views across all employees
+    __table_args__ = (
+        Index('ix_daily_attendance_summary_work_date', work_date, employee_id),
+    )
+
 class TrackingRecord(Base):
     __tablename__ = 'tracking_records'
     
-    id = Column(Integer, primary_key=True, index=True)
+    # Partitioned by month on timestamp (migration 0006), which therefore is part of the key
+    id = Column(Integer, primary_key=True, autoincrement=True)
     employee_id = Column(String, ForeignKey('employees.id'), nullable=False)
     camera_id = Column(Integer, nullable=False)
     position_x = Column(Float)
     position_y = Column(Float)
     confidence_score = Column(Float)
     quality_metrics = Column(JSON)
-    timestamp = Column(DateTime, default=func.now())
+    timestamp = Column(DateTime, primary_key=True, default=func.now())
     tracking_state = Column(String, default='active')
     
+    __table_args__ = (
+        Index('ix_tracking_records_employee_timestamp', employee_id, timestamp.desc()),
+    )
+    
     employee = relationship("Employee", back_populates="tracking_records")
 
 class CameraConfig(Base):
@@ -0,0 +1,218 @@
+"""
+Monthly range partitions of the attendance and tracking tables.
+
+``attendance_records`` and ``tracking_records`` are partitioned by month on
+``timestamp`` (migration 0006), named ``<table>_yYYYYmMM``. This module
+creates partitions ahead of the data and applies retention by dropping whole
+partitions, which is instant and leaves no dead rows behind, unlike DELETE.
+
+SQLite databases (``DB_BACKEND=sqlite``) are not partitioned; there,
+partition creation is a no-op and retention deletes the expired rows.
+
+Usage:
+    python -m db.partitions          # create upcoming partitions, apply retention
+    python -m db.partitions --list
+"""
+
+import re
+import sys
+import logging
+from datetime import date, datetime
+from typing import Dict, List
+
+from sqlalchemy import text
+
+from db.db_config import engine
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ('attendance_records', 'tracking_records')
+PARTITION_NAME = re.compile(r'^(?P<table>\w+)_y(?P<year>\d{4})m(?P<month>\d{2})$')
+# Dropping a partition locks its parent; give up rather than stall writers
+LOCK_TIMEOUT = '5s'
+
+
+def month_start(value) -> date:
+    """First day of the month of a date or datetime."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Shift the first day of a month by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def is_partitioned(bind) -> bool:
+    """Whether the database behind an engine or connection uses partitions."""
+    return bind.dialect.name == 'postgresql'
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def list_partitions(connection, table: str) -> Dict[date, str]:
+    """
+    Get the monthly partitions of a table.
+
+    Args:
+        connection: Open connection
+        table: Partitioned table
+
+    Returns:
+        Mapping of month to partition name
+    """
+    rows = connection.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:table AS regclass)"
+    ), {"table": table}).scalars()
+    partitions = {}
+    for name in rows:
+        match = PARTITION_NAME.match(name)
+        if match and match.group('table') == table:
+            partitions[date(int(match.group('year')), int(match.group('month')), 1)] = name
+    return partitions
+
+
+def ensure_partitions(table: str, start, end, bind=engine) -> List[str]:
+    """
+    Create the monthly partitions covering a time range.
+
+    Args:
+        table: Partitioned table
+        start: First date or datetime that must be insertable
+        end: Last date or datetime that must be insertable
+        bind: Engine to use
+
+    Returns:
+        Names of the partitions created
+    """
+    created = []
+    if not is_partitioned(bind):
+        return created
+    with bind.begin() as connection:
+        existing = list_partitions(connection, table)
+        month = month_start(start)
+        while month <= month_start(end):
+            if month not in existing:
+                name = partition_name(table, month)
+                connection.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                ))
+                created.append(name)
+            month = add_months(month, 1)
+    if created:
+        logger.info(f"Created partitions: {', '.join(created)}")
+    return created
+
+
+def drop_partitions_before(table: str, cutoff, bind=engine) -> List[str]:
+    """
+    Drop the partitions whose whole month lies before a cutoff.
+
+    Args:
+        table: Partitioned table
+        cutoff: Date or datetime; rows at or after it are kept
+        bind: Engine to use
+
+    Returns:
+        Names of the partitions dropped
+    """
+    dropped = []
+    with bind.begin() as connection:
+        connection.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+        for month, name in sorted(list_partitions(connection, table).items()):
+            if datetime.combine(add_months(month, 1), datetime.min.time()) <= _as_datetime(cutoff):
+                connection.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped.append(name)
+    if dropped:
+        logger.info(f"Dropped partitions: {', '.join(dropped)}")
+    return dropped
+
+
+def maintain_partitions(months_ahead: int, retention_months: Dict[str, int], bind=engine) -> Dict[str, Dict]:
+    """
+    Create upcoming partitions and drop the ones past retention.
+
+    Args:
+        months_ahead: Months after the current one to create
+        retention_months: Months of data to keep per table; 0 keeps everything
+        bind: Engine to use
+
+    Returns:
+        Created and dropped partition names per table (on SQLite, the
+        number of rows deleted instead)
+    """
+    this_month = month_start(date.today())
+    results = {}
+    if not is_partitioned(bind):
+        for table in PARTITIONED_TABLES:
+            keep = retention_months.get(table, 0)
+            deleted = delete_rows_before(table, add_months(this_month, -keep), bind=bind) if keep > 0 else 0
+            results[table] = {"deleted": deleted}
+        return results
+    for table in PARTITIONED_TABLES:
+        created = ensure_partitions(table, this_month, add_months(this_month, months_ahead), bind=bind)
+        keep = retention_months.get(table, 0)
+        dropped = drop_partitions_before(table, add_months(this_month, -keep), bind=bind) if keep > 0 else []
+        results[table] = {"created": created, "dropped": dropped}
+    return results
+
+
+def delete_rows_before(table: str, cutoff, bind=engine) -> int:
+    """
+    Delete the rows older than a cutoff from an unpartitioned (SQLite) table.
+
+    Args:
+        table: Table with a ``timestamp`` column
+        cutoff: Date or datetime; rows at or after it are kept
+        bind: Engine to use
+
+    Returns:
+        Number of rows deleted
+    """
+    with bind.begin() as connection:
+        # Compared as text, in the format SQLAlchemy stores SQLite datetimes in
+        deleted = connection.execute(
+            text(f"DELETE FROM {table} WHERE timestamp < :cutoff"),
+            {"cutoff": _as_datetime(cutoff).isoformat(sep=' ')}
+        ).rowcount
+    if deleted:
+        logger.info(f"Deleted {deleted} rows from {table} before {cutoff}")
+    return deleted
+
+
+def _as_datetime(value) -> datetime:
+    return value if isinstance(value, datetime) else datetime.combine(value, datetime.min.time())
+
+
+def main():
+    """Command line entry point."""
+    if '--list' in sys.argv:
+        if not is_partitioned(engine):
+            print(f"{engine.dialect.name} database: tables are not partitioned")
+            return
+        with engine.connect() as connection:
+            for table in PARTITIONED_TABLES:
+                months = sorted(list_partitions(connection, table))
+                print(f"{table}: {', '.join(m.strftime('%Y-%m') for m in months) or 'no partitions'}")
+        return
+
+    from app.config import settings
+    results = maintain_partitions(
+        settings.PARTITION_MONTHS_AHEAD,
+        {
+            'attendance_records': settings.ATTENDANCE_RETENTION_MONTHS,
+            'tracking_records': settings.TRACKING_RETENTION_MONTHS,
+        })
+    for table, result in results.items():
+        if 'deleted' in result:
+            print(f"✅ {table}: {result['deleted']} expired rows deleted")
+        else:
+            print(f"✅ {table}: {len(result['created'])} created, {len(result['dropped'])} dropped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Query plan checks for the hot attendance and embedding queries.
+
+Runs EXPLAIN for the queries issued by ``DatabaseManager`` and verifies that
+the planner picks the intended index for each one. That needs tables with
+realistic data; on small development tables, where the planner rightly
+prefers sequential scans, ``--force-index`` disables them for the session
+and only checks that each query *can* use its index.
+``tests/test_query_plans.py`` runs the check against seeded data.
+
+On the monthly partitioned tables an index is used through its per-partition
+children, and time-bounded queries must be pruned to the partitions their
+range covers.
+
+Usage:
+    python -m db.query_plans [-v] [--force-index]
+"""
+
+import re
+import sys
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from sqlalchemy import and_, desc, select, text, tuple_
+
+from db.db_config import engine
+from db.db_models import AttendanceRecord, DailyAttendanceSummary, FaceEmbedding
+
+
+class PlanCheck(NamedTuple):
+    name: str
+    statement: object
+    expected_index: str
+    max_partitions: int = 0  # partitions a time-bounded query may touch; 0 skips the check
+
+
+def hot_queries() -> List[PlanCheck]:
+    """The statements ``DatabaseManager`` issues on hot paths, with the index each should use."""
+    now = datetime.now()
+    week_ago = now - timedelta(days=7)
+    month_start = date.today().replace(day=1)
+    month_end = month_start + timedelta(days=30)
+    return [
+        PlanCheck(
+            'get_attendance_records (employee, range)',
+            select(AttendanceRecord).where(and_(
+                AttendanceRecord.is_valid == True,
+                AttendanceRecord.employee_id == 'EMP001',
+                AttendanceRecord.timestamp >= week_ago,
+                AttendanceRecord.timestamp <= now
+            )).order_by(desc(AttendanceRecord.timestamp)).limit(100),
+            'ix_attendance_records_employee_timestamp_id', max_partitions=2),
+        PlanCheck(
+            'get_attendance_records (range)',
+            select(AttendanceRecord).where(and_(
+                AttendanceRecord.is_valid == True,
+                AttendanceRecord.timestamp >= week_ago,
+                AttendanceRecord.timestamp <= now
+            )).order_by(desc(AttendanceRecord.timestamp)).limit(100),
+            'ix_attendance_records_timestamp_id', max_partitions=2),
+        PlanCheck(
+            'get_attendance_page (cursor)',
+            select(AttendanceRecord).where(and_(
+                AttendanceRecord.is_valid == True,
+                tuple_(AttendanceRecord.timestamp, AttendanceRecord.id) < tuple_(week_ago, 1000)
+            )).order_by(desc(AttendanceRecord.timestamp), desc(AttendanceRecord.id)).limit(51),
+            'ix_attendance_records_timestamp_id'),
+        PlanCheck(
+            'get_attendance_page (employee, cursor)',
+            select(AttendanceRecord).where(and_(
+                AttendanceRecord.is_valid == True,
+                AttendanceRecord.employee_id == 'EMP001',
+                tuple_(AttendanceRecord.timestamp, AttendanceRecord.id) < tuple_(week_ago, 1000)
+            )).order_by(desc(AttendanceRecord.timestamp), desc(AttendanceRecord.id)).limit(51),
+            'ix_attendance_records_employee_timestamp_id'),
+        PlanCheck(
+            'get_latest_attendance_by_employee',
+            select(AttendanceRecord).where(and_(
+                AttendanceRecord.employee_id == 'EMP001',
+                AttendanceRecord.timestamp >= now - timedelta(hours=10),
+                AttendanceRecord.is_valid == True
+            )).order_by(desc(AttendanceRecord.timestamp)).limit(1),
+            'ix_attendance_records_employee_timestamp_id', max_partitions=2),
+        PlanCheck(
+            'get_daily_summaries (month)',
+            select(DailyAttendanceSummary).where(
+                DailyAttendanceSummary.work_date.between(month_start, month_end)
+            ).order_by(DailyAttendanceSummary.work_date, DailyAttendanceSummary.employee_id),
+            'ix_daily_attendance_summary_work_date'),
+        PlanCheck(
+            'get_daily_summaries (employee, month)',
+            select(DailyAttendanceSummary).where(and_(
+                DailyAttendanceSummary.work_date.between(month_start, month_end),
+                DailyAttendanceSummary.employee_id == 'EMP001'
+            )).order_by(DailyAttendanceSummary.work_date),
+            'daily_attendance_summary_pkey'),
+        PlanCheck(
+            'get_all_active_embeddings (enroll)',
+            select(FaceEmbedding).where(and_(
+                FaceEmbedding.is_active == True,
+                FaceEmbedding.embedding_type == 'enroll'
+            )),
+            'ix_face_embeddings_active_type_employee'),
+        PlanCheck(
+            'get_face_embeddings (employee)',
+            select(FaceEmbedding).where(and_(
+                FaceEmbedding.is_active == True,
+                FaceEmbedding.employee_id == 'EMP001',
+                FaceEmbedding.embedding_type == 'enroll'
+            )),
+            'ix_face_embeddings_active_type_employee'),
+    ]
+
+
+def explain(connection, statement) -> str:
+    """
+    Get the plan of a statement as text.
+
+    Args:
+        connection: Open connection
+        statement: SQLAlchemy statement
+
+    Returns:
+        EXPLAIN output
+    """
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    rows = connection.execute(text(f"EXPLAIN {compiled}")).fetchall()
+    return "\n".join(row[0] for row in rows)
+
+
+def index_names(connection, index: str) -> Set[str]:
+    """An index together with the per-partition indexes attached to it."""
+    children = connection.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:index)"
+    ), {"index": index}).scalars()
+    return {index, *children}
+
+
+def scanned_partitions(plan: str) -> Set[str]:
+    """Monthly partitions that appear in a plan."""
+    return set(re.findall(r'\b(\w+_y\d{4}m\d{2})\b', plan))
+
+
+def plan_problem(connection, check: PlanCheck, plan: str) -> Optional[str]:
+    """
+    Compare a plan with what a check expects.
+
+    Returns:
+        What is wrong with the plan, or None if it uses the index and is pruned
+    """
+    if not any(name in plan for name in index_names(connection, check.expected_index)):
+        return f"does not use {check.expected_index}"
+    partitions = scanned_partitions(plan)
+    if check.max_partitions and len(partitions) > check.max_partitions:
+        return f"scans {len(partitions)} partitions, expected at most {check.max_partitions}"
+    return None
+
+
+def check_query_plans(verbose: bool = False, force_index: bool = False, bind=engine) -> Dict[str, bool]:
+    """
+    Check that every hot query is planned on its index, and pruned to the
+    partitions of its time range where that applies.
+
+    Args:
+        verbose: Print each plan
+        force_index: Disable sequential scans, for tables too small to plan realistically
+        bind: Engine of the database to check
+
+    Returns:
+        Mapping of query name to whether it used the expected index
+    """
+    results = {}
+    with bind.connect() as connection:
+        with connection.begin():
+            if force_index:
+                connection.execute(text("SET LOCAL enable_seqscan = off"))
+            for check in hot_queries():
+                plan = explain(connection, check.statement)
+                results[check.name] = plan_problem(connection, check, plan) is None
+                if verbose:
+                    print(f"-- {check.name}\n{plan}\n")
+    return results
+
+
+def main():
+    """Command line entry point."""
+    if engine.dialect.name != 'postgresql':
+        print(f"Query plan checks are PostgreSQL specific; skipped for {engine.dialect.name}")
+        return
+    results = check_query_plans(verbose='-v' in sys.argv, force_index='--force-index' in sys.argv)
+    for name, ok in results.items():
+        print(f"{'✅' if ok else '❌'} {name}")
+    if not all(results.values()):
+        print("❌ Some queries do not use their index or are not pruned; run `alembic upgrade head`")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Copy all data between a PostgreSQL and an SQLite database.
+
+This is the migration path between the central PostgreSQL deployment and
+the embedded SQLite mode (``DB_BACKEND=sqlite``), in either direction.
+Tables are copied in foreign key order, in batches. The target must be
+empty:
+
+- An SQLite target gets its schema from the models.
+- A PostgreSQL target must be migrated first (``alembic upgrade head``).
+  It gets the monthly partitions the copied rows need, and its id
+  sequences are moved past the copied ids.
+
+Usage:
+    python -m db.transfer --source postgresql://user:pw@host:5432/face_tracking \\
+                          --target sqlite:///data/face_tracking.db
+    python -m db.transfer --source sqlite:///data/face_tracking.db --target postgresql://...
+"""
+
+import sys
+import logging
+import argparse
+from typing import Dict
+
+from sqlalchemy import create_engine, func, select, text
+
+from db.db_config import Base, create_sqlite_engine, create_sqlite_schema
+from db.partitions import PARTITIONED_TABLES, ensure_partitions
+import db.db_models  # noqa: F401  registers the models with Base.metadata
+
+logger = logging.getLogger(__name__)
+
+
+def make_engine(url: str):
+    """Create an engine for a database URL, with the SQLite pragmas where applicable."""
+    if url.startswith('sqlite'):
+        return create_sqlite_engine(url)
+    return create_engine(url, pool_pre_ping=True)
+
+
+def transfer(source, target, batch_size: int = 5000) -> Dict[str, int]:
+    """
+    Copy every table of the application from one database to another.
+
+    Args:
+        source: Engine of the database to copy from
+        target: Engine of the empty database to copy into
+        batch_size: Rows read and inserted at a time
+
+    Returns:
+        Number of rows copied per table
+    """
+    tables = Base.metadata.sorted_tables
+    if target.dialect.name == 'sqlite':
+        create_sqlite_schema(target)
+
+    with source.connect() as connection:
+        with target.connect() as target_connection:
+            for table in tables:
+                if target_connection.execute(select(func.count()).select_from(table)).scalar():
+                    raise RuntimeError(f"Target table {table.name} is not empty")
+        if target.dialect.name == 'postgresql':
+            # Old rows need their months' partitions to exist
+            for name in PARTITIONED_TABLES:
+                table = Base.metadata.tables[name]
+                oldest, newest = connection.execute(
+                    select(func.min(table.c.timestamp), func.max(table.c.timestamp))).one()
+                if oldest is not None:
+                    ensure_partitions(name, oldest, newest, bind=target)
+
+        counts = {}
+        with target.begin() as target_connection:
+            for table in tables:
+                result = connection.execution_options(yield_per=batch_size).execute(
+                    select(table).order_by(*table.primary_key.columns))
+                copied = 0
+                for rows in result.partitions():
+                    target_connection.execute(table.insert(), [dict(row._mapping) for row in rows])
+                    copied += len(rows)
+                counts[table.name] = copied
+                logger.info(f"Copied {copied} rows of {table.name}")
+            if target.dialect.name == 'postgresql':
+                _advance_sequences(target_connection, tables)
+    return counts
+
+
+def _advance_sequences(connection, tables):
+    # Rows were copied with their ids; new rows must not reuse them
+    for table in tables:
+        if 'id' not in table.c or table.c.id.type.python_type is not int:
+            continue
+        sequence = connection.execute(
+            text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table.name}).scalar()
+        if sequence:
+            connection.execute(text(
+                f"SELECT setval(:sequence, COALESCE((SELECT MAX(id) FROM {table.name}), 0) + 1, false)"
+            ), {"sequence": sequence})
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Copy all data between PostgreSQL and SQLite databases")
+    parser.add_argument("--source", required=True, help="Database URL to copy from")
+    parser.add_argument("--target", required=True, help="Database URL of the empty database to copy into")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    try:
+        counts = transfer(make_engine(args.source), make_engine(args.target), max(1, args.batch_size))
+    except Exception as e:
+        print(f"❌ Transfer failed: {e}")
+        sys.exit(1)
+    for table, copied in counts.items():
+        print(f"✅ {table}: {copied} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Alembic environment.
+Migrations run against the engine configured in ``db.db_config`` and
+autogenerate compares against the models in ``db.db_models``.
+"""
+import os
+import sys
+from logging.config import fileConfig
+
+from alembic import context
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.db_config import Base, DATABASE_URL, engine
+import db.db_models  # noqa: F401  registers the models with Base.metadata
+
+config = context.config
+# The application runs migrations at startup with its own logging set up
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting to the database."""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run the migrations over a connection from the application engine, or one passed in."""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # e.g. tests migrating a scratch database (db.db_config.alembic_config)
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
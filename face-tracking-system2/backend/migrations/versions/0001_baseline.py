@@ -0,0 +1,139 @@
+"""baseline schema
+
+The schema as created by ``Base.metadata.create_all`` before migrations were
+introduced. Tables that already exist are left untouched, so databases set
+up by earlier releases are adopted as they are.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'employees' not in existing:
+        op.create_table(
+            'employees',
+            sa.Column('id', sa.String(), primary_key=True),
+            sa.Column('employee_name', sa.String(), nullable=False),
+            sa.Column('email', sa.String(), nullable=False),
+            sa.Column('designation', sa.String(), nullable=False),
+            sa.Column('department', sa.String(), nullable=False),
+            sa.Column('phone_number', sa.String()),
+            sa.Column('is_active', sa.Boolean()),
+            sa.Column('created_at', sa.DateTime()),
+            sa.Column('updated_at', sa.DateTime()),
+        )
+        op.create_index('ix_employees_id', 'employees', ['id'])
+        op.create_index('ix_employees_email', 'employees', ['email'], unique=True)
+
+    if 'users' not in existing:
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('email', sa.String(), nullable=False),
+            sa.Column('hashed_password', sa.String(), nullable=False),
+            sa.Column('designation', sa.String(), nullable=False),
+            sa.Column('department', sa.String(), nullable=False),
+            sa.Column('phone_number', sa.String()),
+            sa.Column('is_master_admin', sa.Boolean()),
+            sa.Column('status', sa.String()),
+            sa.Column('last_login_time', sa.DateTime()),
+            sa.Column('created_at', sa.DateTime()),
+            sa.Column('updated_at', sa.DateTime()),
+        )
+        op.create_index('ix_users_id', 'users', ['id'])
+        op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    if 'face_embeddings' not in existing:
+        op.create_table(
+            'face_embeddings',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('employee_id', sa.String(), sa.ForeignKey('employees.id'), nullable=False),
+            sa.Column('embedding_data', sa.LargeBinary(), nullable=False),
+            sa.Column('embedding_type', sa.String()),
+            sa.Column('quality_score', sa.Float()),
+            sa.Column('source_image_path', sa.String()),
+            sa.Column('created_at', sa.DateTime()),
+            sa.Column('is_active', sa.Boolean()),
+        )
+        op.create_index('ix_face_embeddings_id', 'face_embeddings', ['id'])
+
+    if 'attendance_records' not in existing:
+        op.create_table(
+            'attendance_records',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('employee_id', sa.String(), sa.ForeignKey('employees.id'), nullable=False),
+            sa.Column('camera_id', sa.Integer(), nullable=False),
+            sa.Column('event_type', sa.String(), nullable=False),
+            sa.Column('timestamp', sa.DateTime()),
+            sa.Column('confidence_score', sa.Float()),
+            sa.Column('work_status', sa.String()),
+            sa.Column('is_valid', sa.Boolean()),
+            sa.Column('notes', sa.Text()),
+        )
+        op.create_index('ix_attendance_records_id', 'attendance_records', ['id'])
+
+    if 'tracking_records' not in existing:
+        op.create_table(
+            'tracking_records',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('employee_id', sa.String(), sa.ForeignKey('employees.id'), nullable=False),
+            sa.Column('camera_id', sa.Integer(), nullable=False),
+            sa.Column('position_x', sa.Float()),
+            sa.Column('position_y', sa.Float()),
+            sa.Column('confidence_score', sa.Float()),
+            sa.Column('quality_metrics', sa.JSON()),
+            sa.Column('timestamp', sa.DateTime()),
+            sa.Column('tracking_state', sa.String()),
+        )
+        op.create_index('ix_tracking_records_id', 'tracking_records', ['id'])
+
+    if 'camera_configs' not in existing:
+        op.create_table(
+            'camera_configs',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('camera_id', sa.Integer(), nullable=False, unique=True),
+            sa.Column('camera_name', sa.String(), nullable=False),
+            sa.Column('camera_type', sa.String()),
+            sa.Column('resolution_width', sa.Integer()),
+            sa.Column('resolution_height', sa.Integer()),
+            sa.Column('fps', sa.Integer()),
+            sa.Column('gpu_id', sa.Integer()),
+            sa.Column('tripwire_config', sa.JSON()),
+            sa.Column('is_active', sa.Boolean()),
+            sa.Column('created_at', sa.DateTime()),
+            sa.Column('updated_at', sa.DateTime()),
+        )
+        op.create_index('ix_camera_configs_id', 'camera_configs', ['id'])
+
+    if 'system_logs' not in existing:
+        op.create_table(
+            'system_logs',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('log_level', sa.String()),
+            sa.Column('message', sa.Text(), nullable=False),
+            sa.Column('component', sa.String()),
+            sa.Column('employee_id', sa.String()),
+            sa.Column('camera_id', sa.Integer()),
+            sa.Column('timestamp', sa.DateTime()),
+            sa.Column('additional_data', sa.JSON()),
+        )
+        op.create_index('ix_system_logs_id', 'system_logs', ['id'])
+
+
+def downgrade() -> None:
+    for table in ('system_logs', 'camera_configs', 'tracking_records', 'attendance_records',
+                  'face_embeddings', 'users', 'employees'):
+        op.drop_table(table)
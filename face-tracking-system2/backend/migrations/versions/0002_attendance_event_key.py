@@ -0,0 +1,29 @@
+"""attendance event idempotency key
+
+Replayed attendance events are deduplicated on ``event_key``. Written to be
+a no-op on databases where ``create_tables`` already added the column.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE attendance_records ADD COLUMN IF NOT EXISTS event_key VARCHAR")
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_attendance_records_event_key "
+        "ON attendance_records (event_key)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_attendance_records_event_key")
+    op.execute("ALTER TABLE attendance_records DROP COLUMN IF EXISTS event_key")
@@ -0,0 +1,46 @@
+"""indexes for attendance and embedding queries
+
+Attendance queries always filter on ``is_valid`` and sort by ``timestamp``
+descending, optionally for one employee, so both indexes are partial on
+valid rows and store the timestamp descending. Embedding lookups filter on
+``is_active`` and ``embedding_type`` and group by employee.
+
+Indexes are built concurrently so that large tables stay writable while
+the migration runs.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    'ix_attendance_records_employee_timestamp':
+        "ON attendance_records (employee_id, timestamp DESC) WHERE is_valid",
+    'ix_attendance_records_timestamp':
+        "ON attendance_records (timestamp DESC) WHERE is_valid",
+    'ix_face_embeddings_active_type_employee':
+        "ON face_embeddings (is_active, embedding_type, employee_id)",
+    'ix_face_embeddings_employee_id':
+        "ON face_embeddings (employee_id)",
+}
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,48 @@
+"""attendance indexes for keyset pagination
+
+Attendance pages are ordered by (timestamp, id) descending. Adding ``id`` to
+the partial attendance indexes lets each page be read in index order,
+starting at the cursor, without a sort.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+NEW_INDEXES = {
+    'ix_attendance_records_employee_timestamp_id':
+        "ON attendance_records (employee_id, timestamp DESC, id DESC) WHERE is_valid",
+    'ix_attendance_records_timestamp_id':
+        "ON attendance_records (timestamp DESC, id DESC) WHERE is_valid",
+}
+
+OLD_INDEXES = {
+    'ix_attendance_records_employee_timestamp':
+        "ON attendance_records (employee_id, timestamp DESC) WHERE is_valid",
+    'ix_attendance_records_timestamp':
+        "ON attendance_records (timestamp DESC) WHERE is_valid",
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, definition in NEW_INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}")
+        for name in OLD_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, definition in OLD_INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}")
+        for name in NEW_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
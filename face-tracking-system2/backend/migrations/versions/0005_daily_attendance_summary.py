@@ -0,0 +1,44 @@
+"""daily attendance summary table
+
+One row per employee and day with the first entry, last exit and time
+present. Rows are maintained by ``DatabaseManager`` as attendance events are
+written; ``python -m tasks.summary_backfill`` fills them in for history.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if 'daily_attendance_summary' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'daily_attendance_summary',
+        sa.Column('employee_id', sa.String(), sa.ForeignKey('employees.id'), primary_key=True),
+        sa.Column('work_date', sa.Date(), primary_key=True),
+        sa.Column('first_in', sa.DateTime()),
+        sa.Column('last_out', sa.DateTime()),
+        sa.Column('presence_seconds', sa.Float()),
+        sa.Column('open_since', sa.DateTime()),
+        sa.Column('last_event', sa.DateTime()),
+        sa.Column('event_count', sa.Integer()),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+    # Month views over all employees scan this index by date range
+    op.create_index('ix_daily_attendance_summary_work_date', 'daily_attendance_summary',
+                    ['work_date', 'employee_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_daily_attendance_summary_work_date', table_name='daily_attendance_summary')
+    op.drop_table('daily_attendance_summary')
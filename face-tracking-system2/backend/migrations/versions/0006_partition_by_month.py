@@ -0,0 +1,154 @@
+"""partition attendance and tracking records by month
+
+Both tables become range partitioned on ``timestamp`` with one partition per
+month, so time-bounded queries only touch the months they cover and old
+data is removed by dropping partitions (``db.partitions``).
+
+A partitioned table's primary key and unique constraints must include the
+partition key, so the primary key becomes ``(id, timestamp)`` and the
+attendance idempotency key becomes unique on ``(event_key, timestamp)``;
+``id`` stays unique through its sequence. Existing rows are copied into the
+new partitions, which takes a while on large tables.
+
+This is an offline migration: both tables are renamed and copied under an
+ACCESS EXCLUSIVE lock, so stop the API and run ``alembic upgrade head``.
+The startup auto-upgrade refuses to apply it to an existing database, and
+it gives up after ``LOCK_TIMEOUT`` if other sessions still use the tables.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+# Not applied by the API's startup upgrade (db.db_config.create_tables)
+offline = True
+
+MONTHS_AHEAD = 3
+LOCK_TIMEOUT = '10s'
+
+TABLES = {
+    'attendance_records': {
+        'columns': """
+            id INTEGER NOT NULL DEFAULT nextval('attendance_records_id_seq'),
+            employee_id VARCHAR NOT NULL REFERENCES employees (id),
+            camera_id INTEGER NOT NULL,
+            event_type VARCHAR NOT NULL,
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            confidence_score FLOAT,
+            work_status VARCHAR,
+            is_valid BOOLEAN,
+            notes TEXT,
+            event_key VARCHAR""",
+        'names': ('id', 'employee_id', 'camera_id', 'event_type', 'timestamp', 'confidence_score',
+                  'work_status', 'is_valid', 'notes', 'event_key'),
+        'indexes': {
+            'ix_attendance_records_event_key':
+                "CREATE UNIQUE INDEX {name} ON {table} (event_key, timestamp)",
+            'ix_attendance_records_employee_timestamp_id':
+                "CREATE INDEX {name} ON {table} (employee_id, timestamp DESC, id DESC) WHERE is_valid",
+            'ix_attendance_records_timestamp_id':
+                "CREATE INDEX {name} ON {table} (timestamp DESC, id DESC) WHERE is_valid",
+        },
+        'old_indexes': {
+            'ix_attendance_records_id': "CREATE INDEX {name} ON {table} (id)",
+            'ix_attendance_records_event_key': "CREATE UNIQUE INDEX {name} ON {table} (event_key)",
+            'ix_attendance_records_employee_timestamp_id':
+                "CREATE INDEX {name} ON {table} (employee_id, timestamp DESC, id DESC) WHERE is_valid",
+            'ix_attendance_records_timestamp_id':
+                "CREATE INDEX {name} ON {table} (timestamp DESC, id DESC) WHERE is_valid",
+        },
+    },
+    'tracking_records': {
+        'columns': """
+            id INTEGER NOT NULL DEFAULT nextval('tracking_records_id_seq'),
+            employee_id VARCHAR NOT NULL REFERENCES employees (id),
+            camera_id INTEGER NOT NULL,
+            position_x FLOAT,
+            position_y FLOAT,
+            confidence_score FLOAT,
+            quality_metrics JSON,
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            tracking_state VARCHAR""",
+        'names': ('id', 'employee_id', 'camera_id', 'position_x', 'position_y', 'confidence_score',
+                  'quality_metrics', 'timestamp', 'tracking_state'),
+        'indexes': {
+            'ix_tracking_records_employee_timestamp':
+                "CREATE INDEX {name} ON {table} (employee_id, timestamp DESC)",
+        },
+        'old_indexes': {
+            'ix_tracking_records_id': "CREATE INDEX {name} ON {table} (id)",
+        },
+    },
+}
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def copy_columns(spec) -> str:
+    return ", ".join(f'"{name}"' for name in spec['names'])
+
+
+def swap_out(table: str, spec, indexes) -> str:
+    """Rename a table out of the way, freeing its index and constraint names."""
+    old = f"{table}_old"
+    for name in indexes:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey")
+    return old
+
+
+def finish_copy(table: str, old: str, spec) -> None:
+    columns = copy_columns(spec)
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {old}")
+    op.execute(f"DROP TABLE {old}")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Fail fast instead of queueing behind (and blocking) live traffic
+    op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+    for table, spec in TABLES.items():
+        old = swap_out(table, spec, spec['old_indexes'])
+        # Rows written before timestamps were mandatory keep the time of the migration
+        op.execute(f"UPDATE {old} SET timestamp = now() WHERE timestamp IS NULL")
+        op.execute(
+            f"CREATE TABLE {table} ({spec['columns']}, PRIMARY KEY (id, timestamp)) "
+            f"PARTITION BY RANGE (timestamp)")
+
+        first = bind.execute(sa.text(f"SELECT min(timestamp) FROM {old}")).scalar()
+        this_month = date.today().replace(day=1)
+        month = date(first.year, first.month, 1) if first else this_month
+        while month <= add_months(this_month, MONTHS_AHEAD):
+            op.execute(
+                f"CREATE TABLE {table}_y{month.year:04d}m{month.month:02d} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')")
+            month = add_months(month, 1)
+
+        for name, definition in spec['indexes'].items():
+            op.execute(definition.format(name=name, table=table))
+        finish_copy(table, old, spec)
+
+
+def downgrade() -> None:
+    for table, spec in TABLES.items():
+        old = swap_out(table, spec, spec['indexes'])
+        op.execute(f"CREATE TABLE {table} ({spec['columns']}, PRIMARY KEY (id))")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN timestamp DROP NOT NULL")
+        for name, definition in spec['old_indexes'].items():
+            op.execute(definition.format(name=name, table=table))
+        finish_copy(table, old, spec)
@@ -60,6 +60,9 @@ def parse_args():
 def check_environment():
     """Check if environment is properly configured."""
     required_env_vars = ["SECRET_KEY", "DB_HOST", "DB_NAME", "DB_USER"]
+    if os.getenv("DB_BACKEND", "postgresql").lower() == "sqlite":
+        # The database is a local file; no server to connect to
+        required_env_vars = ["SECRET_KEY"]
     missing_vars = []
     for var in required_env_vars:
         if not os.getenv(var):
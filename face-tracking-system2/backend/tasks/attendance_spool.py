@@ -0,0 +1,241 @@
+"""
+Durable local spool for attendance events.
+Events are appended as JSON lines to the active segment file before they go
+anywhere near the database. Segments are rotated by size, or on demand by the
+writer, and a sealed segment is only deleted once all of its events have been
+committed. Every event carries an ``event_key`` so that replaying a segment
+that was partly or wholly written before a crash inserts nothing twice.
+Each process (e.g. each uvicorn worker) spools into its own ``worker-N``
+slot directory, held with an exclusive file lock for as long as the process
+lives. Segments in a slot whose process is gone are adopted by a live one;
+events the database rejects for good are moved to ``quarantine/``.
+"""
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+from utils.logging import get_logger
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+logger = get_logger(__name__)
+SEGMENT_PREFIX = 'attendance-'
+SEGMENT_SUFFIX = '.log'
+SLOT_PREFIX = 'worker-'
+LOCK_NAME = '.lock'
+QUARANTINE_DIR = 'quarantine'
+def _try_lock(path: Path):
+    """Open and exclusively lock a lock file without blocking; returns the open file or None."""
+    handle = open(path, 'a+b')
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        return handle
+    except OSError:
+        handle.close()
+        return None
+class AttendanceSpool:
+    """
+    Append-only, segment-rotated event log on local disk.
+    """
+    def __init__(self, directory: str, segment_max_bytes: int = 4 * 1024 * 1024, fsync: bool = False):
+        """
+        Args:
+            directory: Directory holding the segment files
+            segment_max_bytes: Size at which the active segment is sealed
+            fsync: Force every append to disk, surviving power loss as well
+                as process crashes at the cost of append latency
+        """
+        self.root = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self.directory: Optional[Path] = None  # this process's slot, claimed by open()
+        self._slot_lock = None
+        self._active: Optional[Path] = None
+        self._file = None
+        self._active_size = 0
+        self._active_count = 0
+        self._next_seq = 1
+    def open(self):
+        """Claim a slot directory for this process; nothing touches the disk before."""
+        with self._lock:
+            if self.directory is None:
+                self._claim_slot()
+    def _claim_slot(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        for number in itertools.count():
+            slot = self.root / f"{SLOT_PREFIX}{number}"
+            slot.mkdir(exist_ok=True)
+            handle = _try_lock(slot / LOCK_NAME)
+            if handle is not None:
+                break
+        self.directory = slot
+        self._slot_lock = handle
+        # Segments left by a previous run are sealed as they are and replayed
+        existing = self._segments()
+        self._next_seq = self._segment_seq(existing[-1]) + 1 if existing else 1
+        # Segments spooled before slots existed
+        self._move_into_slot(sorted(self.root.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")))
+        if existing:
+            logger.info(f"Attendance spool slot {slot.name} has {len(existing)} segments from a previous run")
+    def adopt_orphans(self) -> int:
+        """
+        Move the segments of slots no live process holds into this slot.
+        Returns:
+            Number of segments adopted
+        """
+        with self._lock:
+            if self.directory is None:
+                self._claim_slot()
+            adopted = 0
+            for slot in sorted(self.root.glob(f"{SLOT_PREFIX}*")):
+                if slot == self.directory or not slot.is_dir():
+                    continue
+                handle = _try_lock(slot / LOCK_NAME)
+                if handle is None:
+                    continue  # its process is alive and replays it itself
+                try:
+                    adopted += self._move_into_slot(sorted(slot.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")))
+                finally:
+                    handle.close()
+            if adopted:
+                logger.info(f"Adopted {adopted} attendance spool segments of stopped workers")
+            return adopted
+    def _move_into_slot(self, paths: List[Path]) -> int:
+        moved = 0
+        for path in paths:
+            target = self.directory / f"{SEGMENT_PREFIX}{self._next_seq:012d}{SEGMENT_SUFFIX}"
+            try:
+                path.rename(target)
+            except FileNotFoundError:
+                continue  # taken by another process first
+            self._next_seq += 1
+            moved += 1
+        return moved
+    def append(self, record: Dict) -> Dict:
+        """
+        Append an event to the active segment.
+        Args:
+            record: Event in the ``record_attendance_bulk`` format
+        Returns:
+            The stored event, with an ``event_key`` and ``timestamp`` assigned if it had none
+        """
+        if not record.get('event_key'):
+            record = dict(record, event_key=uuid.uuid4().hex)
+        # The key is unique together with the timestamp, so a replay must not re-stamp the event
+        if not record.get('timestamp'):
+            record = dict(record, timestamp=time.time())
+        line = (json.dumps(record, separators=(',', ':'), default=str) + '\n').encode('utf-8')
+        with self._lock:
+            if self.directory is None:
+                self._claim_slot()
+            if self._file is None:
+                self._open_segment()
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._active_size += len(line)
+            self._active_count += 1
+            if self._active_size >= self.segment_max_bytes:
+                self._seal()
+        return record
+    def rotate(self) -> bool:
+        """
+        Seal the active segment if it holds any events.
+        Returns:
+            True if a segment was sealed
+        """
+        with self._lock:
+            if self._file is None or not self._active_count:
+                return False
+            self._seal()
+            return True
+    def sealed_segments(self) -> List[Path]:
+        """Sealed segment files of this process's slot, oldest first."""
+        with self._lock:
+            return [path for path in self._segments() if path != self._active]
+    def read_segment(self, path: Path) -> List[Dict]:
+        """
+        Read the events of a segment.
+        A torn last line from a crash mid-append is skipped.
+        Args:
+            path: Segment file
+        Returns:
+            Events in append order
+        """
+        records = []
+        with open(path, 'rb') as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"Skipping unreadable line {number} of spool segment {path.name}")
+        return records
+    def remove(self, path: Path):
+        """Delete a segment whose events are all committed."""
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+    def quarantine(self, records: List[Dict]) -> Path:
+        """
+        Set aside events the database rejects for good, for manual inspection.
+        Args:
+            records: Events to move out of the replay path
+        Returns:
+            The quarantine segment they were appended to
+        """
+        directory = self.root / QUARANTINE_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        slot = self.directory.name if self.directory is not None else 'spool'
+        path = directory / f"{SEGMENT_PREFIX}{time.strftime('%Y%m%d')}-{slot}{SEGMENT_SUFFIX}"
+        with open(path, 'ab') as f:
+            for record in records:
+                f.write((json.dumps(record, separators=(',', ':'), default=str) + '\n').encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+        return path
+    def pending_segments(self) -> int:
+        """Number of segments not yet replayed, including the active one."""
+        with self._lock:
+            return len(self._segments()) if self.directory is not None else 0
+    def close(self):
+        """Seal the active segment and release the slot."""
+        with self._lock:
+            if self._file is not None:
+                self._seal()
+            if self._slot_lock is not None:
+                self._slot_lock.close()
+                self._slot_lock = None
+                self.directory = None
+    def _open_segment(self):
+        self._active = self.directory / f"{SEGMENT_PREFIX}{self._next_seq:012d}{SEGMENT_SUFFIX}"
+        self._next_seq += 1
+        self._file = open(self._active, 'ab')
+        self._active_size = 0
+        self._active_count = 0
+    def _seal(self):
+        self._file.close()
+        if not self._active_count:
+            self.remove(self._active)
+        self._file = None
+        self._active = None
+        self._active_size = 0
+        self._active_count = 0
+    def _segments(self) -> List[Path]:
+        return sorted(self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+    @staticmethod
+    def _segment_seq(path: Path) -> int:
+        return int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
@@ -0,0 +1,195 @@
+"""
+Background writer for attendance events.
+Detection workers append attendance events to the local spool and return
+immediately, so recognition never waits on the database. A single writer
+thread seals the active spool segment when ``max_batch`` events have
+accumulated or the flush interval has passed, and replays sealed segments
+into the database with multi-row inserts. A segment is deleted only after
+all of its events are committed; while the database is unavailable the
+writer backs off and the events stay on disk, including across restarts.
+A batch the database rejects while it is reachable is retried event by
+event, and the events that still fail are quarantined instead of blocking
+the spool behind them.
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+from tasks.attendance_spool import AttendanceSpool
+from utils.logging import get_logger
+logger = get_logger(__name__)
+class AttendanceWriter:
+    """
+    Replays spooled attendance events into the database on a background thread.
+    """
+    def __init__(self, db_manager, spool: AttendanceSpool, max_batch: int = 500,
+                 flush_interval: float = 1.0, max_retry_delay: float = 30.0):
+        """
+        Args:
+            db_manager: DatabaseManager providing ``record_attendance_bulk``
+            spool: Local spool the events are appended to
+            max_batch: Events written per insert at most
+            flush_interval: Seconds an event may wait before its batch is flushed
+            max_retry_delay: Upper bound for the delay between failed flushes
+        """
+        self.db_manager = db_manager
+        self.spool = spool
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_retry_delay = max_retry_delay
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._unflushed = 0
+        self._failures = 0
+        # Metrics
+        self.enqueued = 0
+        self.written = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self.quarantined = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.last_flush_size = 0
+        self.last_flush_duration = 0.0
+        self.last_flush_at: Optional[float] = None
+    def start(self):
+        """Start the writer thread; segments left by a previous run are replayed first."""
+        if self._thread and self._thread.is_alive():
+            return
+        self.spool.open()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="attendance_writer")
+        self._thread.start()
+    def submit(self, record: Dict) -> bool:
+        """
+        Spool an attendance event for writing.
+        Args:
+            record: Event in the ``record_attendance_bulk`` format
+        Returns:
+            True if the event is on disk, False if the spool could not be written
+        """
+        try:
+            self.spool.append(record)
+        except OSError as e:
+            logger.error(f"Could not spool attendance event for {record.get('employee_id')}: {e}")
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.enqueued += 1
+            self._unflushed += 1
+            if self._unflushed >= self.max_batch:
+                self._wake.set()
+        return True
+    def stop(self, timeout: float = 30.0):
+        """
+        Flush everything spooled and stop the writer thread.
+        Events that cannot be written in time stay in the spool for the next start.
+        Args:
+            timeout: Seconds to wait for the final flush
+        """
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            logger.error(f"Attendance writer did not drain within {timeout:.0f}s")
+        self._thread = None
+    def stats(self) -> Dict:
+        """Writer metrics."""
+        with self._lock:
+            stats = {
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'duplicates': self.duplicates,
+                'dropped': self.dropped,
+                'quarantined': self.quarantined,
+                'unflushed': self._unflushed,
+                'flushes': self.flushes,
+                'failed_flushes': self.failed_flushes,
+                'last_flush_size': self.last_flush_size,
+                'last_flush_duration_ms': round(self.last_flush_duration * 1000, 1),
+                'last_flush_at': self.last_flush_at,
+            }
+        stats['spool_segments'] = self.spool.pending_segments()
+        return stats
+    def _run(self):
+        while True:
+            if self._failures:
+                # Back off before retrying; a stop request cuts it short
+                self._stopping.wait(min(self.max_retry_delay, self.flush_interval * 2 ** self._failures))
+            else:
+                self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            stopping = self._stopping.is_set()
+            with self._lock:
+                self._unflushed = 0
+            self.spool.rotate()
+            replayed = self._replay()
+            if stopping:
+                if not replayed:
+                    logger.warning(
+                        f"{self.spool.pending_segments()} attendance spool segments left for replay on next start")
+                self.spool.close()
+                return
+    def _replay(self) -> bool:
+        """Write all sealed segments, oldest first. Returns False while the database is unavailable."""
+        self.spool.adopt_orphans()
+        for path in self.spool.sealed_segments():
+            records = self.spool.read_segment(path)
+            for start in range(0, len(records), self.max_batch):
+                batch = records[start:start + self.max_batch]
+                if not self._flush(batch) and not self._flush_singly(batch):
+                    return False
+            self.spool.remove(path)
+        return True
+    def _flush_singly(self, batch: List[Dict]) -> bool:
+        """
+        Retry a failed batch one event at a time and quarantine the events the database rejects.
+        Returns False if the database is unavailable, so the whole batch stays spooled.
+        """
+        if not self.db_manager.is_available():
+            return False
+        rejected = []
+        inserted = 0
+        for record in batch:
+            result = self.db_manager.record_attendance_bulk([record])
+            if result is not None:
+                inserted += result
+                continue
+            if not self.db_manager.is_available():
+                return False
+            rejected.append(record)
+        if rejected:
+            try:
+                path = self.spool.quarantine(rejected)
+            except OSError as e:
+                logger.error(f"Could not quarantine {len(rejected)} attendance events: {e}")
+                return False
+            logger.error(f"Quarantined {len(rejected)} attendance events the database rejected in {path}")
+        with self._lock:
+            self.written += inserted
+            self.duplicates += len(batch) - len(rejected) - inserted
+            self.quarantined += len(rejected)
+            self._failures = 0
+        return True
+    def _flush(self, batch: List[Dict]) -> bool:
+        started = time.monotonic()
+        inserted = self.db_manager.record_attendance_bulk(batch)
+        duration = time.monotonic() - started
+        with self._lock:
+            self.flushes += 1
+            self.last_flush_duration = duration
+            self.last_flush_at = time.time()
+            if inserted is not None:
+                self.written += inserted
+                self.duplicates += len(batch) - inserted
+                self.last_flush_size = len(batch)
+                self._failures = 0
+                return True
+            self.failed_flushes += 1
+            self._failures += 1
+        logger.warning(f"Attendance flush of {len(batch)} events failed, keeping them spooled")
+        return False
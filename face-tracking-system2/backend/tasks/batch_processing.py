@@ -0,0 +1,321 @@
+"""
+Offline batch processing of recorded video.
+This module backfills attendance from DVR footage by running the detection
+pipeline over a video file as fast as the CPU allows. The file is split into
+time chunks that are processed in parallel by a process pool; every worker
+process builds the detector once and reuses it for all of its chunks, and
+the resulting attendance events keep the original frame timestamps.
+Usage:
+    python -m tasks.batch_processing VIDEO --camera-id 3 --start 2026-10-18T08:00:00
+"""
+import os
+import sys
+import uuid
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+import cv2
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from app.config import settings
+from core.face_tracker import FaceTracker
+from utils.logging import get_logger
+logger = get_logger(__name__)
+class VideoChunk(NamedTuple):
+    """A contiguous range of frames processed by one worker."""
+    index: int
+    path: str
+    start_frame: int
+    end_frame: int
+    fps: float
+    recording_start: float
+    frame_stride: int
+class BatchJob:
+    """
+    Progress and result of a batch processing run.
+    """
+    def __init__(self, video_path: str, camera_id: int):
+        self.job_id = uuid.uuid4().hex
+        self.video_path = video_path
+        self.camera_id = camera_id
+        self.status = 'pending'  # pending, running, completed, failed
+        self.chunks_total = 0
+        self.chunks_done = 0
+        self.events_found = 0
+        self.records_written = 0
+        self.error: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+    def to_dict(self) -> Dict:
+        return {
+            'job_id': self.job_id,
+            'video_path': self.video_path,
+            'camera_id': self.camera_id,
+            'status': self.status,
+            'chunks_total': self.chunks_total,
+            'chunks_done': self.chunks_done,
+            'events_found': self.events_found,
+            'records_written': self.records_written,
+            'error': self.error,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+# Job registry for the API
+_jobs: Dict[str, BatchJob] = {}
+_jobs_lock = threading.Lock()
+# Per-process detector, created once by the pool initializer
+_worker_pipeline = None
+def _init_worker(gpu_id: int):
+    """Build the detection pipeline once per worker process."""
+    global _worker_pipeline
+    from core.fts_system import FaceTrackingPipeline
+    _worker_pipeline = FaceTrackingPipeline(gpu_id=gpu_id)
+def plan_chunks(video_path: str, recording_start: float, chunk_seconds: float,
+                frame_stride: int) -> List[VideoChunk]:
+    """
+    Split a video file into time chunks.
+    Args:
+        video_path: Path to the video file
+        recording_start: Epoch time of the first frame
+        chunk_seconds: Length of each chunk in seconds
+        frame_stride: Run detection on every Nth frame
+    Returns:
+        List of chunks covering the whole file
+    Raises:
+        ValueError: If the file cannot be opened or has no frames
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            raise ValueError(f"Cannot open video file {video_path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or float(settings.FRAME_RATE)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        cap.release()
+    if total_frames <= 0:
+        raise ValueError(f"Video file {video_path} has no frames")
+    frames_per_chunk = max(frame_stride, int(chunk_seconds * fps))
+    return [
+        VideoChunk(
+            index=i,
+            path=video_path,
+            start_frame=start,
+            end_frame=min(start + frames_per_chunk, total_frames),
+            fps=fps,
+            recording_start=recording_start,
+            frame_stride=frame_stride)
+        for i, start in enumerate(range(0, total_frames, frames_per_chunk))]
+def process_chunk(chunk: VideoChunk) -> List[Dict]:
+    """
+    Detect and recognize faces in one chunk.
+    Runs in a worker process. Each recognized track yields a single event at
+    the frame it was first recognized in.
+    Args:
+        chunk: Chunk to process
+    Returns:
+        Attendance events with original frame timestamps
+    """
+    cap = cv2.VideoCapture(chunk.path)
+    tracker = FaceTracker(max_age=max(2.0, 3 * chunk.frame_stride / chunk.fps))
+    events = []
+    reported_tracks = set()
+    try:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, chunk.start_frame)
+        for frame_index in range(chunk.start_frame, chunk.end_frame):
+            # grab() skips decoding for frames we do not analyse
+            if not cap.grab():
+                break
+            if (frame_index - chunk.start_frame) % chunk.frame_stride:
+                continue
+            ret, frame = cap.retrieve()
+            if not ret:
+                continue
+            timestamp = chunk.recording_start + frame_index / chunk.fps
+            faces = _worker_pipeline.system.detect_faces(frame)
+            tracker.update(faces, timestamp)
+            for face in faces:
+                employee_id = face.get('employee_id')
+                confidence = float(face.get('confidence', 0.0))
+                track_id = face.get('track_id')
+                if not employee_id or confidence <= settings.FACE_RECOGNITION_TOLERANCE:
+                    continue
+                if track_id in reported_tracks:
+                    continue
+                reported_tracks.add(track_id)
+                events.append({
+                    'employee_id': employee_id,
+                    'timestamp': timestamp,
+                    'confidence_score': confidence,
+                })
+    finally:
+        cap.release()
+    return events
+def dedupe_events(events: List[Dict], window_seconds: float) -> List[Dict]:
+    """
+    Collapse sightings of the same employee closer than ``window_seconds``.
+    Args:
+        events: Events from all chunks, in any order
+        window_seconds: Minimum gap between two kept events of one employee
+    Returns:
+        Time-ordered list of kept events
+    """
+    kept = []
+    last_seen: Dict[str, float] = {}
+    for event in sorted(events, key=lambda e: e['timestamp']):
+        previous = last_seen.get(event['employee_id'])
+        last_seen[event['employee_id']] = event['timestamp']
+        if previous is not None and event['timestamp'] - previous < window_seconds:
+            continue
+        kept.append(event)
+    return kept
+def run_batch_job(job: BatchJob, recording_start: float, chunk_seconds: float = 60.0,
+                  workers: Optional[int] = None, frame_stride: int = 5,
+                  dedupe_seconds: float = 300.0, gpu_id: int = 0,
+                  dry_run: bool = False) -> BatchJob:
+    """
+    Process a video file and write the resulting attendance in bulk.
+    Args:
+        job: Job to run (updated in place)
+        recording_start: Epoch time of the first frame
+        chunk_seconds: Length of each chunk in seconds
+        workers: Worker processes (defaults to the CPU count)
+        frame_stride: Run detection on every Nth frame
+        dedupe_seconds: Minimum gap between two events of one employee
+        gpu_id: GPU used by the worker pipelines
+        dry_run: Detect only, do not write attendance
+    Returns:
+        The finished job
+    """
+    job.status = 'running'
+    job.started_at = datetime.now()
+    try:
+        chunks = plan_chunks(job.video_path, recording_start, chunk_seconds, frame_stride)
+        job.chunks_total = len(chunks)
+        workers = max(1, min(workers or os.cpu_count() or 1, len(chunks)))
+        logger.info(f"Batch job {job.job_id}: {len(chunks)} chunks of {job.video_path} on {workers} workers")
+        events = []
+        # spawn keeps CUDA/ONNX runtime state out of forked children
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(gpu_id,)) as pool:
+            futures = [pool.submit(process_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                events.extend(future.result())
+                job.chunks_done += 1
+        events = dedupe_events(events, dedupe_seconds)
+        job.events_found = len(events)
+        if events and not dry_run:
+            from db.db_manager import DatabaseManager
+            from db.partitions import ensure_partitions
+            # Old footage may predate the partitions kept for live data
+            timestamps = [event['timestamp'] for event in events]
+            ensure_partitions('attendance_records',
+                              datetime.fromtimestamp(min(timestamps)), datetime.fromtimestamp(max(timestamps)))
+            notes = f"backfill:{os.path.basename(job.video_path)}"
+            # Keys derived from the sighting make re-running a backfill harmless
+            written = DatabaseManager().record_attendance_bulk([
+                {
+                    'employee_id': event['employee_id'],
+                    'camera_id': job.camera_id,
+                    'confidence_score': event['confidence_score'],
+                    'event_type': 'entry',
+                    'timestamp': event['timestamp'],
+                    'notes': notes,
+                    'event_key': f"backfill:{job.camera_id}:{event['employee_id']}:{event['timestamp']:.3f}",
+                }
+                for event in events])
+            if written is None:
+                raise RuntimeError("Failed to write attendance records")
+            job.records_written = written
+        job.status = 'completed'
+        logger.info(
+            f"Batch job {job.job_id} finished: {job.events_found} events, "
+            f"{job.records_written} records written")
+    except Exception as e:
+        job.status = 'failed'
+        job.error = str(e)
+        logger.error(f"Batch job {job.job_id} failed: {e}")
+    finally:
+        job.finished_at = datetime.now()
+    return job
+def submit_batch_job(video_path: str, camera_id: int, recording_start: float, **options) -> BatchJob:
+    """
+    Start a batch job in a background thread.
+    Args:
+        video_path: Path to the video file
+        camera_id: Camera the footage was recorded by
+        recording_start: Epoch time of the first frame
+        **options: Passed on to ``run_batch_job``
+    Returns:
+        The submitted job
+    """
+    job = BatchJob(video_path, camera_id)
+    with _jobs_lock:
+        _jobs[job.job_id] = job
+    thread = threading.Thread(
+        target=run_batch_job,
+        args=(job, recording_start),
+        kwargs=options,
+        daemon=True,
+        name=f"batch_job_{job.job_id[:8]}")
+    thread.start()
+    return job
+def get_batch_job(job_id: str) -> Optional[BatchJob]:
+    """Look up a submitted job."""
+    with _jobs_lock:
+        return _jobs.get(job_id)
+def default_recording_start(video_path: str) -> float:
+    """Estimate the recording start as file mtime minus the video duration."""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or float(settings.FRAME_RATE)
+        duration = cap.get(cv2.CAP_PROP_FRAME_COUNT) / fps
+    finally:
+        cap.release()
+    return os.path.getmtime(video_path) - duration
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Backfill attendance from a recorded video file",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("video", help="Path to the video file")
+    parser.add_argument("--camera-id", type=int, required=True, help="Camera that recorded the footage")
+    parser.add_argument(
+        "--start",
+        type=str,
+        default=None,
+        help="Recording start time (ISO 8601); defaults to file mtime minus duration")
+    parser.add_argument("--chunk-seconds", type=float, default=60.0, help="Seconds of video per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--stride", type=int, default=5, help="Run detection on every Nth frame")
+    parser.add_argument("--dedupe-seconds", type=float, default=300.0, help="Minimum gap between events per employee")
+    parser.add_argument("--gpu-id", type=int, default=0, help="GPU for the detection pipelines")
+    parser.add_argument("--dry-run", action="store_true", help="Detect only, do not write attendance")
+    return parser.parse_args(argv)
+def main(argv=None):
+    """Command line entry point."""
+    args = parse_args(argv)
+    if not os.path.exists(args.video):
+        print(f"❌ Video file not found: {args.video}")
+        sys.exit(1)
+    recording_start = (datetime.fromisoformat(args.start).timestamp()
+                       if args.start else default_recording_start(args.video))
+    job = BatchJob(args.video, args.camera_id)
+    run_batch_job(
+        job,
+        recording_start,
+        chunk_seconds=args.chunk_seconds,
+        workers=args.workers,
+        frame_stride=max(1, args.stride),
+        dedupe_seconds=args.dedupe_seconds,
+        gpu_id=args.gpu_id,
+        dry_run=args.dry_run)
+    if job.status != 'completed':
+        print(f"❌ Batch processing failed: {job.error}")
+        sys.exit(1)
+    print(f"✅ {job.events_found} attendance events found, {job.records_written} records written")
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,69 @@
 Background tasks for camera monitoring and face detection processing.
 This module handles continuous camera monitoring, face detection, and
 attendance recording without blocking the main API thread.
+With several API workers only the one holding the monitoring lease in the
+cache backend opens the cameras; the others answer presence queries from
+the attendance records.
 """
 import asyncio
+import os
+import socket
 import threading
 import time
-from typing import Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Union
 from contextlib import contextmanager
-import cv2
-import numpy as np
 from utils.logging import get_logger
 from utils.security import get_db_manager
 from core.fts_system import FaceTrackingPipeline
+from core.face_tracker import FaceTracker, Track
+from core.trajectory import TrajectoryBuffer
+from core.frame_store import FrameStore, CapturedFrame
+from core.camera_source import CameraSource
+from core.camera_health import CameraHealthRegistry, FINISHED, RECONNECTING, STOPPED
+from core.presence import PresenceTracker
+from core.stream_encoder import EncodedFrameCache
+from tasks.inference_scheduler import InferenceScheduler
+from tasks.attendance_writer import AttendanceWriter
+from tasks.attendance_spool import AttendanceSpool
+from tasks.trajectory_writer import TrajectoryWriter
 from app.config import settings
+from utils.cache_backend import cache_backend
+from utils.event_bus import event_bus
 logger = get_logger(__name__)
+class CameraSpec(NamedTuple):
+    """Capture settings for one monitored camera."""
+    camera_id: int
+    camera_name: str
+    camera_type: str
+    width: int
+    height: int
+    fps: int
+    gpu_id: int
+    source: Union[int, str]
+    @classmethod
+    def default(cls, camera_id: int) -> 'CameraSpec':
+        """Spec for a camera without a camera_configs row."""
+        return cls(
+            camera_id=camera_id,
+            camera_name=f"Camera {camera_id}",
+            camera_type='entry',
+            width=640,
+            height=480,
+            fps=settings.FRAME_RATE,
+            gpu_id=0,
+            source=settings.CAMERA_SOURCE_MAP.get(camera_id, camera_id))
+    @classmethod
+    def from_config(cls, config) -> 'CameraSpec':
+        """Spec for a ``CameraConfig`` row."""
+        return cls(
+            camera_id=config.camera_id,
+            camera_name=config.camera_name,
+            camera_type=config.camera_type or 'entry',
+            width=config.resolution_width or 640,
+            height=config.resolution_height or 480,
+            fps=config.fps or settings.FRAME_RATE,
+            gpu_id=config.gpu_id or 0,
+            source=settings.CAMERA_SOURCE_MAP.get(config.camera_id, config.camera_id))
 class CameraMonitor:
     """
     Background camera monitor for continuous face detection and attendance tracking.
@@ -23,36 +72,110 @@ class CameraMonitor:
     def __init__(self):
         self.active_cameras: Dict[int, bool] = {}
         self.camera_threads: Dict[int, threading.Thread] = {}
-        self.pipeline = None
+        self.camera_specs: Dict[int, CameraSpec] = {}
+        self.pipelines: Dict[int, FaceTrackingPipeline] = {}  # gpu_id -> pipeline
         self.db_manager = get_db_manager()
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.is_leader = False  # whether this process runs the camera workers
+        # Detection runs on a fair-share scheduler instead of a shared FIFO pool
+        self.scheduler = InferenceScheduler(self._process_frame, workers=settings.INFERENCE_WORKERS)
+        self.trackers: Dict[int, FaceTracker] = {}
+        self.trajectories: Dict[int, TrajectoryBuffer] = {}
+        self._unknown_alerted: Dict[int, set] = {}  # camera_id -> track ids already alerted
+        self.frame_store = FrameStore()
+        self.health = CameraHealthRegistry()
+        self.sources: Dict[int, CameraSource] = {}
+        # Attendance is spooled to disk and written in batches off the detection threads
+        self.attendance_writer = AttendanceWriter(
+            self.db_manager,
+            AttendanceSpool(
+                settings.ATTENDANCE_SPOOL_DIR,
+                segment_max_bytes=settings.ATTENDANCE_SPOOL_SEGMENT_BYTES,
+                fsync=settings.ATTENDANCE_SPOOL_FSYNC),
+            max_batch=settings.ATTENDANCE_BATCH_SIZE,
+            flush_interval=settings.ATTENDANCE_FLUSH_INTERVAL)
+        # Trajectories are buffered per track and written in bulk when the track ends
+        self.trajectory_writer = TrajectoryWriter(self.db_manager, max_batch=settings.TRAJECTORY_BATCH_SIZE)
+        self.presence = PresenceTracker(
+            cooldown=settings.ATTENDANCE_COOLDOWN_SECONDS,
+            presence_timeout=settings.ATTENDANCE_PRESENCE_TIMEOUT_HOURS * 3600)
         self._stop_event = threading.Event()
-    def start_camera_monitoring(self, camera_id: int) -> bool:
+        self._camera_stop_events: Dict[int, threading.Event] = {}
+        self._pipeline_lock = threading.Lock()
+        self._config_lock = threading.Lock()
+        self._config_reload = threading.Event()
+        self._config_thread: Optional[threading.Thread] = None
+        self._configured_cameras: set = set()  # cameras started from camera_configs
+        self._watchdog_thread: Optional[threading.Thread] = None
+    def get_pipeline(self, gpu_id: int = 0) -> FaceTrackingPipeline:
+        """Get (creating on first use) the detection pipeline for a GPU."""
+        with self._pipeline_lock:
+            if gpu_id not in self.pipelines:
+                self.pipelines[gpu_id] = FaceTrackingPipeline(gpu_id=gpu_id)
+            return self.pipelines[gpu_id]
+    def load_presence(self) -> bool:
+        """
+        Seed employee presence from the latest attendance records, so a
+        restart does not record a fresh entry for everyone already inside.
+        Also loads the employee directory used to answer presence queries.
+        Returns:
+            True if the records could be loaded
+        """
+        self.presence.set_directory(self.db_manager.get_all_employees())
+        records = self.db_manager.get_latest_attendance_for_all_employees(
+            hours_back=settings.ATTENDANCE_PRESENCE_TIMEOUT_HOURS)
+        if records is None:
+            return False
+        self.presence.seed(records)
+        logger.info(f"Loaded presence of {len(records)} employees, {len(self.presence.present_employees())} present")
+        return True
+    def start_camera_monitoring(self, camera_id: int, spec: Optional[CameraSpec] = None) -> bool:
         """
         Start monitoring a specific camera for face detection.
         Args:
             camera_id: Camera identifier
+            spec: Capture settings (defaults to 640x480 at FRAME_RATE on GPU 0)
         Returns:
             True if monitoring started successfully
         """
         if camera_id in self.active_cameras and self.active_cameras[camera_id]:
             logger.warning(f"Camera {camera_id} is already being monitored")
             return False
+        spec = spec or CameraSpec.default(camera_id)
         try:
             # Initialize pipeline if not exists
-            if self.pipeline is None:
-                self.pipeline = FaceTrackingPipeline()
+            self.get_pipeline(spec.gpu_id)
             # Mark camera as active
             self.active_cameras[camera_id] = True
+            self.camera_specs[camera_id] = spec
+            stop_event = threading.Event()
+            self._camera_stop_events[camera_id] = stop_event
+            self.trackers[camera_id] = FaceTracker()
+            if settings.TRAJECTORY_ENABLED:
+                self.trajectories[camera_id] = TrajectoryBuffer(
+                    min_distance=settings.TRAJECTORY_MIN_DISTANCE,
+                    min_interval=settings.TRAJECTORY_MIN_INTERVAL,
+                    max_interval=settings.TRAJECTORY_MAX_INTERVAL,
+                    max_points=settings.TRAJECTORY_MAX_POINTS)
+                self.trajectory_writer.start()
+            self.health.register(camera_id, str(spec.source))
+            self.scheduler.register(
+                camera_id,
+                weight=settings.CAMERA_TYPE_WEIGHT_MAP.get(spec.camera_type, 1.0),
+                min_fps=settings.DETECTION_MIN_FPS,
+                max_fps=min(settings.DETECTION_MAX_FPS, spec.fps))
+            self.scheduler.start()
+            self.attendance_writer.start()
             # Start monitoring thread
             thread = threading.Thread(
                 target=self._monitor_camera,
-                args=(camera_id,),
+                args=(camera_id, spec, stop_event),
                 daemon=True,
                 name=f"camera_monitor_{camera_id}")
             self.camera_threads[camera_id] = thread
             thread.start()
-            logger.info(f"Started monitoring camera {camera_id}")
+            logger.info(
+                f"Started monitoring camera {camera_id} ({spec.width}x{spec.height} "
+                f"@ {spec.fps} fps, GPU {spec.gpu_id})")
             return True
         except Exception as e:
             logger.error(f"Failed to start monitoring camera {camera_id}: {e}")
@@ -70,95 +193,249 @@ class CameraMonitor:
             logger.warning(f"Camera {camera_id} is not being monitored")
             return False
         try:
-            # Mark camera as inactive
+            # Mark camera as inactive and interrupt any reconnect wait
             self.active_cameras[camera_id] = False
+            if camera_id in self._camera_stop_events:
+                self._camera_stop_events[camera_id].set()
             # Wait for thread to finish
             if camera_id in self.camera_threads:
                 thread = self.camera_threads[camera_id]
                 thread.join(timeout=5.0)  # Wait up to 5 seconds
                 del self.camera_threads[camera_id]
+            self.camera_specs.pop(camera_id, None)
+            self.scheduler.unregister(camera_id)
+            self.frame_store.clear(camera_id)
             logger.info(f"Stopped monitoring camera {camera_id}")
             return True            
         except Exception as e:
             logger.error(f"Failed to stop monitoring camera {camera_id}: {e}")
             return False
+    def sync_camera_configs(self):
+        """
+        Reconcile running workers with the active rows of ``camera_configs``.
+        Cameras that were added are started, cameras that were removed or
+        deactivated are stopped, and cameras whose resolution, fps, GPU or
+        source changed are restarted with the new settings. Without any
+        configured camera the default camera is monitored.
+        """
+        with self._config_lock:
+            configs = self.db_manager.get_camera_configs(active_only=True)
+            if configs is None:
+                # Database unavailable; keep the current workers
+                return
+            desired = {config.camera_id: CameraSpec.from_config(config) for config in configs}
+            if not desired:
+                desired = {settings.DEFAULT_CAMERA_ID: CameraSpec.default(settings.DEFAULT_CAMERA_ID)}
+            # Only cameras started from the configs are stopped here; cameras
+            # opened on demand by a stream viewer are left running
+            for camera_id in list(self._configured_cameras):
+                if camera_id not in desired:
+                    logger.info(f"Camera {camera_id} is no longer configured, stopping")
+                    self._configured_cameras.discard(camera_id)
+                    if self.active_cameras.get(camera_id):
+                        self.stop_camera_monitoring(camera_id)
+            for camera_id, spec in desired.items():
+                current = self.camera_specs.get(camera_id)
+                self._configured_cameras.add(camera_id)
+                if self.active_cameras.get(camera_id) and current == spec:
+                    continue
+                if self.active_cameras.get(camera_id):
+                    logger.info(f"Configuration of camera {camera_id} changed, restarting")
+                    self.stop_camera_monitoring(camera_id)
+                self.start_camera_monitoring(camera_id, spec)
+    def start_config_watcher(self):
+        """Apply camera configs now and keep re-applying them in the background."""
+        self.sync_camera_configs()
+        if self._config_thread and self._config_thread.is_alive():
+            return
+        self._config_thread = threading.Thread(
+            target=self._watch_camera_configs,
+            daemon=True,
+            name="camera_config_watcher")
+        self._config_thread.start()
+    def request_config_reload(self):
+        """Apply camera config changes without waiting for the next poll."""
+        self._config_reload.set()
+    def _watch_camera_configs(self):
+        while not self._stop_event.is_set():
+            self._config_reload.wait(settings.CAMERA_CONFIG_REFRESH_SECONDS)
+            self._config_reload.clear()
+            if self._stop_event.is_set():
+                break
+            try:
+                self.sync_camera_configs()
+            except Exception as e:
+                logger.error(f"Error applying camera configs: {e}")
+    def restart_camera_monitoring(self, camera_id: int, reason: str = "") -> bool:
+        """
+        Replace a camera's worker without waiting for the old one.
+        The old worker may be stuck inside a blocking read; it is told to
+        stop and exits (releasing its capture) whenever that read returns,
+        while a fresh worker takes over with the same settings.
+        Args:
+            camera_id: Camera identifier
+            reason: Why the worker is restarted, for the log
+        Returns:
+            True if a new worker was started
+        """
+        spec = self.camera_specs.get(camera_id) or CameraSpec.default(camera_id)
+        logger.warning(f"Restarting worker for camera {camera_id}: {reason}")
+        old_stop_event = self._camera_stop_events.get(camera_id)
+        if old_stop_event:
+            old_stop_event.set()
+        self.active_cameras[camera_id] = False
+        self.camera_threads.pop(camera_id, None)
+        self.sources.pop(camera_id, None)
+        self.health.record_restart(camera_id)
+        return self.start_camera_monitoring(camera_id, spec)
+    def start_watchdog(self):
+        """Start the background thread restarting workers with a stale heartbeat."""
+        if self._watchdog_thread and self._watchdog_thread.is_alive():
+            return
+        self._watchdog_thread = threading.Thread(
+            target=self._watchdog,
+            daemon=True,
+            name="camera_watchdog")
+        self._watchdog_thread.start()
+    def _watchdog(self):
+        timeout = settings.CAMERA_WATCHDOG_TIMEOUT
+        while not self._stop_event.wait(settings.CAMERA_WATCHDOG_INTERVAL):
+            try:
+                self._expire_presence()
+                for camera_id in self.health.stale_cameras(timeout):
+                    if not self.active_cameras.get(camera_id):
+                        continue
+                    source = self.sources.get(camera_id)
+                    if source is not None and source.connecting:
+                        # Waiting out a reconnect backoff is not a hang; a
+                        # reconnect that stopped making progress is restarted
+                        self.health.set_state(camera_id, RECONNECTING)
+                        continue
+                    self.restart_camera_monitoring(camera_id, f"no frame for more than {timeout:.0f}s")
+            except Exception as e:
+                logger.error(f"Error in camera watchdog: {e}")
     def stop_all_monitoring(self):
         """Stop monitoring all cameras."""
         self._stop_event.set()
+        self._config_reload.set()
+        for stop_event in self._camera_stop_events.values():
+            stop_event.set()
         camera_ids = list(self.active_cameras.keys())
         for camera_id in camera_ids:
             self.stop_camera_monitoring(camera_id)
-        # Shutdown executor
-        self.executor.shutdown(wait=True)
+        # Shutdown inference workers
+        self.scheduler.stop(wait=True)
+        # Write out attendance recorded by the last detections
+        self.attendance_writer.stop()
+        self.trajectory_writer.stop()
         logger.info("Stopped all camera monitoring")
     def get_active_cameras(self) -> List[int]:
         """Get list of currently monitored cameras."""
         return [cam_id for cam_id, active in self.active_cameras.items() if active]
-    def _monitor_camera(self, camera_id: int):
+    def is_configured(self, camera_id: int) -> bool:
+        """Whether the camera is monitored because of its camera_configs row (or as the default camera)."""
+        return camera_id in self._configured_cameras
+    def is_known_camera(self, camera_id: int) -> bool:
+        """Whether the camera is configured, mapped in CAMERA_SOURCES or currently monitored."""
+        return (self.is_configured(camera_id) or camera_id in settings.CAMERA_SOURCE_MAP
+                or bool(self.active_cameras.get(camera_id)))
+    def _monitor_camera(self, camera_id: int, spec: CameraSpec, stop_event: threading.Event):
         """
         Main monitoring loop for a specific camera.
         Args:
             camera_id: Camera identifier
+            spec: Capture settings for the camera
+            stop_event: Set when this worker should exit
         """
         logger.info(f"Starting camera monitoring loop for camera {camera_id}")
-        cap = None
+        source = None
         frame_count = 0
         last_detection_time = time.time()        
         try:
-            # Initialize camera
-            cap = cv2.VideoCapture(camera_id)
-            if not cap.isOpened():
-                logger.error(f"Failed to open camera {camera_id}")
-                return
-            # Set camera properties
-            cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-            cap.set(cv2.CAP_PROP_FPS, settings.FRAME_RATE)
-            while self.active_cameras.get(camera_id, False) and not self._stop_event.is_set():
-                ret, frame = cap.read()
+            # Initialize camera source (device index, stream URL or video file)
+            source = CameraSource(
+                spec.source,
+                width=spec.width,
+                height=spec.height,
+                fps=spec.fps,
+                mjpeg_passthrough=settings.CAMERA_MJPEG_PASSTHROUGH,
+                replay_speed=settings.CAMERA_REPLAY_SPEED,
+                loop=settings.CAMERA_REPLAY_LOOP,
+                backoff_max=settings.CAMERA_RECONNECT_MAX_DELAY,
+                stop_event=stop_event)
+            if self._camera_stop_events.get(camera_id) is stop_event:
+                self.sources[camera_id] = source
+            logger.info(f"Camera {camera_id} reading from {source.describe()}")
+            while not stop_event.is_set() and not self._stop_event.is_set():
+                ret, frame, jpeg = source.read()
+                if stop_event.is_set():
+                    # Replaced by the watchdog while blocked in read()
+                    break
                 if not ret:
-                    logger.warning(f"Failed to read frame from camera {camera_id}")
-                    time.sleep(0.1)
+                    if source.finished:
+                        break
+                    self.health.failure(camera_id, source.errors, source.reconnects, source.cap is None)
                     continue
                 frame_count += 1
                 current_time = time.time()
-                # Process every 10th frame to reduce CPU load
-                if frame_count % 10 == 0:
-                    # Submit face detection task to thread pool
-                    future = self.executor.submit(
-                        self._process_frame,
-                        frame,
-                        camera_id,
-                        current_time)
-                    # Don't wait for result to avoid blocking
-                    # Results are processed in the background
+                self.health.frame(camera_id, current_time)
+                # Share the frame with stream viewers
+                captured = self.frame_store.publish_frame(camera_id, current_time, image=frame, jpeg=jpeg)
+                # Offer the frame for face detection; the scheduler keeps only
+                # the newest frame per camera and decides when it runs, so the
+                # detection rate follows the camera's weight and rate bounds.
+                # Compressed frames are only decoded for the frames detected on
+                self.scheduler.submit(camera_id, captured, camera_id, current_time)
+                self.health.set_queue_depth(camera_id, self.scheduler.queue_depth(camera_id))
                 # Log detection rate every 30 seconds
                 if current_time - last_detection_time > 30:
                     logger.debug(f"Camera {camera_id} processed {frame_count} frames")
                     last_detection_time = current_time
                     frame_count = 0
-                # Small delay to prevent excessive CPU usage
-                time.sleep(0.033)  # ~30 FPS
         except Exception as e:
             logger.error(f"Error in camera monitoring loop for camera {camera_id}: {e}")
         finally:
-            if cap:
-                cap.release()
-            self.active_cameras[camera_id] = False
+            if source:
+                source.release()
+            # A restarted camera already has a newer worker; leave its state alone
+            if self._camera_stop_events.get(camera_id) is stop_event:
+                self.active_cameras[camera_id] = False
+                self.sources.pop(camera_id, None)
+                self.scheduler.unregister(camera_id)
+                self._end_tracks(camera_id)
+                self.frame_store.clear(camera_id)
+                self.health.set_state(camera_id, FINISHED if source and source.finished else STOPPED)
             logger.info(f"Camera monitoring stopped for camera {camera_id}")    
-    def _process_frame(self, frame: np.ndarray, camera_id: int, timestamp: float):
+    def _process_frame(self, captured: CapturedFrame, camera_id: int, timestamp: float):
         """
         Process a single frame for face detection and recognition.
         Args:
-            frame: Camera frame
+            captured: Captured camera frame
             camera_id: Camera identifier
             timestamp: Frame timestamp
         """
+        start_time = time.time()
+        processing_time = 0.0
         try:
-            start_time = time.time()
+            frame = captured.image
+            if frame is None:
+                logger.warning(f"Could not decode frame from camera {camera_id}")
+                return
             # Detect faces using the pipeline
-            faces = self.pipeline.system.detect_faces(frame)
-            processing_time = time.time() - start_time            
+            spec = self.camera_specs.get(camera_id) or CameraSpec.default(camera_id)
+            faces = self.get_pipeline(spec.gpu_id).system.detect_faces(frame)
+            processing_time = time.time() - start_time
+            # Assign track ids and share the results with live overlay clients
+            tracker = self.trackers.get(camera_id)
+            if tracker is not None:
+                active, ended = tracker.update(faces, timestamp)
+                self._alert_unknown_faces(camera_id, active, ended)
+                trajectories = self.trajectories.get(camera_id)
+                if trajectories is not None:
+                    trajectories.observe(faces, timestamp)
+                    for track in ended:
+                        self._finish_track(camera_id, track)
+            self.frame_store.publish_detections(camera_id, timestamp, frame.shape, faces)
             if faces:
                 logger.debug(f"Camera {camera_id}: Detected {len(faces)} faces")
                 # Process each detected face
@@ -170,9 +447,40 @@ class CameraMonitor:
                 log_face_detection(logger, camera_id, len(faces), processing_time)
         except Exception as e:
             logger.error(f"Error processing frame from camera {camera_id}: {e}")
+        finally:
+            # Latency is measured from capture, so it includes time spent queued
+            self.health.inference_done(camera_id, time.time() - timestamp, processing_time)
+    def _alert_unknown_faces(self, camera_id: int, active: List[Track], ended: List[Track]):
+        """Publish one alert per track that stays unrecognised for UNKNOWN_FACE_ALERT_SECONDS."""
+        alerted = self._unknown_alerted.setdefault(camera_id, set())
+        for track in ended:
+            alerted.discard(track.track_id)
+        for track in active:
+            if (track.employee_id is None and track.track_id not in alerted
+                    and track.last_seen - track.first_seen >= settings.UNKNOWN_FACE_ALERT_SECONDS):
+                alerted.add(track.track_id)
+                event_bus.publish('unknown_face', {
+                    'camera_id': camera_id,
+                    'track_id': track.track_id,
+                    'bbox': [int(v) for v in track.bbox],
+                    'first_seen': track.first_seen,
+                    'last_seen': track.last_seen})
+    def _finish_track(self, camera_id: int, track: Track):
+        """Hand the trajectory of an ended track to the trajectory writer."""
+        trajectories = self.trajectories.get(camera_id)
+        if trajectories is not None:
+            self.trajectory_writer.submit(camera_id, track, trajectories.finish(track))
+    def _end_tracks(self, camera_id: int):
+        """End all tracks of a stopped camera so their trajectories are written."""
+        tracker = self.trackers.get(camera_id)
+        if tracker is None:
+            return
+        for track in tracker.expire(float('inf')):
+            self._finish_track(camera_id, track)
     def _handle_face_detection(self, face_data: Dict, camera_id: int, timestamp: float):
         """
         Handle a detected face - identify and record attendance.
+        Only entry/exit transitions of the employee's presence are recorded.
         Args:
             face_data: Face detection data
             camera_id: Camera identifier
@@ -183,25 +491,59 @@ class CameraMonitor:
             employee_id = face_data.get('employee_id')
             confidence = face_data.get('confidence', 0.0)
             if employee_id and confidence > settings.FACE_RECOGNITION_TOLERANCE:
+                spec = self.camera_specs.get(camera_id) or CameraSpec.default(camera_id)
+                event_type = self.presence.observe(employee_id, camera_id, spec.camera_type, timestamp)
+                if event_type is None:
+                    return
                 # Record attendance
-                self.db_manager.record_attendance(
-                    employee_id=employee_id,
-                    camera_id=camera_id,
-                    confidence_score=confidence,
-                    event_type='entry',  # Could be 'entry' or 'exit'
-                    timestamp=timestamp)              
+                self.attendance_writer.submit({
+                    'employee_id': employee_id,
+                    'camera_id': camera_id,
+                    'confidence_score': confidence,
+                    'event_type': event_type,
+                    'timestamp': timestamp})
+                self._publish_transition(employee_id, camera_id, event_type, confidence, timestamp)
                 logger.info(
-                    f"Recorded attendance for employee {employee_id} "
+                    f"Recorded {event_type} for employee {employee_id} "
                     f"on camera {camera_id} with confidence {confidence:.3f}")
         except Exception as e:
             logger.error(f"Error handling face detection: {e}")
+    def _publish_transition(self, employee_id: str, camera_id: int, event_type: str,
+                            confidence: float, timestamp: float):
+        event_bus.publish('attendance', {
+            'employee_id': employee_id,
+            'camera_id': camera_id,
+            'event_type': event_type,
+            'confidence_score': confidence,
+            'event_time': timestamp})
+        entry = self.presence.lookup(employee_id, timestamp)
+        if entry is not None:
+            event_bus.publish('presence', entry)
+    def follow_presence(self):
+        """Refresh presence from the attendance records written by the leading worker."""
+        if self.load_presence():
+            self._expire_presence()
+    def _expire_presence(self):
+        """Mark employees unseen past the presence timeout absent and announce it."""
+        now = time.time()
+        for employee_id in self.presence.expire(now):
+            entry = self.presence.lookup(employee_id, now)
+            if entry is not None:
+                event_bus.publish('presence', entry)
 class StreamManager:
     """
     Manager for active video streams to prevent resource conflicts.
+    Viewers never open the camera themselves; they read the frames captured
+    by the camera monitor, so any number of clients share one capture. A
+    known camera that is not monitored is started for its viewers and
+    stopped again when the last of them leaves.
     """
-    def __init__(self):
+    def __init__(self, monitor: CameraMonitor):
+        self.monitor = monitor
         self.active_streams: Dict[int, int] = {}  # camera_id -> stream_count
         self.max_streams_per_camera = 3
+        self.encoder_cache = EncodedFrameCache()
+        self._on_demand: set = set()  # cameras started for viewers
     @contextmanager
     def get_stream(self, camera_id: int):
         """
@@ -209,28 +551,42 @@ class StreamManager:
         Args:
             camera_id: Camera identifier
         Yields:
-            Camera stream if available
+            Frame store holding the camera's latest frames
         Raises:
-            RuntimeError: If too many streams are active
+            LookupError: If the camera is neither configured nor monitored
+            RuntimeError: If too many streams are active or the camera cannot be monitored
         """
+        if not self.monitor.is_known_camera(camera_id):
+            raise LookupError(f"Camera {camera_id} is not configured")
+        if not self.monitor.is_leader:
+            raise RuntimeError("Camera monitoring runs in another worker")
         current_streams = self.active_streams.get(camera_id, 0)
         if current_streams >= self.max_streams_per_camera:
-            raise RuntimeError(f"Too many active streams for camera {camera_id}")        
+            raise RuntimeError(f"Too many active streams for camera {camera_id}")
+        # Make sure a capture worker is running for this camera
+        if camera_id not in self.monitor.get_active_cameras():
+            if not self.monitor.start_camera_monitoring(camera_id):
+                raise RuntimeError(f"Failed to start camera {camera_id}")
+            self._on_demand.add(camera_id)
         # Increment stream count
         self.active_streams[camera_id] = current_streams + 1
         try:
-            # Initialize camera
-            cap = cv2.VideoCapture(camera_id)
-            if not cap.isOpened():
-                raise RuntimeError(f"Failed to open camera {camera_id}")
-            yield cap
+            yield self.monitor.frame_store
         finally:
-            # Cleanup
-            cap.release()
             # Decrement stream count
             self.active_streams[camera_id] -= 1
             if self.active_streams[camera_id] <= 0:
                 del self.active_streams[camera_id]
+                self.encoder_cache.evict_camera(camera_id)
+                self._stop_on_demand(camera_id)
+    def _stop_on_demand(self, camera_id: int):
+        """Stop a camera started for viewers, unless camera_configs has taken it over since."""
+        if camera_id not in self._on_demand:
+            return
+        self._on_demand.discard(camera_id)
+        if not self.monitor.is_configured(camera_id) and camera_id in self.monitor.get_active_cameras():
+            logger.info(f"Last viewer of camera {camera_id} left, stopping its on-demand worker")
+            self.monitor.stop_camera_monitoring(camera_id)
     def get_active_stream_count(self, camera_id: int) -> int:
         """Get number of active streams for a camera."""
         return self.active_streams.get(camera_id, 0)
@@ -239,19 +595,70 @@ class StreamManager:
         return sum(self.active_streams.values())
 # Global instances
 camera_monitor = CameraMonitor()
-stream_manager = StreamManager()
+stream_manager = StreamManager(camera_monitor)
+MONITOR_LEASE_KEY = 'monitor:leader'
+_lease_owner = f"{socket.gethostname()}:{os.getpid()}"
+_lease_stop = threading.Event()
+_lease_thread: Optional[threading.Thread] = None
 def start_background_monitoring():
-    """Start background camera monitoring for all configured cameras."""
-    try:
-        # Start monitoring default camera
-        camera_monitor.start_camera_monitoring(settings.DEFAULT_CAMERA_ID)
-        logger.info("Background camera monitoring started")
-    except Exception as e:
-        logger.error(f"Failed to start background monitoring: {e}")
+    """
+    Start background camera monitoring for all configured cameras.
+    Every API worker calls this; the one taking the monitoring lease runs the
+    cameras, the others refresh presence from the database and take over the
+    lease once it expires.
+    """
+    global _lease_thread
+    if _lease_thread and _lease_thread.is_alive():
+        return
+    _lease_stop.clear()
+    _lease_thread = threading.Thread(target=_hold_monitoring_lease, daemon=True, name="monitoring_lease")
+    _lease_thread.start()
+def _hold_monitoring_lease():
+    ttl = settings.MONITOR_LEASE_SECONDS
+    stepped_down = False
+    while True:
+        try:
+            held = not stepped_down and cache_backend.acquire(MONITOR_LEASE_KEY, _lease_owner, ttl)
+        except Exception as e:
+            # Keep the current role while the backend is unreachable
+            logger.warning(f"Could not renew the monitoring lease: {e}")
+            held = camera_monitor.is_leader
+        try:
+            if held and not camera_monitor.is_leader:
+                _start_monitoring()
+            elif not held and camera_monitor.is_leader:
+                # Another worker took over while renewals failed; the monitor cannot restart in this process
+                logger.error("Monitoring lease was taken over by another worker, stopping camera monitoring")
+                camera_monitor.is_leader = False
+                stepped_down = True
+                camera_monitor.stop_all_monitoring()
+            elif not held:
+                camera_monitor.follow_presence()
+        except Exception as e:
+            logger.error(f"Error in monitoring lease loop: {e}")
+        if _lease_stop.wait(ttl / 3):
+            return
+def _start_monitoring():
+    camera_monitor.is_leader = True
+    # Know who is already inside before the first detection comes in
+    camera_monitor.load_presence()
+    # Start a worker per active camera_configs row and follow config changes
+    camera_monitor.start_config_watcher()
+    camera_monitor.start_watchdog()
+    logger.info(f"Background camera monitoring started in {_lease_owner} for cameras "
+                f"{camera_monitor.get_active_cameras()}")
 def stop_background_monitoring():
-    """Stop all background monitoring."""
+    """Stop all background monitoring and hand the lease to another worker."""
+    global _lease_thread
     try:
-        camera_monitor.stop_all_monitoring()
+        _lease_stop.set()
+        if _lease_thread:
+            _lease_thread.join(timeout=5.0)
+            _lease_thread = None
+        if camera_monitor.is_leader:
+            camera_monitor.is_leader = False
+            camera_monitor.stop_all_monitoring()
+            cache_backend.release(MONITOR_LEASE_KEY, _lease_owner)
         logger.info("Background camera monitoring stopped")
     except Exception as e:
         logger.error(f"Error stopping background monitoring: {e}")
\ No newline at end of file
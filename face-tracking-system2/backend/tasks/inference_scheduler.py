@@ -0,0 +1,186 @@
+"""
+Fair-share inference scheduling across cameras.
+Capture workers hand their newest frame to the scheduler instead of queueing
+it on a shared executor. Each camera holds at most one pending frame (a newer
+frame replaces the waiting one, so a busy camera cannot build up a backlog),
+and a fixed pool of inference threads picks the next camera to serve:
+1. cameras that have fallen below their minimum detection rate, most
+   overdue first;
+2. otherwise the camera with the least weighted service time, so capacity
+   is shared in proportion to camera weights (entry and exit cameras weigh
+   more than general ones).
+No camera is served faster than its maximum detection rate, and each camera
+has at most one frame in flight so its tracker sees frames in order.
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from utils.logging import get_logger
+logger = get_logger(__name__)
+class _CameraSlot:
+    """Scheduling state of one camera."""
+    __slots__ = ('camera_id', 'weight', 'min_interval', 'max_interval', 'pending',
+                 'in_flight', 'virtual_time', 'last_started', 'served', 'replaced')
+    def __init__(self, camera_id: int, weight: float, min_fps: float, max_fps: float):
+        self.camera_id = camera_id
+        self.weight = max(weight, 0.01)
+        self.min_interval = 1.0 / min_fps if min_fps > 0 else None
+        self.max_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.pending: Optional[tuple] = None
+        self.in_flight = False
+        self.virtual_time = 0.0
+        self.last_started = 0.0
+        self.served = 0
+        self.replaced = 0
+class InferenceScheduler:
+    """
+    Weighted fair scheduler running one callable over the latest frame of each camera.
+    """
+    def __init__(self, process: Callable, workers: int = 4):
+        """
+        Args:
+            process: Called with the arguments passed to ``submit``
+            workers: Number of inference threads
+        """
+        self.process = process
+        self.workers = max(1, workers)
+        self._cond = threading.Condition()
+        self._slots: Dict[int, _CameraSlot] = {}
+        self._threads: List[threading.Thread] = []
+        self._running = False
+    def start(self):
+        """Start the inference threads."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._threads = [
+            threading.Thread(target=self._worker, daemon=True, name=f"inference_worker_{i}")
+            for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+    def stop(self, wait: bool = True):
+        """Stop the inference threads, dropping pending frames."""
+        with self._cond:
+            self._running = False
+            for slot in self._slots.values():
+                slot.pending = None
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join(timeout=10.0)
+        self._threads = []
+    def register(self, camera_id: int, weight: float = 1.0, min_fps: float = 1.0, max_fps: float = 3.0):
+        """
+        Add a camera, or update its parameters.
+        Args:
+            camera_id: Camera identifier
+            weight: Share of inference capacity relative to other cameras
+            min_fps: Detection rate the camera is kept at under overload
+            max_fps: Detection rate the camera is never served above
+        """
+        with self._cond:
+            slot = self._slots.get(camera_id)
+            if slot is None:
+                slot = _CameraSlot(camera_id, weight, min_fps, max_fps)
+                slot.virtual_time = self._min_virtual_time()
+                self._slots[camera_id] = slot
+            else:
+                # Update in place; a worker may be holding this slot
+                fresh = _CameraSlot(camera_id, weight, min_fps, max_fps)
+                slot.weight = fresh.weight
+                slot.min_interval = fresh.min_interval
+                slot.max_interval = fresh.max_interval
+            self._cond.notify()
+    def unregister(self, camera_id: int):
+        """Remove a camera, dropping its pending frame."""
+        with self._cond:
+            self._slots.pop(camera_id, None)
+    def submit(self, camera_id: int, *args) -> bool:
+        """
+        Offer the newest frame of a camera.
+        Args:
+            camera_id: Registered camera identifier
+            *args: Arguments for the process callable
+        Returns:
+            True if the frame was queued, False if the camera is not registered
+        """
+        with self._cond:
+            slot = self._slots.get(camera_id)
+            if slot is None:
+                return False
+            if slot.pending is not None:
+                slot.replaced += 1
+            elif not slot.in_flight:
+                # An idle camera does not bank credit while it had nothing to do
+                slot.virtual_time = max(slot.virtual_time, self._min_virtual_time(exclude=slot))
+            slot.pending = args
+            self._cond.notify()
+            return True
+    def queue_depth(self, camera_id: int) -> int:
+        """Frames of a camera waiting or being processed."""
+        with self._cond:
+            slot = self._slots.get(camera_id)
+            if slot is None:
+                return 0
+            return int(slot.pending is not None) + int(slot.in_flight)
+    def stats(self) -> Dict[int, Dict]:
+        """Per-camera scheduling counters."""
+        with self._cond:
+            return {
+                camera_id: {
+                    'weight': slot.weight,
+                    'served': slot.served,
+                    'replaced': slot.replaced,
+                    'queue_depth': int(slot.pending is not None) + int(slot.in_flight),
+                }
+                for camera_id, slot in self._slots.items()}
+    def _min_virtual_time(self, exclude: Optional[_CameraSlot] = None) -> float:
+        busy = [slot.virtual_time for slot in self._slots.values()
+                if slot is not exclude and (slot.pending is not None or slot.in_flight)]
+        return min(busy) if busy else 0.0
+    def _next_slot(self, now: float) -> Tuple[Optional[_CameraSlot], Optional[float]]:
+        """Pick the camera to serve, or return how long to wait for one to become eligible."""
+        ready = []
+        wait = None
+        for slot in self._slots.values():
+            if slot.pending is None or slot.in_flight:
+                continue
+            due = slot.last_started + slot.max_interval
+            if due > now:
+                wait = due - now if wait is None else min(wait, due - now)
+                continue
+            ready.append(slot)
+        if not ready:
+            return None, wait
+        starved = [slot for slot in ready
+                   if slot.min_interval is not None and now - slot.last_started >= slot.min_interval]
+        if starved:
+            return max(starved, key=lambda slot: (now - slot.last_started) / slot.min_interval), None
+        return min(ready, key=lambda slot: slot.virtual_time), None
+    def _worker(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._running:
+                        return
+                    slot, wait = self._next_slot(time.monotonic())
+                    if slot is not None:
+                        break
+                    self._cond.wait(wait)
+                args = slot.pending
+                slot.pending = None
+                slot.in_flight = True
+                slot.last_started = time.monotonic()
+            started = time.monotonic()
+            try:
+                self.process(*args)
+            except Exception as e:
+                logger.error(f"Inference failed for camera {slot.camera_id}: {e}")
+            finally:
+                elapsed = time.monotonic() - started
+                with self._cond:
+                    slot.in_flight = False
+                    slot.virtual_time += elapsed / slot.weight
+                    slot.served += 1
+                    self._cond.notify_all()
@@ -0,0 +1,65 @@
+"""
+Periodic maintenance of the monthly partitions.
+Creates the partitions of the coming months before any row needs them and
+drops the partitions that have fallen out of the retention window. Runs
+once at startup and then every ``interval`` seconds on a daemon thread.
+"""
+import threading
+import time
+from typing import Dict, Optional
+from db.partitions import maintain_partitions
+from utils.logging import get_logger
+logger = get_logger(__name__)
+class PartitionMaintainer:
+    """
+    Keeps partitions ahead of the data and applies retention in the background.
+    """
+    def __init__(self, months_ahead: int, retention_months: Dict[str, int], interval: float = 86400.0):
+        """
+        Args:
+            months_ahead: Months after the current one to keep partitions for
+            retention_months: Months of data to keep per table; 0 keeps everything
+            interval: Seconds between maintenance runs
+        """
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.interval = interval
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self.last_run_at: Optional[float] = None
+        self.last_result: Dict = {}
+        self.last_error: Optional[str] = None
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="partition_maintenance")
+        self._thread.start()
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+    def run_once(self) -> bool:
+        """Run one maintenance pass; returns False if it failed."""
+        try:
+            self.last_result = maintain_partitions(self.months_ahead, self.retention_months)
+            self.last_error = None
+            return True
+        except Exception as e:
+            # Retried on the next pass; partitions are created months ahead
+            self.last_error = str(e)
+            logger.error(f"Partition maintenance failed: {e}")
+            return False
+        finally:
+            self.last_run_at = time.time()
+    def _run(self):
+        while not self._stopping.is_set():
+            self.run_once()
+            self._stopping.wait(self.interval)
+    def stats(self) -> Dict:
+        return {
+            'last_run_at': self.last_run_at,
+            'last_result': self.last_result,
+            'last_error': self.last_error,
+        }
@@ -0,0 +1,60 @@
+"""
+Backfill of the daily attendance summaries.
+Summaries are kept up to date as attendance is written, so this is only
+needed for history recorded before the summary table existed, or to repair
+a range after attendance rows were edited by hand. The range is rebuilt
+in chunks of days so that each transaction stays small.
+Usage:
+    python -m tasks.summary_backfill --start 2026-01-01 --end 2026-10-18
+"""
+import sys
+import argparse
+from datetime import date, timedelta
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from db.db_manager import DatabaseManager
+from utils.logging import get_logger
+logger = get_logger(__name__)
+def backfill_daily_summaries(db_manager: DatabaseManager, start: date, end: date, chunk_days: int = 31) -> int:
+    """
+    Rebuild the daily summaries of a date range.
+    Args:
+        db_manager: Database manager
+        start: First day
+        end: Last day (inclusive)
+        chunk_days: Days rebuilt per transaction
+    Returns:
+        Number of summaries written
+    """
+    written = 0
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(end, chunk_start + timedelta(days=chunk_days - 1))
+        count = db_manager.rebuild_daily_summaries(chunk_start, chunk_end)
+        if count is None:
+            raise RuntimeError(f"Failed to rebuild summaries from {chunk_start} to {chunk_end}")
+        written += count
+        logger.info(f"Summaries {chunk_start} .. {chunk_end}: {count} rows")
+        chunk_start = chunk_end + timedelta(days=1)
+    return written
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild daily attendance summaries from attendance records")
+    parser.add_argument("--start", required=True, type=date.fromisoformat, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today(),
+                        help="Last day, inclusive (default: today)")
+    parser.add_argument("--chunk-days", type=int, default=31, help="Days rebuilt per transaction")
+    return parser.parse_args(argv)
+def main(argv=None):
+    """Command line entry point."""
+    args = parse_args(argv)
+    if args.end < args.start:
+        print("❌ --end is before --start")
+        sys.exit(1)
+    try:
+        written = backfill_daily_summaries(DatabaseManager(), args.start, args.end, max(1, args.chunk_days))
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ {written} daily summaries rebuilt from {args.start} to {args.end}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Background writer for face trajectories.
+When a track ends, its downsampled trajectory is turned into
+``TrackingRecord`` rows and queued; a single writer thread inserts the
+queued rows in batches. Trajectories are best effort: when the queue is
+full or an insert fails the rows are dropped and counted rather than
+slowing down detection or holding memory.
+"""
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from utils.logging import get_logger
+logger = get_logger(__name__)
+class TrajectoryWriter:
+    """
+    Bulk-inserts finished trajectories on a background thread.
+    """
+    def __init__(self, db_manager, max_batch: int = 1000, flush_interval: float = 2.0, max_queued: int = 1000):
+        """
+        Args:
+            db_manager: DatabaseManager providing ``record_tracking_bulk``
+            max_batch: Rows written per insert at most
+            flush_interval: Seconds a trajectory may wait before its batch is flushed
+            max_queued: Trajectories waiting to be written at most
+        """
+        self.db_manager = db_manager
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[List[Dict]]" = queue.Queue(maxsize=max_queued)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        # Metrics
+        self.tracks_submitted = 0
+        self.tracks_unidentified = 0
+        self.tracks_dropped = 0
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.last_flush_at: Optional[float] = None
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="trajectory_writer")
+        self._thread.start()
+    def stop(self, timeout: float = 10.0):
+        """Write what is queued and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+    def submit(self, camera_id: int, track, trajectory) -> bool:
+        """
+        Queue the trajectory of an ended track.
+        Args:
+            camera_id: Camera the track was seen on
+            track: Ended ``Track`` from ``FaceTracker``
+            trajectory: Its ``Trajectory`` from ``TrajectoryBuffer.finish``
+        Returns:
+            True if the trajectory was queued
+        """
+        # Rows are keyed by employee; faces never recognised are not recorded
+        if not track.employee_id or trajectory is None or not trajectory.points:
+            with self._lock:
+                self.tracks_unidentified += 1
+            return False
+        last = len(trajectory.points) - 1
+        rows = [
+            {
+                'employee_id': track.employee_id,
+                'camera_id': camera_id,
+                'position_x': x,
+                'position_y': y,
+                'confidence_score': confidence,
+                'quality_metrics': {'track_id': track.track_id, 'bbox_width': width, 'bbox_height': height},
+                'timestamp': datetime.fromtimestamp(timestamp),
+                'tracking_state': 'ended' if i == last else 'active',
+            }
+            for i, (timestamp, x, y, confidence, width, height) in enumerate(trajectory.points)
+        ]
+        try:
+            self._queue.put_nowait(rows)
+        except queue.Full:
+            with self._lock:
+                self.tracks_dropped += 1
+            return False
+        with self._lock:
+            self.tracks_submitted += 1
+        return True
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'tracks_submitted': self.tracks_submitted,
+                'tracks_unidentified': self.tracks_unidentified,
+                'tracks_dropped': self.tracks_dropped,
+                'tracks_queued': self._queue.qsize(),
+                'rows_written': self.rows_written,
+                'rows_failed': self.rows_failed,
+                'last_flush_at': self.last_flush_at,
+            }
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch:
+                self._flush(batch)
+            elif self._stopping.is_set():
+                return
+    def _collect(self) -> List[Dict]:
+        """Gather queued rows until the batch is full or the flush interval passed."""
+        batch: List[Dict] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if self._stopping.is_set():
+                remaining = 0
+            try:
+                batch.extend(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    def _flush(self, batch: List[Dict]):
+        written = self.db_manager.record_tracking_bulk(batch)
+        with self._lock:
+            if written is None:
+                self.rows_failed += len(batch)
+            else:
+                self.rows_written += written
+            self.last_flush_at = time.time()
@@ -0,0 +1,122 @@
+"""
+Behaviour of the shared state backends (``utils.cache_backend``).
+
+Every test runs against ``InMemoryBackend`` and against ``RedisBackend`` on
+a ``fakeredis`` client (with Lua support, for the lease scripts), so both
+implementations are held to the same contract.
+"""
+
+import time
+
+import pytest
+
+from utils.cache_backend import CacheBackend, InMemoryBackend, RedisBackend
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def backend(request):
+    if request.param == 'memory':
+        return InMemoryBackend()
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')
+    return RedisBackend(prefix='test:', client=fakeredis.FakeRedis(decode_responses=True))
+
+
+def test_interface_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_get_set_delete(backend):
+    assert backend.get('missing') is None
+    backend.set('key', 'value')
+    assert backend.get('key') == 'value'
+    backend.set('key', 42)
+    assert backend.get('key') == '42'
+    backend.delete('key')
+    assert backend.get('key') is None
+
+
+def test_set_with_ttl_expires(backend):
+    backend.set('key', 'value', ttl=0.05)
+    assert backend.get('key') == 'value'
+    time.sleep(0.1)
+    assert backend.get('key') is None
+
+
+def test_incr_counts_from_zero(backend):
+    assert [backend.incr('counter') for _ in range(3)] == [1, 2, 3]
+    assert backend.get('counter') == '3'
+
+
+def test_acquire_is_exclusive_until_released(backend):
+    assert backend.acquire('lease', 'a', ttl=5)
+    assert not backend.acquire('lease', 'b', ttl=5)
+    # Renewing by the holder succeeds
+    assert backend.acquire('lease', 'a', ttl=5)
+    # Only the holder can release
+    backend.release('lease', 'b')
+    assert not backend.acquire('lease', 'b', ttl=5)
+    backend.release('lease', 'a')
+    assert backend.acquire('lease', 'b', ttl=5)
+
+
+def test_acquire_after_expiry(backend):
+    assert backend.acquire('lease', 'a', ttl=0.05)
+    time.sleep(0.1)
+    assert backend.acquire('lease', 'b', ttl=5)
+    assert not backend.acquire('lease', 'a', ttl=5)
+
+
+def test_renewal_extends_the_lease(backend):
+    assert backend.acquire('lease', 'a', ttl=0.2)
+    time.sleep(0.12)
+    assert backend.acquire('lease', 'a', ttl=0.2)
+    time.sleep(0.12)
+    # Past the first expiry, but within the renewed one
+    assert not backend.acquire('lease', 'b', ttl=0.2)
+
+
+def test_hit_allows_up_to_the_limit(backend):
+    assert backend.hit('bucket', window=5, limit=3) == (True, 1)
+    assert backend.hit('bucket', window=5, limit=3) == (True, 2)
+    assert backend.hit('bucket', window=5, limit=3) == (True, 3)
+    assert backend.hit('bucket', window=5, limit=3) == (False, 3)
+
+
+def test_rejected_hits_are_not_counted(backend):
+    for _ in range(2):
+        backend.hit('bucket', window=0.2, limit=2)
+    for _ in range(5):
+        assert backend.hit('bucket', window=0.2, limit=2) == (False, 2)
+    time.sleep(0.25)
+    # Only the two accepted events were in the window, and they have expired
+    assert backend.hit('bucket', window=0.2, limit=2) == (True, 1)
+
+
+def test_hit_window_slides(backend):
+    assert backend.hit('bucket', window=0.2, limit=2)[0]
+    time.sleep(0.12)
+    assert backend.hit('bucket', window=0.2, limit=2)[0]
+    assert not backend.hit('bucket', window=0.2, limit=2)[0]
+    time.sleep(0.12)
+    # The first event left the window, the second is still in it
+    assert backend.hit('bucket', window=0.2, limit=2) == (True, 2)
+
+
+def test_hit_buckets_are_independent(backend):
+    assert backend.hit('a', window=5, limit=1) == (True, 1)
+    assert backend.hit('b', window=5, limit=1) == (True, 1)
+    assert not backend.hit('a', window=5, limit=1)[0]
+
+
+def test_redis_prefix_separates_deployments():
+    fakeredis = pytest.importorskip('fakeredis')
+    client = fakeredis.FakeRedis(decode_responses=True)
+    first = RedisBackend(prefix='one:', client=client)
+    second = RedisBackend(prefix='two:', client=client)
+    first.set('key', 'value')
+    assert second.get('key') is None
+    assert first.acquire('lease', 'a', ttl=5)
+    assert second.acquire('lease', 'b', ttl=5)
+    assert client.get('one:key') == 'value'
@@ -0,0 +1,181 @@
+"""
+In-process TTL + LRU cache for database lookups.
+
+Entries expire ``ttl`` seconds after they were stored and the least
+recently used entry is evicted once ``max_entries`` is reached. Writers
+call ``invalidate`` after committing. Each invalidation also bumps a
+version number: a reader that started its query before the write passes
+the version it saw to ``set``, and its now possibly stale result is
+dropped instead of being cached.
+
+Other processes (uvicorn workers) learn about writes through an optional
+shared ``CacheBackend``: ``invalidate`` has a generation counter there
+incremented, and every ``sync_interval`` seconds the cache compares it with
+the generation it last saw, dropping all local entries when it moved. The
+backend is only used from a background thread, so lookups never wait on the
+network and can be made from the event loop; while the backend is
+unreachable the cache is bypassed.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Thread-safe cache with a time to live and a size bound.
+    """
+
+    def __init__(self, name: str, ttl: float = 60.0, max_entries: int = 1024, shared=None,
+                 sync_interval: float = 0.5):
+        """
+        Args:
+            name: Name reported in ``stats``
+            ttl: Seconds an entry stays valid; 0 disables caching
+            max_entries: Entries kept at most
+            shared: ``CacheBackend`` publishing invalidations to other processes
+            sync_interval: Seconds between reads of the shared generation
+        """
+        self.name = name
+        self.shared = shared
+        self.sync_interval = sync_interval
+        self._generation_key = f"cache:{name}:generation"
+        self._generation: Optional[str] = None
+        self._shared_ok = False  # generation read successfully on the last sync
+        self._unpublished = 0  # invalidations not yet counted in the backend
+        self._wake = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def version(self) -> int:
+        """Version to pass to ``set`` for a value loaded after this call."""
+        return self._version
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Look up a key.
+
+        Returns:
+            The cached value (which may be None), or ``MISSING``
+        """
+        if not self.enabled:
+            return MISSING
+        with self._lock:
+            if self.shared is not None and not self._shared_ok:
+                self._start_sync()
+                self.misses += 1
+                return MISSING
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None):
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            version: Result of ``version()`` taken before the value was
+                loaded; the value is discarded if the cache was invalidated since
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            if self.shared is not None and not self._shared_ok:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys: Hashable):
+        """Drop the given keys, or every entry when called without keys, here and in other processes."""
+        with self._lock:
+            self._version += 1
+            self.invalidations += 1
+            if not keys:
+                self._entries.clear()
+            for key in keys:
+                self._entries.pop(key, None)
+            if self.shared is not None:
+                self._unpublished += 1
+                self._start_sync()
+                self._wake.set()
+
+    def _start_sync(self):
+        # Called with the lock held
+        if self._sync_thread is None or not self._sync_thread.is_alive():
+            self._sync_thread = threading.Thread(
+                target=self._sync_loop, daemon=True, name=f"cache_sync_{self.name}")
+            self._sync_thread.start()
+
+    def _sync_loop(self):
+        while True:
+            self._sync()
+            self._wake.wait(self.sync_interval)
+            self._wake.clear()
+
+    def _sync(self):
+        """Publish pending invalidations, then drop every entry if the shared generation moved."""
+        with self._lock:
+            unpublished, self._unpublished = self._unpublished, 0
+        try:
+            if unpublished:
+                self.shared.incr(self._generation_key)
+            generation = self.shared.get(self._generation_key)
+        except Exception as e:
+            with self._lock:
+                self._unpublished += unpublished
+                if self._shared_ok:
+                    logger.warning(f"Cache {self.name} bypassed, its backend is unreachable: {e}")
+                self._shared_ok = False
+                self._entries.clear()
+            return
+        with self._lock:
+            if generation != self._generation:
+                self._generation = generation
+                self._version += 1
+                self._entries.clear()
+            self._shared_ok = True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
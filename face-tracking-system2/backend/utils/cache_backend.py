@@ -0,0 +1,264 @@
+"""
+Shared state for coordinating API workers.
+
+Each uvicorn worker is a separate process, so state kept in module globals
+(login attempt buckets, the face gallery version, which worker runs the
+cameras) is duplicated per worker and disagrees between them. ``CacheBackend`` is the small set of
+operations that state needs, with two implementations:
+
+    InMemoryBackend  per-process; the default for a single worker
+    RedisBackend     shared through any server speaking the Redis protocol
+
+``CACHE_BACKEND=redis`` selects Redis at ``REDIS_URL``. The ``redis``
+package is only needed then; ``RedisBackend`` also accepts a ready client,
+so a local stand-in such as ``fakeredis`` can be used instead of a server.
+"""
+
+import abc
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+
+try:
+    import redis
+except ImportError:  # only required for CACHE_BACKEND=redis
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(abc.ABC):
+    """
+    Interface of the shared state backends. Values are strings.
+    """
+
+    name = 'base'
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Value of a key, or None if it is missing or expired."""
+
+    @abc.abstractmethod
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        """Store a value, expiring after ``ttl`` seconds if given."""
+
+    @abc.abstractmethod
+    def delete(self, key: str):
+        """Remove a key."""
+
+    @abc.abstractmethod
+    def incr(self, key: str) -> int:
+        """Atomically increment an integer counter, starting from 0."""
+
+    @abc.abstractmethod
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        """
+        Take a lease, or renew it if ``owner`` already holds it.
+
+        Args:
+            key: Lease name
+            owner: Identity of the taker, e.g. host and process id
+            ttl: Seconds until the lease expires unless renewed
+
+        Returns:
+            True if ``owner`` holds the lease
+        """
+
+    @abc.abstractmethod
+    def release(self, key: str, owner: str):
+        """Give up a lease if ``owner`` holds it."""
+
+    @abc.abstractmethod
+    def hit(self, key: str, window: float, limit: int) -> Tuple[bool, int]:
+        """
+        Record an event in a sliding window unless the window is full.
+
+        Args:
+            key: Bucket, e.g. one per client address
+            window: Window length in seconds
+            limit: Events allowed per window
+
+        Returns:
+            (allowed, events in the window including this one if allowed)
+        """
+
+    def ping(self) -> bool:
+        return True
+
+
+class InMemoryBackend(CacheBackend):
+    """
+    Process-local backend.
+    """
+
+    name = 'memory'
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[Optional[float], str]] = {}
+        self._windows: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._pruned_at = 0.0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            if entry[0] is not None and entry[0] <= time.monotonic():
+                del self._values[key]
+                return None
+            return entry[1]
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        with self._lock:
+            expires = time.monotonic() + ttl if ttl else None
+            self._values[key] = (expires, str(value))
+
+    def delete(self, key: str):
+        with self._lock:
+            self._values.pop(key, None)
+            self._windows.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            expires, value = self._values.get(key, (None, '0'))
+            value = int(value) + 1
+            self._values[key] = (expires, str(value))
+            return value
+
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            entry = self._values.get(key)
+            if entry is not None and entry[1] != owner and (entry[0] is None or entry[0] > now):
+                return False
+            self._values[key] = (now + ttl, owner)
+            return True
+
+    def release(self, key: str, owner: str):
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None and entry[1] == owner:
+                del self._values[key]
+
+    def hit(self, key: str, window: float, limit: int) -> Tuple[bool, int]:
+        now = time.monotonic()
+        with self._lock:
+            events = self._windows.setdefault(key, deque())
+            while events and events[0] <= now - window:
+                events.popleft()
+            if len(events) >= limit:
+                return False, len(events)
+            events.append(now)
+            # Drop idle buckets so one-off clients do not accumulate
+            if len(self._windows) > 10000 and now - self._pruned_at > window:
+                self._prune(now - window)
+                self._pruned_at = now
+            return True, len(events)
+
+    def _prune(self, cutoff: float):
+        for key in [k for k, events in self._windows.items() if not events or events[-1] <= cutoff]:
+            del self._windows[key]
+
+
+class RedisBackend(CacheBackend):
+    """
+    Backend shared through a Redis-protocol server.
+    """
+
+    name = 'redis'
+
+    # Renew or delete a lease only while the caller still holds it
+    RENEW_SCRIPT = """
+        if redis.call('get', KEYS[1]) == ARGV[1] then
+            return redis.call('pexpire', KEYS[1], ARGV[2])
+        end
+        return 0"""
+    RELEASE_SCRIPT = """
+        if redis.call('get', KEYS[1]) == ARGV[1] then
+            return redis.call('del', KEYS[1])
+        end
+        return 0"""
+
+    def __init__(self, url: str = None, prefix: str = 'fts:', client=None):
+        """
+        Args:
+            url: Server URL, e.g. redis://localhost:6379/0
+            prefix: Prefix of every key, to share a server between deployments
+            client: Ready client (e.g. ``fakeredis.FakeRedis``) used instead of ``url``
+        """
+        if client is None:
+            if redis is None:
+                raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+            client = redis.Redis.from_url(url, decode_responses=True, socket_timeout=1.0,
+                                          socket_connect_timeout=1.0)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(self.prefix + key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        self.client.set(self.prefix + key, str(value), px=int(ttl * 1000) if ttl else None)
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(self.prefix + key))
+
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        key = self.prefix + key
+        if self.client.set(key, owner, nx=True, px=int(ttl * 1000)):
+            return True
+        return bool(self.client.eval(self.RENEW_SCRIPT, 1, key, owner, int(ttl * 1000)))
+
+    def release(self, key: str, owner: str):
+        self.client.eval(self.RELEASE_SCRIPT, 1, self.prefix + key, owner)
+
+    def hit(self, key: str, window: float, limit: int) -> Tuple[bool, int]:
+        # Sorted set of event times; add first and take the event back out
+        # if it overflowed, so concurrent workers cannot both slip through
+        key = self.prefix + key
+        now = time.time()
+        member = f"{now:.6f}-{uuid.uuid4().hex[:8]}"
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.zremrangebyscore(key, 0, now - window)
+        pipeline.zadd(key, {member: now})
+        pipeline.zcard(key)
+        pipeline.pexpire(key, int(window * 1000))
+        count = pipeline.execute()[2]
+        if count > limit:
+            self.client.zrem(key, member)
+            return False, count - 1
+        return True, count
+
+    def ping(self) -> bool:
+        try:
+            return bool(self.client.ping())
+        except Exception:
+            return False
+
+
+def create_cache_backend() -> CacheBackend:
+    """Create the backend selected by ``CACHE_BACKEND``, falling back to memory."""
+    if settings.CACHE_BACKEND == 'redis':
+        try:
+            backend = RedisBackend(settings.REDIS_URL, prefix=settings.CACHE_KEY_PREFIX)
+            if not backend.ping():
+                logger.warning(f"Redis at {settings.REDIS_URL} is not reachable yet")
+            return backend
+        except Exception as e:
+            logger.error(f"Cannot use the Redis cache backend, state stays per process: {e}")
+    elif settings.CACHE_BACKEND != 'memory':
+        logger.error(f"Unknown CACHE_BACKEND '{settings.CACHE_BACKEND}', using memory")
+    return InMemoryBackend()
+
+
+cache_backend = create_cache_backend()
@@ -0,0 +1,154 @@
+"""
+In-process publish/subscribe bus for live events.
+
+Camera and attendance threads publish events; the ``/events/stream`` SSE
+endpoint subscribes from the asyncio event loop. Publishing never blocks:
+each event is handed to the subscriber's loop with ``call_soon_threadsafe``
+and put on a bounded per-client queue. A client too slow to keep up is
+disconnected instead of buffering without limit, and resumes from the
+recent-event ring buffer when it reconnects with ``Last-Event-ID``.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+from app.config import settings
+
+
+class Event:
+    """
+    A published event.
+    """
+
+    __slots__ = ('seq', 'id', 'type', 'data', 'timestamp')
+
+    def __init__(self, seq: int, event_id: str, event_type: str, data: Dict, timestamp: float):
+        self.seq = seq
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+        self.timestamp = timestamp
+
+
+class Subscription:
+    """
+    One subscriber's queue on the bus.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queued: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self.backlog: List[Event] = []  # events to replay before the live ones
+        self.resync = False  # the requested resume point is no longer available
+        self.overflowed = False
+
+    def _offer(self, event: Event):
+        # Runs on the subscriber's event loop
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventBus:
+    """
+    Fan-out of events to many subscribers with a short replay history.
+    """
+
+    def __init__(self, history_size: int = 1000, max_queued: int = 256):
+        """
+        Args:
+            history_size: Recent events kept for ``Last-Event-ID`` resume
+            max_queued: Events buffered per subscriber before it is dropped
+        """
+        self.max_queued = max_queued
+        # Event ids carry the process start so ids from before a restart are recognised
+        self._epoch = format(int(time.time()), 'x')
+        self._seq = itertools.count(1)
+        self._history: deque = deque(maxlen=history_size)
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped_subscribers = 0
+
+    def publish(self, event_type: str, data: Dict) -> Event:
+        """
+        Publish an event to all subscribers. Safe to call from any thread.
+
+        Args:
+            event_type: SSE event name, e.g. 'attendance'
+            data: JSON-serialisable payload
+
+        Returns:
+            The published event
+        """
+        with self._lock:
+            seq = next(self._seq)
+            event = Event(seq, f"{self._epoch}-{seq}", event_type, data, time.time())
+            self._history.append(event)
+            self.published += 1
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._offer, event)
+            except RuntimeError:
+                # The subscriber's loop is closed
+                self.unsubscribe(subscription)
+        return event
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Subscribe from the running event loop.
+
+        Args:
+            last_event_id: Id of the last event the client received; newer
+                events still in the history are put in ``backlog``
+
+        Returns:
+            The subscription; call ``unsubscribe`` when done
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self.max_queued)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if last_event_id:
+                after = self._parse_seq(last_event_id)
+                oldest = self._history[0].seq if self._history else self._next_seq()
+                if after is None or after + 1 < oldest:
+                    subscription.resync = True
+                else:
+                    subscription.backlog = [e for e in self._history if e.seq > after]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+            if subscription.overflowed:
+                self.dropped_subscribers += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'published': self.published,
+                'history': len(self._history),
+                'dropped_subscribers': self.dropped_subscribers,
+            }
+
+    def _parse_seq(self, event_id: str) -> Optional[int]:
+        epoch, _, seq = event_id.partition('-')
+        if epoch != self._epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def _next_seq(self) -> int:
+        # Peek without consuming: nothing published yet means the next seq is 1
+        return self.published + 1
+
+
+event_bus = EventBus(history_size=settings.EVENT_HISTORY_SIZE, max_queued=settings.EVENT_CLIENT_BUFFER)
@@ -5,20 +5,21 @@ and access control with role-based permissions.
 """
 import jwt
 import bcrypt
-import time
+import logging
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List
-from collections import defaultdict
 from fastapi import HTTPException, Depends, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.config import settings
 from db.db_manager import DatabaseManager
+from utils.cache_backend import cache_backend
 
 # Security setup
 security = HTTPBearer()
 
-# Rate limiting storage
-login_attempts = defaultdict(list)
+logger = logging.getLogger(__name__)
+
+# Rate limiting (attempt buckets live in the cache backend, shared by workers)
 MAX_LOGIN_ATTEMPTS = 5
 LOGIN_WINDOW_MINUTES = 15
 
@@ -52,12 +53,12 @@ def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -
     to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
+def decode_access_token(token: str) -> Dict:
     """
-    Verify JWT token and return payload.
+    Verify a JWT access token and return its payload.
     
     Args:
-        credentials: HTTP Bearer credentials
+        token: Encoded JWT
         
     Returns:
         Token payload dictionary
@@ -67,7 +68,7 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
     """
     try:
         payload = jwt.decode(
-            credentials.credentials, 
+            token, 
             settings.SECRET_KEY, 
             algorithms=[settings.ALGORITHM]
         )
@@ -110,7 +111,25 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
             headers={"WWW-Authenticate": "Bearer"}
         )
 
-def require_master_admin(token_data: Dict = Depends(verify_token)) -> Dict:
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
+    """
+    Verify the bearer token of a request and return its payload.
+    
+    Verification does no I/O, so the dependency is async and runs on the
+    event loop instead of occupying a threadpool slot per request.
+    
+    Args:
+        credentials: HTTP Bearer credentials
+        
+    Returns:
+        Token payload dictionary
+        
+    Raises:
+        HTTPException: If token is invalid, expired, or user is inactive
+    """
+    return decode_access_token(credentials.credentials)
+
+async def require_master_admin(token_data: Dict = Depends(verify_token)) -> Dict:
     """
     Require master admin role for endpoint access.
     
@@ -130,7 +149,7 @@ def require_master_admin(token_data: Dict = Depends(verify_token)) -> Dict:
         )
     return token_data
 
-def require_admin(token_data: Dict = Depends(verify_token)) -> Dict:
+async def require_admin(token_data: Dict = Depends(verify_token)) -> Dict:
     """
     Require admin role (including master admin) for endpoint access.
     
@@ -161,7 +180,7 @@ def require_roles(allowed_roles: List[str]):
     Returns:
         Dependency function for FastAPI
     """
-    def role_checker(token_data: Dict = Depends(verify_token)) -> Dict:
+    async def role_checker(token_data: Dict = Depends(verify_token)) -> Dict:
         user_designation = token_data.get("designation")
         if user_designation not in allowed_roles:
             raise HTTPException(
@@ -208,22 +227,13 @@ def check_rate_limit(client_ip: str) -> bool:
     Returns:
         True if within rate limit, False if exceeded
     """
-    current_time = time.time()
-    cutoff_time = current_time - (LOGIN_WINDOW_MINUTES * 60)
-    
-    # Clean old attempts
-    login_attempts[client_ip] = [
-        attempt for attempt in login_attempts[client_ip] 
-        if attempt > cutoff_time
-    ]
-    
-    # Check if limit exceeded
-    if len(login_attempts[client_ip]) >= MAX_LOGIN_ATTEMPTS:
-        return False
-    
-    # Add current attempt
-    login_attempts[client_ip].append(current_time)
-    return True
+    try:
+        allowed, _ = cache_backend.hit(f"login:{client_ip}", LOGIN_WINDOW_MINUTES * 60, MAX_LOGIN_ATTEMPTS)
+        return allowed
+    except Exception as e:
+        # Do not lock everyone out while the shared backend is unavailable
+        logger.error(f"Login rate limit check failed: {e}")
+        return True
 
 def authenticate_user(email: str, password: str, db: DatabaseManager) -> Optional[Dict]:
     """